@@ -0,0 +1,325 @@
+# benchmarks/bench_preprocessing.py
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import resource
+import argparse
+import subprocess
+import multiprocessing
+import numpy as np
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+# Baseline pohon sebelum optimasi (commit 121b45c), untuk perbandingan sebelum/sesudah
+PRE_OPTIMIZATION_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                              'baseline_pre_optimization.json')
+
+# Ukuran termogram sintetis (height, width). Citra kaki di data/raw berukuran 103-200 x 41-88 piksel
+# (median sekitar 149 x 65): ukuran terkecil, ukuran tipikal, ukuran terbesar, dan resolusi penuh kamera
+SIZES = {
+    '103x41': (103, 41),
+    '150x60': (150, 60),
+    '200x88': (200, 88),
+    '640x480': (640, 480),
+}
+# Jumlah citra per pengukuran untuk setiap ukuran
+IMAGE_COUNTS = {
+    '103x41': 2000,
+    '150x60': 2000,
+    '200x88': 2000,
+    '640x480': 100,
+}
+# Jumlah citra berbeda yang dibuat; citra dipakai bergiliran agar memori benchmark tidak ikut terukur sebagai RSS
+IMAGE_POOL_SIZE = 16
+DIRECTORY_IMAGE_COUNT = 60
+TARGET_SIZE = (65, 168)
+
+def synthetic_thermograms(n, height, width, seed=0):
+    """
+    Membuat n citra termogram sintetis (BGR uint8): telapak kaki berbentuk elips dengan gradien suhu
+    halus dan noise, dipetakan ke palet warna, dengan latar belakang hitam seperti data asli.
+    """
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+    images = np.empty((n, height, width, 3), dtype=np.uint8)
+    for i in range(n):
+        cy, cx = height * rng.uniform(0.45, 0.55), width * rng.uniform(0.45, 0.55)
+        ry, rx = height * rng.uniform(0.4, 0.48), width * rng.uniform(0.3, 0.45)
+        mask = ((yy - cy) / ry) ** 2 + ((xx - cx) / rx) ** 2 <= 1.0
+        temperature = 0.5 + 0.3 * np.sin(yy / height * np.pi * rng.uniform(1, 3)) * np.cos(xx / width * np.pi)
+        temperature += rng.normal(0, 0.05, size=(height, width)).astype(np.float32)
+        temperature = cv2.GaussianBlur(temperature, (5, 5), 0)
+        gray = np.clip(temperature * 255, 0, 255).astype(np.uint8)
+        colored = cv2.applyColorMap(gray, cv2.COLORMAP_JET)
+        colored[~mask] = 0
+        images[i] = colored
+    return images
+
+def _time_best(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _image_function_case(function_name, params):
+    def _run(size, repeats, scale):
+        from src.utils import image_enhancement
+
+        function = getattr(image_enhancement, function_name)
+        height, width = SIZES[size]
+        n = max(1, int(IMAGE_COUNTS[size] * scale))
+        pool = synthetic_thermograms(min(n, IMAGE_POOL_SIZE), height, width)
+
+        def _loop():
+            for i in range(n):
+                function(pool[i % len(pool)], **params)
+
+        _loop()  # pemanasan (cache LUT/CLAHE, alokasi awal)
+        return n, _time_best(_loop, repeats)
+    return _run
+
+def _write_image_tree(base_dir, n, seed=0):
+    """
+    Menulis n citra sintetis dengan ukuran bervariasi ke struktur Left/Right seperti 'images_per_part'.
+    """
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        side = 'Left' if i % 2 == 0 else 'Right'
+        group = 'CG' if i % 4 < 2 else 'DM'
+        side_dir = os.path.join(base_dir, side, f'{group} {side}')
+        os.makedirs(side_dir, exist_ok=True)
+        height, width = int(rng.integers(103, 201)), int(rng.integers(41, 89))
+        image = synthetic_thermograms(1, height, width, seed=seed + i)[0]
+        cv2.imwrite(os.path.join(side_dir, f'{group}{i:03d}_M_{side[0]}.png'), image)
+
+def _directory_case(kind):
+    def _run(size, repeats, scale):
+        work_dir = tempfile.mkdtemp(prefix='bench_')
+        try:
+            n = max(4, int(DIRECTORY_IMAGE_COUNT * scale))
+            input_dir = os.path.join(work_dir, 'input')
+            output_dir = os.path.join(work_dir, 'output')
+            if kind == 'process_images':
+                # process_images bekerja pada citra yang sudah diubah ukurannya
+                from src.data.data_preprocessing import resize_images
+                _write_image_tree(os.path.join(work_dir, 'raw'), n)
+                resize_images(os.path.join(work_dir, 'raw'), input_dir, TARGET_SIZE)
+            else:
+                _write_image_tree(input_dir, n)
+
+            if kind == 'resize_images':
+                from src.data.data_preprocessing import resize_images
+
+                def _loop():
+                    resize_images(input_dir, output_dir, TARGET_SIZE)
+            elif kind == 'calculate_average':
+                from src.data.data_preprocessing import calculate_average
+
+                def _loop():
+                    calculate_average([os.path.join(input_dir, 'Left'), os.path.join(input_dir, 'Right')])
+            else:
+                from src.apply_image_enhancement import process_images
+
+                def _loop():
+                    process_images(input_dir, output_dir)
+
+            return n, _time_best(_loop, repeats)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return _run
+
+# Daftar benchmark: nama -> (fungsi benchmark, ukuran citra yang diuji)
+BENCHMARKS = {
+    'posterize_image': (_image_function_case('posterize_image', {'bits': 3}), list(SIZES)),
+    'solarize_image': (_image_function_case('solarize_image', {'threshold': 128}), list(SIZES)),
+    'clahe_image': (_image_function_case('clahe_image', {'clip_limit': 3.0, 'tile_grid_size': (8, 8)}), list(SIZES)),
+    'adjust_gamma_image': (_image_function_case('adjust_gamma_image', {'gamma': 1.5}), list(SIZES)),
+    'resize_images': (_directory_case('resize_images'), ['mixed']),
+    'calculate_average': (_directory_case('calculate_average'), ['mixed']),
+    'process_images': (_directory_case('process_images'), ['168x65']),
+}
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss dalam kilobyte di Linux dan dalam byte di macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _measure(name, size, repeats, scale):
+    run, _ = BENCHMARKS[name]
+    n, seconds = run(size, repeats, scale)
+    return {
+        'images': n,
+        'seconds': seconds,
+        'images_per_sec': n / seconds if seconds > 0 else float('inf'),
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+def _measure_in_child(result_queue, name, size, repeats, scale):
+    try:
+        result_queue.put(_measure(name, size, repeats, scale))
+    except Exception as e:
+        result_queue.put({'error': f"{type(e).__name__}: {e}"})
+
+def run_benchmarks(names=None, repeats=5, scale=1.0, isolate=True):
+    """
+    Menjalankan benchmark dan mengembalikan hasil per '<nama>[<ukuran>]'.
+
+    Parameters
+    ----------
+    names : list of str, optional
+        Nama benchmark yang dijalankan (lihat BENCHMARKS). Default: semua.
+    repeats : int, optional
+        Jumlah pengulangan; waktu terbaik yang dilaporkan.
+    scale : float, optional
+        Faktor pengali jumlah citra (misalnya, 0.1 untuk uji cepat).
+    isolate : bool, optional
+        Menjalankan setiap benchmark di proses anak (fork) agar peak RSS terukur per benchmark.
+        Tanpa isolasi, peak RSS adalah puncak kumulatif proses saat ini.
+
+    Returns
+    -------
+    results : dict
+        {'<nama>[<ukuran>]': {'images', 'seconds', 'images_per_sec', 'peak_rss_mb'}}.
+    """
+    names = list(BENCHMARKS) if names is None else names
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise KeyError(f"Benchmark tidak dikenal: {unknown}")
+    isolate = isolate and 'fork' in multiprocessing.get_all_start_methods()
+    if isolate:
+        # Modul diimpor sekali di proses induk agar tidak diimpor ulang di setiap proses anak
+        import src.utils.image_enhancement
+        import src.data.data_preprocessing
+        import src.apply_image_enhancement
+
+    results = {}
+    for name in names:
+        for size in BENCHMARKS[name][1]:
+            if isolate:
+                context = multiprocessing.get_context('fork')
+                result_queue = context.Queue()
+                process = context.Process(target=_measure_in_child, args=(result_queue, name, size, repeats, scale))
+                process.start()
+                result = result_queue.get()
+                process.join()
+                if 'error' in result:
+                    raise RuntimeError(f"Benchmark {name}[{size}] gagal: {result['error']}")
+            else:
+                result = _measure(name, size, repeats, scale)
+            results[f'{name}[{size}]'] = result
+    return results
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    """
+    Membandingkan hasil dengan baseline; regresi jika images/sec turun atau peak RSS naik lebih dari tolerance.
+
+    Returns
+    -------
+    rows : list of dict
+        Satu baris per benchmark dengan rasio terhadap baseline dan status 'ok', 'regression', atau 'new'.
+    """
+    rows = []
+    for key, result in results.items():
+        row = {'benchmark': key, **result, 'speed_ratio': None, 'rss_ratio': None, 'status': 'new'}
+        reference = baseline.get('results', {}).get(key)
+        if reference is not None:
+            row['speed_ratio'] = result['images_per_sec'] / reference['images_per_sec']
+            row['rss_ratio'] = result['peak_rss_mb'] / reference['peak_rss_mb']
+            slower = row['speed_ratio'] < 1.0 - tolerance
+            bigger = row['rss_ratio'] > 1.0 + tolerance
+            row['status'] = 'regression' if slower or bigger else 'ok'
+        rows.append(row)
+    return rows
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _processor_name():
+    # platform.processor() kosong di banyak distribusi Linux
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or None
+
+def save_baseline(results, path=BASELINE_PATH, scale=1.0, note=None):
+    """
+    Menyimpan hasil sebagai baseline beserta metadata mesin dan commit kode yang diukur.
+    """
+    baseline = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'processor': _processor_name(),
+            'cpu_count': os.cpu_count(),
+            'scale': scale,
+            'git_commit': _git_commit(),
+            'note': note,
+        },
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+def format_report(rows):
+    lines = [f"{'benchmark':<32} {'img/s':>10} {'vs base':>8} {'RSS MB':>8} {'vs base':>8}  status"]
+    for row in rows:
+        speed = f"{row['speed_ratio']:.2f}x" if row['speed_ratio'] is not None else '-'
+        rss = f"{row['rss_ratio']:.2f}x" if row['rss_ratio'] is not None else '-'
+        lines.append(f"{row['benchmark']:<32} {row['images_per_sec']:>10.1f} {speed:>8} "
+                     f"{row['peak_rss_mb']:>8.1f} {rss:>8}  {row['status']}")
+    return '\n'.join(lines)
+
+if __name__ == "__main__":
+    # Jalankan dari direktori proyek: python benchmarks/bench_preprocessing.py
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing dan image enhancement pada termogram sintetis.")
+    parser.add_argument('names', nargs='*', help="Nama benchmark (default: semua).")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=1.0, help="Faktor pengali jumlah citra.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Toleransi regresi relatif terhadap baseline.")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help="Menyimpan hasil sebagai baseline baru.")
+    parser.add_argument('--note', default=None, help="Catatan baseline (misalnya, kode yang diukur).")
+    parser.add_argument('--json', default=None, help="Menyimpan hasil mentah ke file JSON.")
+    parser.add_argument('--no-isolate', action='store_true', help="Menjalankan semua benchmark di satu proses.")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.names or None, repeats=args.repeats, scale=args.scale, isolate=not args.no_isolate)
+    rows = compare_to_baseline(results, load_baseline(args.baseline), tolerance=args.tolerance)
+    print(format_report(rows))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.update_baseline:
+        save_baseline(results, args.baseline, scale=args.scale, note=args.note)
+        print(f"Baseline disimpan ke {args.baseline}")
+    elif any(row['status'] == 'regression' for row in rows):
+        sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,3 @@
+#!/bin/bash
+# Prediksi dengan model hasil ekspor: 'directory' atau 'stream'; argumen diteruskan ke src/predict.py
+python src/predict.py "$@"
\ No newline at end of file
@@ -0,0 +1,3 @@
+#!/bin/bash
+# Cross-validation semua varian dataset store; argumen tambahan diteruskan ke src/training.py
+python src/training.py --store_dir ./data/processed/dataset_store/ "$@"
\ No newline at end of file
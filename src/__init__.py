@@ -1,6 +1,14 @@
 # src/__init__.py
 
-from .apply_image_enhancement import process_images
-from .models import create_model1, create_model2, create_model3, create_model4
+from .utils.helpers import lazy_exports
+
+# Diimpor saat pertama kali diakses agar 'import src.data' tidak ikut memuat TensorFlow
+__getattr__, __dir__ = lazy_exports(__name__, globals(), {
+    'process_images': '.apply_image_enhancement',
+    'create_model1': '.models',
+    'create_model2': '.models',
+    'create_model3': '.models',
+    'create_model4': '.models',
+})
 
 __all__ = ['models', 'data', 'utils']
\ No newline at end of file
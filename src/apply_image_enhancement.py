@@ -4,7 +4,7 @@ import os
 import cv2
 import sys
 import logging
-import logging.config
+from concurrent.futures import ProcessPoolExecutor
 # Menambahkan direktori proyek utama ke sys.path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
@@ -15,83 +15,333 @@ from src.utils.image_enhancement import (
     clahe_image,
     adjust_gamma_image
 )
+from src.utils.manifest import BuildManifest
+from src.utils.instrumentation import get_metrics, dump_metrics
 
-# Mengatur logging
-logging.config.fileConfig('configs/logging.conf')
 logger = logging.getLogger('src.apply_image_enhancements')
 
-def process_images(input_base_dir, output_base_dir):
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff')
+
+# Teknik dan parameter image enhancement yang digunakan secara default
+DEFAULT_ENHANCEMENTS = {
+    'Posterize': {
+        'function': posterize_image,
+        'parameters': [{'bits': b} for b in [1, 2, 3]],
+    },
+    'Solarize': {
+        'function': solarize_image,
+        'parameters': [{'threshold': t} for t in [64, 128, 192]],
+    },
+    'CLAHE': {
+        'function': clahe_image,
+        'parameters': [
+            {'clip_limit': 2.0, 'tile_grid_size': (8, 8)},
+            {'clip_limit': 3.0, 'tile_grid_size': (8, 8)},
+            {'clip_limit': 3.0, 'tile_grid_size': (6, 12)},
+            {'clip_limit': 3.0, 'tile_grid_size': (16, 16)},
+        ],
+    },
+    'Gamma': {
+        'function': adjust_gamma_image,
+        'parameters': [{'gamma': g} for g in [-1.5, 0.5, 1.5, 2, 5]],
+    },
+}
+
+def variant_subdir_name(params):
     """
-    Menerapkan teknik image enhancement pada gambar dalam direktori input dan menyimpan hasilnya.
+    Menentukan nama subdirektori varian berdasarkan nilai parameter (misalnya, '3.0_(8, 8)').
     """
-    try:
-        # Tentukan teknik dan parameter
-        enhancements = {
-            'Posterize': {
-                'function': posterize_image,
-                'parameters': [{'bits': b} for b in [1, 2, 3]],
-            },
-            'Solarize': {
-                'function': solarize_image,
-                'parameters': [{'threshold': t} for t in [64, 128, 192]],
-            },
-            'CLAHE': {
-                'function': clahe_image,
-                'parameters': [
-                    {'clip_limit': 2.0, 'tile_grid_size': (8, 8)},
-                    {'clip_limit': 3.0, 'tile_grid_size': (8, 8)},
-                    {'clip_limit': 3.0, 'tile_grid_size': (6, 12)},
-                    {'clip_limit': 3.0, 'tile_grid_size': (16, 16)},
-                ],
-            },
-            'Gamma': {
-                'function': adjust_gamma_image,
-                'parameters': [{'gamma': g} for g in [-1.5, 0.5, 1.5, 2, 5]],
-            },
-        }
-
-        # Iterasi melalui setiap teknik
-        for enhancement_name, enhancement_info in enhancements.items():
-            function = enhancement_info['function']
-            parameters_list = enhancement_info['parameters']
-
-            for params in parameters_list:
-                # Menentukan nama subdirektori berdasarkan parameter
-                subdir_name = '_'.join([str(v) for v in params.values()])
-                output_dir = os.path.join(output_base_dir, enhancement_name, subdir_name)
-
-                # Iterasi melalui gambar dalam direktori input
-                for root, dirs, files in os.walk(input_base_dir):
-                    # Mendapatkan path relatif untuk mempertahankan struktur direktori
-                    relative_root = os.path.relpath(root, input_base_dir)
-                    output_root = os.path.join(output_dir, relative_root)
-                    os.makedirs(output_root, exist_ok=True)
-
-                    for file_name in files:
-                        if file_name.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-                            input_path = os.path.join(root, file_name)
-                            output_path = os.path.join(output_root, file_name)
-
-                            try:
+    return '_'.join([str(v) for v in params.values()])
+
+def collect_image_files(input_base_dir):
+    """
+    Mengumpulkan semua file gambar di dalam direktori input beserta path relatifnya.
+
+    Parameters
+    ----------
+    input_base_dir : str
+        Jalur ke direktori input.
+
+    Returns
+    -------
+    image_files : list of tuple
+        Daftar pasangan (input_path, relative_path) yang terurut.
+    """
+    image_files = []
+    for root, dirs, files in os.walk(input_base_dir):
+        relative_root = os.path.relpath(root, input_base_dir)
+        for file_name in sorted(files):
+            if file_name.lower().endswith(IMAGE_EXTENSIONS):
+                image_files.append((os.path.join(root, file_name), os.path.join(relative_root, file_name)))
+    return image_files
+
+def iter_variants(enhancements):
+    """
+    Menghasilkan setiap varian sebagai (enhancement_name, function, params).
+    """
+    for enhancement_name, enhancement_info in enhancements.items():
+        for params in enhancement_info['parameters']:
+            yield enhancement_name, enhancement_info['function'], params
+
+# Status per proses worker, diisi oleh _init_worker agar tidak dipickle ulang untuk setiap file
+_worker_state = {}
+
+def _init_worker(output_base_dir, enhancements):
+    """
+    Inisialisasi proses worker: menyimpan konfigurasi dan membatasi thread OpenCV agar tidak terjadi oversubscription.
+    """
+    cv2.setNumThreads(1)
+    # Proses hasil fork mewarisi isi pencatat metrik proses utama
+    get_metrics().reset()
+    _worker_state['output_base_dir'] = output_base_dir
+    _worker_state['enhancements'] = enhancements
+
+def enhance_image_variants(input_path, relative_path, output_base_dir, enhancements, variant_indices=None):
+    """
+    Membaca satu gambar sekali lalu menerapkan semua varian image enhancement di memori dan menyimpan hasilnya.
+
+    Parameters
+    ----------
+    input_path : str
+        Jalur ke file gambar input.
+    relative_path : str
+        Jalur relatif gambar terhadap direktori input, dipertahankan di setiap direktori varian.
+    output_base_dir : str
+        Jalur ke direktori dasar output.
+    enhancements : dict
+        Teknik dan parameter image enhancement (lihat DEFAULT_ENHANCEMENTS).
+    variant_indices : list of int, optional
+        Indeks varian (urutan iter_variants) yang perlu diproses. Default: semua varian.
+
+    Returns
+    -------
+    written : list of int
+        Indeks varian yang berhasil disimpan.
+    """
+    variants = list(iter_variants(enhancements))
+    if variant_indices is None:
+        variant_indices = range(len(variants))
+    if not variant_indices:
+        return []
+
+    metrics = get_metrics()
+    with metrics.phase('enhance', 'decode'):
+        image = cv2.imread(input_path, cv2.IMREAD_COLOR)
+    if image is None:
+        logger.warning(f"Citra {input_path} tidak dapat dibaca, melewatkan file ini.")
+        return []
+    metrics.count('enhance', bytes_read=os.path.getsize(input_path))
+
+    written = []
+    for index in variant_indices:
+        enhancement_name, function, params = variants[index]
+        output_path = os.path.join(output_base_dir, enhancement_name, variant_subdir_name(params), relative_path)
+        try:
+            with metrics.phase('enhance', 'compute'):
+                enhanced_image = function(image, **params)
+            with metrics.phase('enhance', 'encode'):
+                cv2.imwrite(output_path, enhanced_image)
+            metrics.count('enhance', files=1, bytes_written=os.path.getsize(output_path))
+            written.append(index)
+            logger.debug(f"Menyimpan {enhancement_name} dengan parameter {params} ke {output_path}")
+        except Exception as e:
+            logger.error(f"Gagal memproses {input_path} dengan {enhancement_name} {params}: {e}")
+    return written
+
+def _enhance_image_task(task):
+    input_path, relative_path, variant_indices = task
+    written = enhance_image_variants(
+        input_path, relative_path, _worker_state['output_base_dir'], _worker_state['enhancements'], variant_indices)
+    # Metrik worker dikirim bersama hasil dan digabung di proses utama
+    return written, get_metrics().pop_snapshot()
+
+def _process_images_single_pass(input_base_dir, output_base_dir, enhancements, num_workers, manifest=None):
+    """
+    Mode single-pass: setiap gambar didekode sekali dan semua varian diproses sekaligus, tersebar ke process pool.
+    """
+    image_files = collect_image_files(input_base_dir)
+    variants = list(iter_variants(enhancements))
+
+    # Membuat seluruh struktur direktori output sekali di proses utama
+    relative_roots = {os.path.dirname(relative_path) for _, relative_path in image_files}
+    for enhancement_name, _, params in variants:
+        for relative_root in relative_roots:
+            os.makedirs(os.path.join(output_base_dir, enhancement_name, variant_subdir_name(params), relative_root), exist_ok=True)
+
+    # Dengan manifest, hanya varian yang belum valid yang dikirim ke worker
+    tasks = []
+    for input_path, relative_path in image_files:
+        if manifest is None:
+            tasks.append((input_path, relative_path, None))
+            continue
+        stale = [
+            index for index, (enhancement_name, _, params) in enumerate(variants)
+            if not manifest.is_fresh(
+                os.path.join(output_base_dir, enhancement_name, variant_subdir_name(params), relative_path),
+                input_path, f"enhance/{enhancement_name}", params)
+        ]
+        get_metrics().count('enhance', skipped=len(variants) - len(stale))
+        if stale:
+            tasks.append((input_path, relative_path, stale))
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, len(tasks) or 1))
+
+    if num_workers == 1:
+        results = [
+            enhance_image_variants(input_path, relative_path, output_base_dir, enhancements, variant_indices)
+            for input_path, relative_path, variant_indices in tasks
+        ]
+    else:
+        chunksize = max(1, len(tasks) // (num_workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_worker,
+            initargs=(output_base_dir, enhancements),
+        ) as executor:
+            results = []
+            for written, worker_metrics in executor.map(_enhance_image_task, tasks, chunksize=chunksize):
+                get_metrics().merge(worker_metrics)
+                results.append(written)
+
+    if manifest is not None:
+        for (input_path, relative_path, _), written in zip(tasks, results):
+            for index in written:
+                enhancement_name, _, params = variants[index]
+                output_path = os.path.join(output_base_dir, enhancement_name, variant_subdir_name(params), relative_path)
+                manifest.record(output_path, input_path, f"enhance/{enhancement_name}", params)
+
+    n_written = sum(len(written) for written in results)
+    logger.info(f"Single-pass selesai: {len(image_files)} gambar, {n_written} file varian, {num_workers} worker")
+    return n_written
+
+def _expected_outputs(input_base_dir, output_base_dir, enhancements):
+    return [
+        os.path.join(output_base_dir, enhancement_name, variant_subdir_name(params), relative_path)
+        for _, relative_path in collect_image_files(input_base_dir)
+        for enhancement_name, _, params in iter_variants(enhancements)
+    ]
+
+def _process_images_sequential(input_base_dir, output_base_dir, enhancements, manifest=None):
+    """
+    Mode default: setiap varian diproses secara berurutan dengan menelusuri seluruh direktori input.
+    """
+    metrics = get_metrics()
+    # Iterasi melalui setiap teknik
+    for enhancement_name, enhancement_info in enhancements.items():
+        function = enhancement_info['function']
+        parameters_list = enhancement_info['parameters']
+
+        for params in parameters_list:
+            # Menentukan nama subdirektori berdasarkan parameter
+            subdir_name = variant_subdir_name(params)
+            output_dir = os.path.join(output_base_dir, enhancement_name, subdir_name)
+
+            # Iterasi melalui gambar dalam direktori input
+            for root, dirs, files in os.walk(input_base_dir):
+                # Mendapatkan path relatif untuk mempertahankan struktur direktori
+                relative_root = os.path.relpath(root, input_base_dir)
+                output_root = os.path.join(output_dir, relative_root)
+                os.makedirs(output_root, exist_ok=True)
+
+                for file_name in files:
+                    if file_name.lower().endswith(IMAGE_EXTENSIONS):
+                        input_path = os.path.join(root, file_name)
+                        output_path = os.path.join(output_root, file_name)
+                        operation = f"enhance/{enhancement_name}"
+                        if manifest is not None and manifest.is_fresh(output_path, input_path, operation, params):
+                            metrics.count('enhance', skipped=1)
+                            continue
+
+                        try:
+                            with metrics.phase('enhance', 'decode'):
                                 image = cv2.imread(input_path, cv2.IMREAD_COLOR)
-                                if image is None:
-                                    logger.warning(f"Citra {input_path} tidak dapat dibaca, melewatkan file ini.")
-                                    continue
+                            if image is None:
+                                logger.warning(f"Citra {input_path} tidak dapat dibaca, melewatkan file ini.")
+                                continue
 
-                                # Terapkan teknik image enhancement
+                            # Terapkan teknik image enhancement
+                            with metrics.phase('enhance', 'compute'):
                                 enhanced_image = function(image, **params)
+                            with metrics.phase('enhance', 'encode'):
                                 cv2.imwrite(output_path, enhanced_image)
-                                logger.info(f"Menyimpan {enhancement_name} dengan parameter {params} ke {output_path}")
-                            except Exception as e:
-                                logger.error(f"Gagal memproses {input_path}: {e}")
+                            metrics.count('enhance', files=1, bytes_read=os.path.getsize(input_path),
+                                          bytes_written=os.path.getsize(output_path))
+                            if manifest is not None:
+                                manifest.record(output_path, input_path, operation, params)
+                            logger.debug(f"Menyimpan {enhancement_name} dengan parameter {params} ke {output_path}")
+                        except Exception as e:
+                            logger.error(f"Gagal memproses {input_path}: {e}")
+
+def process_images(input_base_dir, output_base_dir, enhancements=None, single_pass=False, num_workers=None,
+                   manifest=None):
+    """
+    Menerapkan teknik image enhancement pada gambar dalam direktori input dan menyimpan hasilnya.
+
+    Parameters
+    ----------
+    input_base_dir : str
+        Jalur ke direktori input (misalnya, 'data/processed/resized_images/').
+    output_base_dir : str
+        Jalur ke direktori dasar output untuk menyimpan hasil image enhancement.
+    enhancements : dict, optional
+        Teknik dan parameter image enhancement. Default: DEFAULT_ENHANCEMENTS.
+    single_pass : bool, optional
+        Jika True, setiap gambar hanya didekode sekali dan semua varian diterapkan di memori,
+        dengan gambar-gambar dibagi ke process pool. Struktur output identik dengan mode default.
+    num_workers : int, optional
+        Jumlah proses worker untuk mode single_pass. Default: jumlah core CPU.
+    manifest : str or BuildManifest, optional
+        Manifest build inkremental. Jika diberikan, hanya gambar baru/berubah dan varian baru yang
+        diproses, dan output varian yang parameternya sudah dihapus dari konfigurasi ikut dihapus.
+
+    Returns
+    -------
+    None
+    """
+    if enhancements is None:
+        enhancements = DEFAULT_ENHANCEMENTS
+
+    try:
+        owns_manifest = manifest is not None and not isinstance(manifest, BuildManifest)
+        manifest = BuildManifest.open(manifest)
+
+        with get_metrics().stage('enhance'):
+            if single_pass:
+                _process_images_single_pass(input_base_dir, output_base_dir, enhancements, num_workers, manifest)
+            else:
+                _process_images_sequential(input_base_dir, output_base_dir, enhancements, manifest)
+        logger.info(get_metrics().summary('enhance'))
+
+        if manifest is not None:
+            manifest.evict_stale(output_base_dir, 'enhance/', _expected_outputs(input_base_dir, output_base_dir, enhancements))
+            if owns_manifest:
+                manifest.save()
 
     except Exception as e:
         logger.error(f"Terjadi kesalahan selama proses image enhancement: {e}")
         raise
 
 if __name__ == "__main__":
-    # Mengatur path direktori input dan output
-    input_base_dir = './data/processed/resized_images/'
-    output_base_dir = './data/processed/image enhancement/'
+    import argparse
+    from src.utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Menerapkan image enhancement pada gambar yang telah diubah ukurannya.")
+    parser.add_argument('--input_dir', default='./data/processed/resized_images/')
+    parser.add_argument('--output_dir', default='./data/processed/image enhancement/')
+    parser.add_argument('--single_pass', action='store_true',
+                        help="Dekode setiap gambar sekali dan proses semua varian secara paralel.")
+    parser.add_argument('--num_workers', type=int, default=None,
+                        help="Jumlah proses worker untuk mode --single_pass (default: jumlah core CPU).")
+    parser.add_argument('--manifest', default=None,
+                        help="Jalur manifest build inkremental; hanya gambar/varian baru atau berubah yang diproses.")
+    parser.add_argument('--metrics_json', default=None, help="Menyimpan metrik pipeline ke file JSON.")
+    parser.add_argument('--metrics_prom', default=None, help="Menyimpan metrik pipeline sebagai textfile Prometheus.")
+    parser.add_argument('--verbose', action='store_true', help="Menulis log per file (level DEBUG).")
+    args = parser.parse_args()
+    configure_logging(verbose=args.verbose)
 
-    process_images(input_base_dir, output_base_dir)
\ No newline at end of file
+    process_images(args.input_dir, args.output_dir, single_pass=args.single_pass, num_workers=args.num_workers,
+                   manifest=args.manifest)
+    dump_metrics(args.metrics_json, args.metrics_prom)
\ No newline at end of file
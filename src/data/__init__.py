@@ -1,10 +1,31 @@
-from .data_loader import organize_images
-from .data_preprocessing import (
-    calculate_average, 
-    resize_images, 
-    resize_all_images, 
-    load_tabular_data, 
-    convert_gender_to_numeric, 
-    create_labels, 
-    normalize_tabular_data
-    )
\ No newline at end of file
+from ..utils.helpers import lazy_exports
+
+# Modul diimpor saat fungsinya pertama kali diakses, sehingga worker dan CLI hanya memuat dependensi yang dipakai
+__getattr__, __dir__ = lazy_exports(__name__, globals(), {
+    'organize_images': '.data_loader',
+    'calculate_average': '.data_preprocessing',
+    'resize_images': '.data_preprocessing',
+    'resize_all_images': '.data_preprocessing',
+    'load_tabular_data': '.data_preprocessing',
+    'convert_gender_to_numeric': '.data_preprocessing',
+    'create_labels': '.data_preprocessing',
+    'normalize_tabular_data': '.data_preprocessing',
+    'extract_tabular_features': '.tabular_features',
+    'extract_sample_features': '.tabular_features',
+    'build_dataset_store': '.dataset_store',
+    'load_dataset_store': '.dataset_store',
+    'load_termogram_arrays': '.dataset_store',
+    'split_indices': '.dataset_store',
+    'build_angiosome_store': '.angiosome_store',
+    'create_store_dataset': '.tf_pipeline',
+    'create_image_dataset': '.tf_pipeline',
+    'compute_roi_index': '.foot_roi',
+    'crop_images': '.foot_roi',
+    'load_roi_index': '.foot_roi',
+    'calibrate_palette_lut': '.palette',
+    'load_palette_lut': '.palette',
+    'invert_palette': '.palette',
+    'convert_temperature_matrices': '.temperature_store',
+    'load_temperature_store': '.temperature_store',
+    'TemperatureStore': '.temperature_store',
+})
\ No newline at end of file
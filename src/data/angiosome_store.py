@@ -0,0 +1,192 @@
+# src/data/angiosome_store.py
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .dataset_store import open_store_arrays, finalize_store, tabular_arrays
+from .foot_roi import foot_box, crop_to_box
+from ..utils.instrumentation import get_metrics
+
+logger = logging.getLogger('src.data.angiosome_store')
+
+# Urutan patch di store, sama dengan urutan kolom tabular LCA_*, LPA_*, MCA_*, MPA_*
+ANGIOSOMES = ('LCA', 'LPA', 'MCA', 'MPA')
+ANGIOSOME_DIR = 'Angiosoms'
+SIDES = {'left': 'L', 'right': 'R'}
+GROUP_DIRS = {'CG': 'Control Group', 'DM': 'DM Group'}
+# Ukuran patch default (width, height); patch LCA/MCA/MPA sekitar 20-30 x 58-88 piksel, LPA sekitar 62 x 89
+DEFAULT_PATCH_SIZE = (32, 48)
+
+def angiosome_image_paths(data_tabular, raw_dir):
+    """
+    Menentukan jalur delapan citra angiosom setiap subjek di struktur data mentah.
+
+    Parameters
+    ----------
+    data_tabular : pandas.DataFrame
+        Data tabular dengan kolom 'Subject' dan 'Gender' (masih berupa 'M'/'F').
+    raw_dir : str
+        Direktori data mentah ('data/raw/'), berisi '<grup>/<Subject>_<Gender>/Angiosoms/'.
+
+    Returns
+    -------
+    entries : list of tuple
+        Daftar (row_position, subject, left_paths, right_paths) untuk subjek yang kedelapan citranya tersedia;
+        left_paths dan right_paths berurutan sesuai ANGIOSOMES.
+    """
+    entries = []
+    for position, (subject, gender) in enumerate(zip(data_tabular['Subject'], data_tabular['Gender'])):
+        subject = str(subject)
+        group_dir = GROUP_DIRS.get(subject[:2])
+        if group_dir is None:
+            continue
+        sample_name = f'{subject}_{gender}'
+        angiosome_dir = os.path.join(raw_dir, group_dir, sample_name, ANGIOSOME_DIR)
+        paths = {side: [os.path.join(angiosome_dir, f'{sample_name}_{code}_{angiosome}.png')
+                        for angiosome in ANGIOSOMES]
+                 for side, code in SIDES.items()}
+        if not all(os.path.exists(path) for side_paths in paths.values() for path in side_paths):
+            logger.warning(f"Citra angiosom subjek {subject} tidak lengkap, melewatkan subjek ini.")
+            continue
+        entries.append((position, subject, paths['left'], paths['right']))
+    return entries
+
+def fit_patch(image, patch_size):
+    """
+    Mengubah ukuran citra ke patch_size (width, height) dengan rasio aspek tetap; sisa area diisi 0 (latar belakang).
+    """
+    import cv2
+
+    width, height = patch_size
+    scale = min(width / image.shape[1], height / image.shape[0])
+    resized_width = min(width, max(1, int(round(image.shape[1] * scale))))
+    resized_height = min(height, max(1, int(round(image.shape[0] * scale))))
+    resized = cv2.resize(image, (resized_width, resized_height), interpolation=cv2.INTER_AREA)
+    patch = np.zeros((height, width) + image.shape[2:], dtype=image.dtype)
+    x = (width - resized_width) // 2
+    y = (height - resized_height) // 2
+    patch[y:y + resized_height, x:x + resized_width] = resized
+    return patch
+
+def _read_patch(path, patch_size, threshold, margin):
+    import cv2
+
+    image = cv2.imread(path, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Citra {path} tidak dapat dibaca.")
+    box = foot_box(image, threshold=threshold, margin=margin)
+    patch = fit_patch(crop_to_box(image, box), patch_size)
+    return cv2.cvtColor(patch, cv2.COLOR_BGR2RGB), box
+
+def build_angiosome_store(data_tabular, raw_dir, output_dir, patch_size=DEFAULT_PATCH_SIZE, features=None,
+                          threshold=0.0, margin=0, num_workers=None):
+    """
+    Mengemas delapan patch angiosom setiap subjek (LCA, LPA, MCA, MPA kaki kiri dan kanan) ke dalam dataset store.
+
+    Citra angiosom berukuran sama dengan frame kaki tetapi hanya area angiosomnya yang tidak nol, sehingga setiap
+    citra dipotong ke bounding box piksel tidak nol lalu dimasukkan ke patch berukuran tetap (rasio aspek dijaga).
+    Store memakai format yang sama dengan build_dataset_store, dengan citra kiri dan kanan berupa tumpukan patch
+    (N, 4, H, W, 3) uint8, sehingga dapat dibuka dengan load_dataset_store dan dilatih dengan create_store_dataset;
+    model1-model4 menerima input tumpukan patch ini sebagai pengganti citra penuh.
+
+    Parameters
+    ----------
+    data_tabular : pandas.DataFrame
+        Data tabular hasil load_tabular_data (kolom 'Gender' masih berupa 'M'/'F').
+    raw_dir : str
+        Direktori data mentah ('data/raw/').
+    output_dir : str
+        Direktori tujuan store (misalnya, 'data/processed/dataset_store/Angiosome/patches/').
+    patch_size : tuple of int, optional
+        Ukuran patch (width, height).
+    features : list of str, optional
+        Kolom fitur tabular. Default: semua kolom selain 'Subject' dan 'label'.
+    threshold : float, optional
+        Nilai piksel maksimum yang dianggap latar belakang saat menghitung box.
+    margin : int, optional
+        Piksel tambahan di setiap sisi box.
+    num_workers : int, optional
+        Jumlah thread untuk dekode citra (satu subjek per tugas). Default: jumlah core CPU.
+
+    Returns
+    -------
+    index : dict
+        Metadata store yang juga disimpan ke 'index.json', termasuk box setiap patch per subjek.
+
+    Raises
+    ------
+    FileNotFoundError
+        Jika direktori input tidak ditemukan atau tidak ada subjek dengan citra angiosom lengkap.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    try:
+        if not os.path.exists(raw_dir):
+            raise FileNotFoundError(f"Direktori {raw_dir} tidak ditemukan.")
+        entries = angiosome_image_paths(data_tabular, raw_dir)
+        if not entries:
+            raise FileNotFoundError(f"Tidak ada subjek dengan citra angiosom lengkap di {raw_dir}.")
+
+        positions = [position for position, _, _, _ in entries]
+        tabular, labels, features = tabular_arrays(data_tabular, positions, features)
+        patch_size = tuple(int(value) for value in patch_size)
+        image_shape = (len(ANGIOSOMES), patch_size[1], patch_size[0], 3)
+        n = len(entries)
+        left, right = open_store_arrays(output_dir, n, image_shape)
+        boxes = [None] * n
+
+        metrics = get_metrics()
+
+        def _fill(i):
+            _, subject, left_paths, right_paths = entries[i]
+            subject_boxes = {}
+            for side, arrays, paths in [('L', left, left_paths), ('R', right, right_paths)]:
+                for k, (angiosome, path) in enumerate(zip(ANGIOSOMES, paths)):
+                    with metrics.phase('angiosome_store', 'decode'):
+                        arrays[i, k], box = _read_patch(path, patch_size, threshold, margin)
+                    subject_boxes[f'{side}_{angiosome}'] = box
+            boxes[i] = subject_boxes
+            metrics.count('angiosome_store', files=2 * len(ANGIOSOMES),
+                          bytes_read=sum(os.path.getsize(path) for path in left_paths + right_paths))
+
+        with metrics.stage('angiosome_store'):
+            with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count() or 1) as executor:
+                list(executor.map(_fill, range(n)))
+            left.flush()
+            right.flush()
+            metrics.count('angiosome_store', bytes_written=left.nbytes + right.nbytes)
+            del left, right
+
+            subjects = [subject for _, subject, _, _ in entries]
+            index = finalize_store(output_dir, subjects, features, tabular, labels, image_shape, raw_dir,
+                                   angiosomes=list(ANGIOSOMES), patch_size=list(patch_size),
+                                   crop={'threshold': threshold, 'margin': margin},
+                                   boxes=dict(zip(subjects, boxes)))
+
+        logger.info(f"Store patch angiosom disimpan ke {output_dir}: {n} subjek, patch {tuple(image_shape)} per kaki")
+        logger.info(metrics.summary('angiosome_store'))
+        return index
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat membangun store patch angiosom dari {raw_dir}: {e}")
+        raise
+
+if __name__ == "__main__":
+    # Jalankan dengan: python -m src.data.angiosome_store
+    import argparse
+    from .data_preprocessing import load_tabular_data
+    from ..utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Mengemas patch angiosom setiap subjek ke dalam dataset store.")
+    parser.add_argument('--raw_dir', default='./data/raw/')
+    parser.add_argument('--tabular_path', default='./data/external/Plantar Thermogram Data Analysis.csv')
+    parser.add_argument('--output_dir', default='./data/processed/dataset_store/Angiosome/patches/')
+    parser.add_argument('--patch_size', type=int, nargs=2, default=list(DEFAULT_PATCH_SIZE), metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--margin', type=int, default=0)
+    parser.add_argument('--num_workers', type=int, default=None)
+    args = parser.parse_args()
+    configure_logging()
+
+    build_angiosome_store(load_tabular_data(args.tabular_path), args.raw_dir, args.output_dir,
+                          patch_size=args.patch_size, margin=args.margin, num_workers=args.num_workers)
\ No newline at end of file
@@ -1,35 +1,170 @@
 # src/data/data_loader.py
 
 import os
+import sys
+import errno
 import shutil
 import logging
-import logging.config
-
-# Mengatur logging segera setelah impor
-logging.config.fileConfig('configs/logging.conf')
+from concurrent.futures import ThreadPoolExecutor
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.utils.instrumentation import get_metrics, dump_metrics
 
 # Dapatkan logger untuk modul ini
 logger = logging.getLogger('src.data.data_loader')
 
-def organize_images(raw_dir, output_dir):
+SIDES = ['Left', 'Right']
+GROUPS = {
+    'Control Group': 'CG',
+    'DM Group': 'DM'
+}
+# ioctl FICLONE (linux/fs.h): membuat reflink copy-on-write pada btrfs/XFS
+FICLONE = 0x40049409
+ORGANIZE_MODES = ('copy', 'reflink', 'link')
+# Urutan metode yang dicoba untuk setiap mode sebelum turun ke salinan biasa
+_LINK_METHODS = {
+    'copy': [],
+    'reflink': ['reflink'],
+    'link': ['link', 'reflink'],
+}
+# errno yang menandakan filesystem tidak mendukung metode link, sehingga metode tersebut tidak dicoba lagi
+_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS}
+
+def _is_up_to_date(src_path, dest_path):
+    """
+    Memeriksa apakah file tujuan sudah sama dengan sumber (link yang sama, atau ukuran dan mtime sama).
+    """
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src_path)
+    if (src_stat.st_dev, src_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino):
+        return True
+    return src_stat.st_size == dest_stat.st_size and src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+def _reflink(src_path, dest_path):
+    """
+    Membuat reflink (copy-on-write) dari src_path ke dest_path dan menyalin metadata seperti shutil.copy2.
+    """
+    import fcntl
+
+    with open(src_path, 'rb') as src, open(dest_path, 'wb') as dest:
+        try:
+            fcntl.ioctl(dest.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dest.close()
+            os.remove(dest_path)
+            raise
+    shutil.copystat(src_path, dest_path)
+
+def _materialize(src_path, dest_path, mode, unsupported):
+    """
+    Menempatkan src_path di dest_path dengan metode mode, turun ke reflink lalu salinan biasa jika tidak didukung.
+
+    Returns
+    -------
+    method : str
+        Metode yang akhirnya digunakan ('link', 'reflink', atau 'copy').
+    """
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+    for method in _LINK_METHODS[mode]:
+        if method in unsupported:
+            continue
+        try:
+            if method == 'link':
+                os.link(src_path, dest_path)
+            else:
+                _reflink(src_path, dest_path)
+            return method
+        except (OSError, ImportError) as e:
+            if isinstance(e, ImportError) or e.errno in _UNSUPPORTED_ERRNOS:
+                logger.info(f"Metode {method} tidak didukung ({e}), beralih ke metode berikutnya.")
+                unsupported.add(method)
+            else:
+                raise
+    shutil.copy2(src_path, dest_path)
+    return 'copy'
+
+def iter_raw_images(raw_dir):
+    """
+    Menghasilkan citra .png seluruh kaki dari direktori raw beserta jalur relatifnya di struktur images_per_part.
+
+    Parameters
+    ----------
+    raw_dir : str
+        Jalur ke direktori data mentah yang berisi subdirektori grup ('data/raw/').
+
+    Yields
+    ------
+    file_path : str
+        Jalur file di direktori raw.
+    relative_path : str
+        Jalur relatif tujuan, misalnya 'Left/CG Left/CG001_M_L.png'.
+    """
+    # Iterasi melalui direktori grup di direktori raw
+    for group_name, group_short in GROUPS.items():
+        group_path = os.path.join(raw_dir, group_name)
+        if not os.path.exists(group_path):
+            logger.warning(f"Direktori {group_path} tidak ditemukan, melewatkan grup ini.")
+            continue
+
+        # Iterasi melalui subdirektori sample (misalnya, 'CG001_M')
+        for sample_name in sorted(os.listdir(group_path)):
+            sample_path = os.path.join(group_path, sample_name)
+            if not os.path.isdir(sample_path):
+                continue
+
+            # Iterasi melalui file dalam sample
+            for file_name in sorted(os.listdir(sample_path)):
+                if file_name.endswith('.png'):
+                    file_path = os.path.join(sample_path, file_name)
+
+                    # Menentukan sisi (Left/Right) berdasarkan nama file
+                    if '_L.png' in file_name:
+                        side = 'Left'
+                    elif '_R.png' in file_name:
+                        side = 'Right'
+                    else:
+                        logger.warning(f"Nama file {file_name} tidak sesuai format, melewatkan file ini.")
+                        continue
+
+                    yield file_path, os.path.join(side, f"{group_short} {side}", file_name)
+
+def organize_images(raw_dir, output_dir, mode='copy', num_workers=None):
     """
     Memindahkan file gambar .png dari struktur direktori awal ke struktur direktori baru yang terorganisir.
 
+    File yang ukuran dan mtime-nya sudah sama dengan sumber (atau sudah merupakan hard link ke sumber)
+    dilewati, sehingga menjalankan ulang fungsi ini hanya memproses file yang baru atau berubah.
+
     Parameters
     ----------
     raw_dir : str
         Jalur ke direktori data mentah yang berisi subdirektori grup ('data/raw/').
     output_dir : str
         Jalur ke direktori keluaran untuk menyimpan gambar yang telah diorganisir (misalnya, 'data/processed/images_per_part/').
+    mode : str, optional
+        'copy' untuk salinan biasa (shutil.copy2), 'reflink' untuk salinan copy-on-write, atau 'link' untuk
+        hard link. Jika filesystem tidak mendukung, 'link' turun ke 'reflink' lalu ke 'copy'. Hard link
+        berbagi isi dengan file mentah, jadi file di output_dir tidak boleh diubah di tempat.
+    num_workers : int, optional
+        Jumlah thread untuk menyalin file. Default: min(32, jumlah core CPU + 4).
 
     Returns
     -------
-    None
+    stats : dict
+        Jumlah file per metode ('link', 'reflink', 'copy') dan yang dilewati ('skipped').
 
     Raises
     ------
     FileNotFoundError
         Jika direktori input tidak ditemukan.
+    ValueError
+        Jika mode tidak dikenal.
     Exception
         Jika terjadi kesalahan selama proses pemindahan file.
     """
@@ -37,65 +172,66 @@ def organize_images(raw_dir, output_dir):
         # Memeriksa apakah direktori input ada
         if not os.path.exists(raw_dir):
             raise FileNotFoundError(f"Direktori {raw_dir} tidak ditemukan.")
+        if mode not in ORGANIZE_MODES:
+            raise ValueError(f"Mode {mode} tidak dikenal, gunakan salah satu dari {ORGANIZE_MODES}.")
 
         # Membuat struktur direktori output jika belum ada
-        sides = ['Left', 'Right']
-        groups = {
-            'Control Group': 'CG',
-            'DM Group': 'DM'
-        }
-
-        for side in sides:
-            for group_short in groups.values():
+        for side in SIDES:
+            for group_short in GROUPS.values():
                 dest_dir = os.path.join(output_dir, side, f"{group_short} {side}")
                 os.makedirs(dest_dir, exist_ok=True)
 
-        # Iterasi melalui direktori grup di direktori raw
-        for group_name, group_short in groups.items():
-            group_path = os.path.join(raw_dir, group_name)
-            if not os.path.exists(group_path):
-                logger.warning(f"Direktori {group_path} tidak ditemukan, melewatkan grup ini.")
-                continue
-
-            # Iterasi melalui subdirektori sample (misalnya, 'CG001_M')
-            for sample_name in os.listdir(group_path):
-                sample_path = os.path.join(group_path, sample_name)
-                if not os.path.isdir(sample_path):
-                    continue
-
-                # Iterasi melalui file dalam sample
-                for file_name in os.listdir(sample_path):
-                    if file_name.endswith('.png'):
-                        file_path = os.path.join(sample_path, file_name)
-
-                        # Menentukan sisi (Left/Right) berdasarkan nama file
-                        if '_L.png' in file_name:
-                            side = 'Left'
-                        elif '_R.png' in file_name:
-                            side = 'Right'
-                        else:
-                            logger.warning(f"Nama file {file_name} tidak sesuai format, melewatkan file ini.")
-                            continue
-
-                        # Menentukan direktori tujuan
-                        dest_dir = os.path.join(output_dir, side, f"{group_short} {side}")
-                        os.makedirs(dest_dir, exist_ok=True)
-
-                        # Menentukan jalur file tujuan
-                        dest_path = os.path.join(dest_dir, file_name)
-
-                        # Memindahkan file
-                        shutil.copy2(file_path, dest_path)
-                        logger.info(f"Menyalin {file_path} ke {dest_path}")
+        # Mengumpulkan pasangan (sumber, tujuan) dari direktori grup di direktori raw
+        tasks = [
+            (file_path, os.path.join(output_dir, relative_path))
+            for file_path, relative_path in iter_raw_images(raw_dir)
+        ]
+
+        unsupported = set()
+        metrics = get_metrics()
+
+        def _organize(task):
+            file_path, dest_path = task
+            if _is_up_to_date(file_path, dest_path):
+                metrics.count('organize', skipped=1)
+                return 'skipped'
+            with metrics.phase('organize', 'copy'):
+                method = _materialize(file_path, dest_path, mode, unsupported)
+            # Hard link dan reflink tidak menyalin isi file
+            copied_bytes = os.path.getsize(file_path) if method == 'copy' else 0
+            metrics.count('organize', files=1, bytes_read=copied_bytes, bytes_written=copied_bytes)
+            logger.debug(f"Menyalin {file_path} ke {dest_path} ({method})")
+            return method
+
+        stats = {'link': 0, 'reflink': 0, 'copy': 0, 'skipped': 0}
+        with metrics.stage('organize'), ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for result in executor.map(_organize, tasks):
+                stats[result] += 1
+
+        logger.info(f"Mengorganisir {len(tasks)} gambar ke {output_dir}: {stats}")
+        logger.info(metrics.summary('organize'))
+        return stats
 
     except Exception as e:
         logger.error(f"Terjadi kesalahan: {e}")
         raise
 
 if __name__ == "__main__":
-    # Jalur direktori input dan output
-    raw_directory = './data/raw/'
-    output_directory = './data/processed/images_per_part/'
+    import argparse
+    from src.utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Mengorganisir citra mentah ke struktur images_per_part.")
+    parser.add_argument('--raw_dir', default='./data/raw/')
+    parser.add_argument('--output_dir', default='./data/processed/images_per_part/')
+    parser.add_argument('--mode', default='copy', choices=ORGANIZE_MODES,
+                        help="Metode penempatan file: salinan biasa, reflink copy-on-write, atau hard link.")
+    parser.add_argument('--num_workers', type=int, default=None)
+    parser.add_argument('--metrics_json', default=None, help="Menyimpan metrik pipeline ke file JSON.")
+    parser.add_argument('--metrics_prom', default=None, help="Menyimpan metrik pipeline sebagai textfile Prometheus.")
+    parser.add_argument('--verbose', action='store_true', help="Menulis log per file (level DEBUG).")
+    args = parser.parse_args()
+    configure_logging(verbose=args.verbose)
 
     # Memanggil fungsi untuk mengorganisir gambar
-    organize_images(raw_directory, output_directory)
\ No newline at end of file
+    organize_images(args.raw_dir, args.output_dir, mode=args.mode, num_workers=args.num_workers)
+    dump_metrics(args.metrics_json, args.metrics_prom)
\ No newline at end of file
@@ -1,28 +1,34 @@
 # src/data/data_preprocessing.py
 
 import os
+import sys
 import logging
-import logging.config
-import numpy as np
-import pandas as pd
-from PIL import Image
-from sklearn.preprocessing import StandardScaler
-import cv2  # OpenCV untuk manipulasi citra
-
-# Mengatur logging segera setelah impor
-logging.config.fileConfig('configs/logging.conf')
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.utils.manifest import BuildManifest
+from src.utils.image_sizes import scan_image_sizes, image_size_stats
+from src.utils.instrumentation import get_metrics, dump_metrics
 
 # Dapatkan logger untuk modul ini
 logger = logging.getLogger('src.data.data_preprocessing')
 
-def calculate_average(directories):
+def calculate_average(directories, size_index=None, num_workers=None):
     """
     Menghitung rata-rata lebar dan tinggi gambar dalam semua direktori yang diberikan.
 
+    Ukuran dibaca dari header gambar saja (lihat scan_image_sizes), dan median, persentil,
+    serta histogram ukuran ikut dicatat ke log.
+
     Parameters
     ----------
     directories : list of str
         Daftar jalur direktori yang berisi gambar-gambar.
+    size_index : str, optional
+        Jalur index ukuran persisten; gambar yang tidak berubah tidak dibaca ulang.
+    num_workers : int, optional
+        Jumlah thread untuk membaca header gambar.
 
     Returns
     -------
@@ -39,39 +45,29 @@ def calculate_average(directories):
         Jika terjadi kesalahan lain selama proses.
 
     """
-    widths, heights = [], []
-    has_images = False
     try:
-        for base_dir in directories:
-            if not os.path.exists(base_dir):
-                logger.warning(f"Direktori {base_dir} tidak ditemukan, melewatkan direktori ini.")
-                continue
-            # Iterasi melalui subdirektori
-            for root, dirs, files in os.walk(base_dir):
-                image_files = [
-                    os.path.join(root, fname)
-                    for fname in files
-                    if fname.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff'))
-                ]
-                for image_path in image_files:
-                    with Image.open(image_path) as img:
-                        widths.append(img.width)
-                        heights.append(img.height)
-                        has_images = True
-
-        if not has_images:
+        with get_metrics().stage('size_scan'):
+            sizes = scan_image_sizes(directories, size_index=size_index, num_workers=num_workers)
+        get_metrics().count('size_scan', files=len(sizes))
+        if not sizes:
             raise FileNotFoundError(f"Tidak ada file gambar di direktori-direktori yang diberikan.")
 
-        avg_width = int(np.mean(widths))
-        avg_height = int(np.mean(heights))
+        stats = image_size_stats(sizes)
+        avg_width = int(stats['width']['mean'])
+        avg_height = int(stats['height']['mean'])
         logger.info(f"Rata-rata ukuran gambar: {avg_width} x {avg_height}")
+        logger.info(
+            f"Median ukuran gambar: {stats['width']['median']:g} x {stats['height']['median']:g}, "
+            f"persentil lebar {stats['width']['percentiles']}, persentil tinggi {stats['height']['percentiles']}"
+        )
+        logger.debug(f"Histogram lebar: {stats['width']['histogram']}, histogram tinggi: {stats['height']['histogram']}")
         return avg_width, avg_height
 
     except Exception as e:
         logger.error(f"Terjadi kesalahan saat menghitung rata-rata ukuran gambar: {e}")
         raise
 
-def resize_images(input_dir, output_dir, target_size):
+def resize_images(input_dir, output_dir, target_size, manifest=None):
     """
     Mengubah ukuran semua gambar dalam direktori input (termasuk subdirektori) ke ukuran target dan menyimpannya ke direktori output.
 
@@ -83,6 +79,9 @@ def resize_images(input_dir, output_dir, target_size):
         Jalur ke direktori output untuk menyimpan gambar yang telah diubah ukurannya.
     target_size : tuple of int
         Ukuran target dalam piksel (width, height).
+    manifest : str or BuildManifest, optional
+        Manifest build inkremental. Jika diberikan, gambar yang input dan ukuran targetnya
+        tidak berubah dilewati, dan output dari gambar input yang sudah dihapus ikut dihapus.
 
     Returns
     -------
@@ -100,36 +99,63 @@ def resize_images(input_dir, output_dir, target_size):
         if not os.path.exists(input_dir):
             raise FileNotFoundError(f"Direktori {input_dir} tidak ditemukan.")
 
+        import cv2  # OpenCV untuk manipulasi citra
+
+        owns_manifest = manifest is not None and not isinstance(manifest, BuildManifest)
+        manifest = BuildManifest.open(manifest)
+        params = {'target_size': list(target_size)}
+        expected_outputs = []
+
         has_images = False
-        # Iterasi melalui subdirektori
-        for root, dirs, files in os.walk(input_dir):
-            relative_root = os.path.relpath(root, input_dir)
-            output_root = os.path.join(output_dir, relative_root)
-            os.makedirs(output_root, exist_ok=True)
-
-            for fname in files:
-                if fname.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-                    has_images = True
-                    input_path = os.path.join(root, fname)
-                    output_path = os.path.join(output_root, fname)
-
-                    # Mengubah ukuran dan menyimpan gambar tanpa normalisasi
-                    image = cv2.imread(input_path)
-                    if image is None:
-                        logger.warning(f"Citra {input_path} tidak dapat dibaca, melewatkan file ini.")
-                        continue
-                    resized_image = cv2.resize(image, target_size, interpolation=cv2.INTER_AREA)
-                    cv2.imwrite(output_path, resized_image)
-                    logger.info(f"Menyimpan gambar yang telah diubah ukurannya ke {output_path}")
+        metrics = get_metrics()
+        with metrics.stage('resize'):
+            # Iterasi melalui subdirektori
+            for root, dirs, files in os.walk(input_dir):
+                relative_root = os.path.relpath(root, input_dir)
+                output_root = os.path.join(output_dir, relative_root)
+                os.makedirs(output_root, exist_ok=True)
+
+                for fname in files:
+                    if fname.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
+                        has_images = True
+                        input_path = os.path.join(root, fname)
+                        output_path = os.path.join(output_root, fname)
+                        expected_outputs.append(output_path)
+
+                        if manifest is not None and manifest.is_fresh(output_path, input_path, 'resize', params):
+                            metrics.count('resize', skipped=1)
+                            continue
+
+                        # Mengubah ukuran dan menyimpan gambar tanpa normalisasi
+                        with metrics.phase('resize', 'decode'):
+                            image = cv2.imread(input_path)
+                        if image is None:
+                            logger.warning(f"Citra {input_path} tidak dapat dibaca, melewatkan file ini.")
+                            continue
+                        with metrics.phase('resize', 'compute'):
+                            resized_image = cv2.resize(image, target_size, interpolation=cv2.INTER_AREA)
+                        with metrics.phase('resize', 'encode'):
+                            cv2.imwrite(output_path, resized_image)
+                        metrics.count('resize', files=1, bytes_read=os.path.getsize(input_path),
+                                      bytes_written=os.path.getsize(output_path))
+                        if manifest is not None:
+                            manifest.record(output_path, input_path, 'resize', params)
+                        logger.debug(f"Menyimpan gambar yang telah diubah ukurannya ke {output_path}")
 
         if not has_images:
             raise FileNotFoundError(f"Tidak ada file gambar di direktori {input_dir} dan subdirektorinya.")
+        logger.info(metrics.summary('resize'))
+
+        if manifest is not None:
+            manifest.evict_stale(output_dir, 'resize', expected_outputs)
+            if owns_manifest:
+                manifest.save()
 
     except Exception as e:
         logger.error(f"Terjadi kesalahan saat mengubah ukuran gambar: {e}")
         raise
 
-def resize_all_images(base_input_dir, base_output_dir, target_size):
+def resize_all_images(base_input_dir, base_output_dir, target_size, manifest=None):
     """
     Mengubah ukuran semua gambar di dalam struktur direktori yang diberikan (Left dan Right).
 
@@ -141,6 +167,8 @@ def resize_all_images(base_input_dir, base_output_dir, target_size):
         Jalur ke direktori dasar output untuk menyimpan gambar yang telah diubah ukurannya.
     target_size : tuple of int
         Ukuran target dalam piksel (width, height).
+    manifest : str or BuildManifest, optional
+        Manifest build inkremental (lihat resize_images).
 
     Returns
     -------
@@ -153,6 +181,8 @@ def resize_all_images(base_input_dir, base_output_dir, target_size):
 
     """
     try:
+        owns_manifest = manifest is not None and not isinstance(manifest, BuildManifest)
+        manifest = BuildManifest.open(manifest)
         sides = ['Left', 'Right']
         for side in sides:
             input_side_dir = os.path.join(base_input_dir, side)
@@ -162,9 +192,12 @@ def resize_all_images(base_input_dir, base_output_dir, target_size):
                 continue
 
             # Mengubah ukuran gambar dalam direktori side (termasuk subdirektori)
-            resize_images(input_side_dir, output_side_dir, target_size)
+            resize_images(input_side_dir, output_side_dir, target_size, manifest=manifest)
             logger.info(f"Mengubah ukuran gambar di {input_side_dir} dan menyimpan ke {output_side_dir}")
 
+        if owns_manifest:
+            manifest.save()
+
     except Exception as e:
         logger.error(f"Terjadi kesalahan saat mengubah ukuran semua gambar: {e}")
         raise
@@ -191,6 +224,8 @@ def load_tabular_data(file_path):
         Jika terjadi kesalahan saat memuat data.
     """
     try:
+        import pandas as pd
+
         data_tabular = pd.read_csv(file_path, delimiter=";")
         logger.info(f"Data tabular berhasil dimuat dari {file_path}. Shape: {data_tabular.shape}")
         return data_tabular
@@ -285,6 +320,9 @@ def normalize_tabular_data(data_tabular, features):
 
     """
     try:
+        import pandas as pd
+        from sklearn.preprocessing import StandardScaler
+
         scaler = StandardScaler()
         data_numeric = data_tabular[features]
         data_normalized = scaler.fit_transform(data_numeric)
@@ -297,6 +335,9 @@ def normalize_tabular_data(data_tabular, features):
         raise
 
 if __name__ == "__main__":
+    from src.utils.logging_config import configure_logging
+    configure_logging()
+
     # Jalur direktori input dan output
     base_input_dir = './data/processed/images_per_part/'
     base_output_dir = './data/processed/resized_images/'
@@ -307,13 +348,14 @@ if __name__ == "__main__":
     directories = [left_dir, right_dir]
 
     # Menghitung rata-rata ukuran gambar secara keseluruhan
-    avg_width, avg_height = calculate_average(directories)
+    avg_width, avg_height = calculate_average(directories, size_index='./data/processed/.size_index.json')
     target_size = (avg_width, avg_height)
 
     logger.info(f"Ukuran target untuk resizing: {target_size}")
 
-    # Mengubah ukuran semua gambar
-    resize_all_images(base_input_dir, base_output_dir, target_size)
+    # Mengubah ukuran semua gambar (hanya gambar baru/berubah yang diproses ulang)
+    resize_all_images(base_input_dir, base_output_dir, target_size,
+                      manifest='./data/processed/.build_manifest.json')
 
     # Memuat data tabular
     tabular_data_path = './data/external/Plantar Thermogram Data Analysis.csv'
@@ -342,4 +384,7 @@ if __name__ == "__main__":
     # Simpan scaler untuk digunakan pada data baru atau data test
     import joblib
     joblib.dump(scaler, './src/models/tabular_scaler.joblib')
-    logger.info("Scaler untuk data tabular telah disimpan.")
\ No newline at end of file
+    logger.info("Scaler untuk data tabular telah disimpan.")
+
+    # Ringkasan waktu dan counter per tahap
+    dump_metrics(json_path='./logs/pipeline_metrics.json')
\ No newline at end of file
@@ -0,0 +1,397 @@
+# src/data/dataset_store.py
+
+import os
+import json
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .data_preprocessing import convert_gender_to_numeric, create_labels, load_tabular_data
+from ..utils.instrumentation import get_metrics
+
+logger = logging.getLogger('src.data.dataset_store')
+
+INDEX_FILE = 'index.json'
+ARRAY_FILES = {
+    'left': 'left.npy',
+    'right': 'right.npy',
+    'tabular': 'tabular.npy',
+    'labels': 'labels.npy',
+}
+
+# Tipe data citra yang didukung load_termogram_arrays; tipe float dinormalisasi ke [0, 1]
+IMAGE_DTYPES = ('uint8', 'float16', 'float32')
+
+PackedDataset = namedtuple('PackedDataset', ['left', 'right', 'tabular', 'labels', 'subjects', 'features', 'index'])
+
+def termogram_relative_paths(subject, gender):
+    """
+    Menentukan jalur relatif citra kiri dan kanan subjek di struktur 'images_per_part', atau None jika grup tidak dikenal.
+    """
+    subject = str(subject)
+    if subject.startswith('DM'):
+        group = 'DM'
+    elif subject.startswith('CG'):
+        group = 'CG'
+    else:
+        return None
+    return (os.path.join('Left', f'{group} Left', f'{subject}_{gender}_L.png'),
+            os.path.join('Right', f'{group} Right', f'{subject}_{gender}_R.png'))
+
+def termogram_image_paths(data_tabular, img_dir):
+    """
+    Menentukan jalur citra kiri dan kanan setiap subjek sesuai struktur 'images_per_part'.
+
+    Parameters
+    ----------
+    data_tabular : pandas.DataFrame
+        Data tabular dengan kolom 'Subject' dan 'Gender' (masih berupa 'M'/'F').
+    img_dir : str
+        Direktori dasar yang berisi folder 'Left' dan 'Right' (misalnya, 'data/processed/resized_images/').
+
+    Returns
+    -------
+    entries : list of tuple
+        Daftar (row_position, subject, left_path, right_path) untuk subjek yang kedua citranya tersedia.
+    """
+    entries = []
+    for position, (subject, gender) in enumerate(zip(data_tabular['Subject'], data_tabular['Gender'])):
+        relative_paths = termogram_relative_paths(subject, gender)
+        if relative_paths is None:
+            continue
+
+        left_path = os.path.join(img_dir, relative_paths[0])
+        right_path = os.path.join(img_dir, relative_paths[1])
+        if not os.path.exists(left_path) or not os.path.exists(right_path):
+            logger.warning(f"Citra untuk subjek {subject} tidak ditemukan, melewatkan subjek ini.")
+            continue
+        entries.append((position, str(subject), left_path, right_path))
+    return entries
+
+def tabular_arrays(data_tabular, positions, features=None):
+    """
+    Mengambil fitur tabular (float32) dan label (uint8) untuk baris-baris yang dipilih.
+
+    Parameters
+    ----------
+    data_tabular : pandas.DataFrame
+        Data tabular hasil load_tabular_data (kolom 'Gender' masih berupa 'M'/'F').
+    positions : list of int
+        Posisi baris yang diambil (misalnya, dari termogram_image_paths).
+    features : list of str, optional
+        Kolom fitur tabular. Default: semua kolom selain 'Subject' dan 'label'.
+
+    Returns
+    -------
+    tabular : numpy.ndarray
+        Fitur tabular berbentuk (N, F).
+    labels : numpy.ndarray
+        Label berbentuk (N,).
+    features : list of str
+        Kolom fitur yang digunakan.
+    """
+    data_numeric = create_labels(convert_gender_to_numeric(data_tabular.copy()))
+    if features is None:
+        features = [column for column in data_numeric.columns if column not in ('Subject', 'label')]
+    tabular = data_numeric[features].to_numpy(dtype=np.float32)[positions]
+    labels = data_numeric['label'].to_numpy(dtype=np.uint8)[positions]
+    return tabular, labels, list(features)
+
+def _read_rgb(path, target_size):
+    import cv2
+
+    image = cv2.imread(path, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Citra {path} tidak dapat dibaca.")
+    if target_size is not None and (image.shape[1], image.shape[0]) != tuple(target_size):
+        image = cv2.resize(image, tuple(target_size), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+def open_store_arrays(output_dir, n, image_shape, dtype=np.uint8):
+    """
+    Membuat array citra kiri dan kanan (N, H, W, C) yang memory-mapped untuk diisi
+    (uint8 RGB, atau float16 satu channel untuk citra suhu hasil invert_palette).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    left = np.lib.format.open_memmap(
+        os.path.join(output_dir, ARRAY_FILES['left']), mode='w+', dtype=dtype, shape=(n,) + tuple(image_shape))
+    right = np.lib.format.open_memmap(
+        os.path.join(output_dir, ARRAY_FILES['right']), mode='w+', dtype=dtype, shape=(n,) + tuple(image_shape))
+    return left, right
+
+def finalize_store(output_dir, subjects, features, tabular, labels, image_shape, source_dir, **metadata):
+    """
+    Menyimpan fitur tabular, label, dan 'index.json' setelah array citra store terisi.
+
+    Returns
+    -------
+    index : dict
+        Metadata store; argumen metadata tambahan ikut disimpan.
+    """
+    np.save(os.path.join(output_dir, ARRAY_FILES['tabular']), tabular)
+    np.save(os.path.join(output_dir, ARRAY_FILES['labels']), labels)
+
+    index = {
+        'subjects': list(subjects),
+        'features': list(features),
+        'image_shape': list(image_shape),
+        'channel_order': 'RGB',
+        'source_dir': os.path.abspath(source_dir),
+    }
+    index.update(metadata)
+    with open(os.path.join(output_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    return index
+
+def _fill_image_arrays(entries, left, right, target_size, num_workers=None):
+    """
+    Mengisi array citra (uint8 atau float) secara paralel, satu subjek per tugas, tanpa array perantara.
+
+    Untuk array float, citra uint8 ditulis langsung ke slotnya lalu dinormalisasi di tempat,
+    sehingga tidak ada salinan float64 seperti resize + /255.0.
+    """
+    metrics = get_metrics()
+    scale = None if left.dtype == np.uint8 else left.dtype.type(1.0 / 255.0)
+
+    def _fill(i):
+        _, subject, left_path, right_path = entries[i]
+        with metrics.phase('dataset_store', 'decode'):
+            left[i] = _read_rgb(left_path, target_size)
+            right[i] = _read_rgb(right_path, target_size)
+        if scale is not None:
+            with metrics.phase('dataset_store', 'compute'):
+                left[i] *= scale
+                right[i] *= scale
+        metrics.count('dataset_store', files=2,
+                      bytes_read=os.path.getsize(left_path) + os.path.getsize(right_path))
+
+    with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count() or 1) as executor:
+        list(executor.map(_fill, range(len(entries))))
+
+def build_dataset_store(data_tabular, img_dir, output_dir, features=None, target_size=None, num_workers=None):
+    """
+    Mengemas citra kiri, citra kanan, fitur tabular, dan label ke dalam satu store .npy yang dapat di-memmap.
+
+    Parameters
+    ----------
+    data_tabular : pandas.DataFrame
+        Data tabular hasil load_tabular_data (kolom 'Gender' masih berupa 'M'/'F').
+    img_dir : str
+        Direktori dasar citra dengan folder 'Left' dan 'Right' (misalnya, satu varian image enhancement).
+    output_dir : str
+        Direktori tujuan store.
+    features : list of str, optional
+        Kolom fitur tabular. Default: semua kolom selain 'Subject' dan 'label'.
+    target_size : tuple of int, optional
+        Ukuran (width, height) citra. Default: ukuran citra pertama; citra lain diubah ukurannya agar sama.
+    num_workers : int, optional
+        Jumlah thread untuk dekode citra. Default: jumlah core CPU.
+
+    Returns
+    -------
+    index : dict
+        Metadata store yang juga disimpan ke 'index.json'.
+
+    Raises
+    ------
+    FileNotFoundError
+        Jika tidak ada subjek yang citranya ditemukan.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    try:
+        entries = termogram_image_paths(data_tabular, img_dir)
+        if not entries:
+            raise FileNotFoundError(f"Tidak ada pasangan citra subjek yang ditemukan di {img_dir}.")
+
+        positions = [position for position, _, _, _ in entries]
+        tabular, labels, features = tabular_arrays(data_tabular, positions, features)
+
+        first = _read_rgb(entries[0][2], target_size)
+        target_size = (first.shape[1], first.shape[0])
+        image_shape = first.shape
+
+        n = len(entries)
+        left, right = open_store_arrays(output_dir, n, image_shape)
+
+        metrics = get_metrics()
+        with metrics.stage('dataset_store'):
+            _fill_image_arrays(entries, left, right, target_size, num_workers)
+            left.flush()
+            right.flush()
+            metrics.count('dataset_store', bytes_written=left.nbytes + right.nbytes)
+            del left, right
+
+            index = finalize_store(output_dir, [subject for _, subject, _, _ in entries], features, tabular, labels,
+                                   image_shape, img_dir)
+
+        logger.info(f"Dataset store disimpan ke {output_dir}: {n} subjek, citra {tuple(image_shape)}")
+        logger.info(metrics.summary('dataset_store'))
+        return index
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat membangun dataset store dari {img_dir}: {e}")
+        raise
+
+def load_dataset_store(store_dir, mmap_mode='r'):
+    """
+    Membuka dataset store tanpa menyalin data (memory-mapped).
+
+    Parameters
+    ----------
+    store_dir : str
+        Direktori store hasil build_dataset_store.
+    mmap_mode : str or None, optional
+        Mode memmap numpy ('r', 'c', 'r+'); None memuat seluruh array ke memori.
+
+    Returns
+    -------
+    dataset : PackedDataset
+        Namedtuple berisi left, right (N, H, W, 3) uint8, tabular (N, F) float32, labels (N,) uint8,
+        subjects, features, dan index.
+
+    Raises
+    ------
+    FileNotFoundError
+        Jika file index atau array store tidak ditemukan.
+    """
+    index_path = os.path.join(store_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        raise FileNotFoundError(f"Index dataset store {index_path} tidak ditemukan.")
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    arrays = {
+        name: np.load(os.path.join(store_dir, file_name), mmap_mode=mmap_mode)
+        for name, file_name in ARRAY_FILES.items()
+    }
+    return PackedDataset(
+        left=arrays['left'],
+        right=arrays['right'],
+        tabular=arrays['tabular'],
+        labels=arrays['labels'],
+        subjects=index['subjects'],
+        features=index['features'],
+        index=index,
+    )
+
+def load_termogram_arrays(data_tabular, img_dir, features=None, target_size=None, dtype='uint8', num_workers=None):
+    """
+    Memuat citra kiri, citra kanan, fitur tabular, dan label ke memori sebagai array ringkas.
+
+    Pengganti load_termogram_images + preprocess_termogram di notebook modeling: citra disimpan sebagai uint8
+    (atau float16/float32 ternormalisasi jika diminta) dalam array yang dialokasikan sekali, bukan daftar
+    array float64 yang disalin oleh np.array. Untuk uint8, normalisasi dilakukan di model (rescale_input=True)
+    atau di tf.data (create_store_dataset dengan normalize=True).
+
+    Parameters
+    ----------
+    data_tabular : pandas.DataFrame
+        Data tabular hasil load_tabular_data (kolom 'Gender' masih berupa 'M'/'F').
+    img_dir : str
+        Direktori dasar citra dengan folder 'Left' dan 'Right'.
+    features : list of str, optional
+        Kolom fitur tabular. Default: semua kolom selain 'Subject' dan 'label'.
+    target_size : tuple of int, optional
+        Ukuran (width, height) citra. Default: ukuran citra pertama.
+    dtype : str, optional
+        'uint8' (0-255), 'float16', atau 'float32' (rentang [0, 1]).
+    num_workers : int, optional
+        Jumlah thread untuk dekode citra. Default: jumlah core CPU.
+
+    Returns
+    -------
+    dataset : PackedDataset
+        Struktur yang sama dengan load_dataset_store sehingga dapat dipakai create_store_dataset dan split_indices.
+
+    Raises
+    ------
+    ValueError
+        Jika dtype tidak didukung.
+    FileNotFoundError
+        Jika tidak ada subjek yang citranya ditemukan.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    try:
+        if str(dtype) not in IMAGE_DTYPES:
+            raise ValueError(f"dtype {dtype} tidak didukung, gunakan salah satu dari {', '.join(IMAGE_DTYPES)}.")
+        entries = termogram_image_paths(data_tabular, img_dir)
+        if not entries:
+            raise FileNotFoundError(f"Tidak ada pasangan citra subjek yang ditemukan di {img_dir}.")
+
+        positions = [position for position, _, _, _ in entries]
+        tabular, labels, features = tabular_arrays(data_tabular, positions, features)
+
+        first = _read_rgb(entries[0][2], target_size)
+        target_size = (first.shape[1], first.shape[0])
+        image_shape = first.shape
+        left = np.empty((len(entries),) + image_shape, dtype=dtype)
+        right = np.empty((len(entries),) + image_shape, dtype=dtype)
+
+        metrics = get_metrics()
+        with metrics.stage('dataset_store'):
+            _fill_image_arrays(entries, left, right, target_size, num_workers)
+
+        subjects = [subject for _, subject, _, _ in entries]
+        index = {
+            'subjects': subjects,
+            'features': list(features),
+            'image_shape': list(image_shape),
+            'channel_order': 'RGB',
+            'dtype': str(dtype),
+            'source_dir': os.path.abspath(img_dir),
+        }
+        logger.info(f"Memuat {len(entries)} subjek dari {img_dir}: citra {tuple(image_shape)} {dtype}, "
+                    f"{(left.nbytes + right.nbytes) / 1e6:.1f} MB")
+        return PackedDataset(left=left, right=right, tabular=tabular, labels=labels, subjects=subjects,
+                             features=list(features), index=index)
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat memuat citra termogram dari {img_dir}: {e}")
+        raise
+
+def split_indices(labels, test_size=0.2, random_state=1, stratify=False):
+    """
+    Membagi sampel menjadi indeks train dan test tanpa menyalin array citra.
+
+    Pembagiannya sama dengan train_test_split(..., test_size, random_state) pada array di notebook modeling,
+    tetapi yang dikembalikan hanya indeks; gunakan dengan create_store_dataset(indices=...) agar citra dibaca
+    per batch dan tidak ada salinan train/test di memori.
+
+    Parameters
+    ----------
+    labels : array-like
+        Label setiap sampel (misalnya, dataset.labels).
+    test_size : float or int, optional
+        Proporsi atau jumlah sampel test.
+    random_state : int, optional
+        Seed pengacakan.
+    stratify : bool, optional
+        Menjaga proporsi kelas di train dan test.
+
+    Returns
+    -------
+    train_index, test_index : numpy.ndarray
+        Indeks sampel train dan test (int64).
+    """
+    from sklearn.model_selection import train_test_split
+
+    labels = np.asarray(labels)
+    train_index, test_index = train_test_split(np.arange(len(labels), dtype=np.int64), test_size=test_size,
+                                               random_state=random_state, stratify=labels if stratify else None)
+    return train_index, test_index
+
+if __name__ == "__main__":
+    # Jalankan dengan: python -m src.data.dataset_store
+    import argparse
+    from ..utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Mengemas citra termogram dan data tabular ke dalam dataset store.")
+    parser.add_argument('--img_dir', default='./data/processed/resized_images/')
+    parser.add_argument('--tabular_path', default='./data/external/Plantar Thermogram Data Analysis.csv')
+    parser.add_argument('--output_dir', default='./data/processed/dataset_store/resized_images/')
+    args = parser.parse_args()
+    configure_logging()
+
+    build_dataset_store(load_tabular_data(args.tabular_path), args.img_dir, args.output_dir)
\ No newline at end of file
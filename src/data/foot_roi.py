@@ -0,0 +1,358 @@
+# src/data/foot_roi.py
+
+import os
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from ..utils.image_sizes import IMAGE_EXTENSIONS, read_image_size
+from ..utils.instrumentation import get_metrics
+
+logger = logging.getLogger('src.data.foot_roi')
+
+ROI_INDEX_FILE = 'roi_index.json'
+
+def foreground_mask(array, threshold=0.0):
+    """
+    Mask telapak kaki: piksel/suhu di atas threshold (latar belakang matriks suhu dan citra bernilai 0).
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        Matriks suhu (H, W) atau citra (H, W, C).
+    threshold : float, optional
+        Nilai maksimum yang dianggap latar belakang.
+
+    Returns
+    -------
+    mask : numpy.ndarray of bool
+        Mask (H, W); untuk citra berwarna, piksel dianggap kaki jika salah satu channel di atas threshold.
+    """
+    array = np.asarray(array)
+    if array.ndim == 3 and array.shape[-1] in (1, 3, 4):
+        return (array > threshold).any(axis=-1)
+    return array > threshold
+
+def bounding_boxes(masks, margin=0):
+    """
+    Menghitung bounding box setiap mask secara tervektorisasi (tanpa loop per piksel atau per mask).
+
+    Parameters
+    ----------
+    masks : numpy.ndarray of bool
+        Tumpukan mask berbentuk (N, H, W).
+    margin : int, optional
+        Piksel tambahan di setiap sisi box (dipotong di tepi frame).
+
+    Returns
+    -------
+    boxes : numpy.ndarray
+        Box (N, 4) berisi [x, y, width, height]; mask kosong menghasilkan box seluruh frame.
+    """
+    masks = np.asarray(masks, dtype=bool)
+    n, height, width = masks.shape
+    rows = masks.any(axis=2)
+    cols = masks.any(axis=1)
+    # argmax pada array boolean memberi indeks True pertama; pada array terbalik memberi True terakhir
+    y0 = rows.argmax(axis=1)
+    y1 = height - rows[:, ::-1].argmax(axis=1)
+    x0 = cols.argmax(axis=1)
+    x1 = width - cols[:, ::-1].argmax(axis=1)
+
+    empty = ~rows.any(axis=1)
+    y0[empty], y1[empty], x0[empty], x1[empty] = 0, height, 0, width
+
+    x0 = np.maximum(x0 - margin, 0)
+    y0 = np.maximum(y0 - margin, 0)
+    x1 = np.minimum(x1 + margin, width)
+    y1 = np.minimum(y1 + margin, height)
+    return np.stack([x0, y0, x1 - x0, y1 - y0], axis=1).astype(np.int64)
+
+def bounding_box(mask, margin=0):
+    """
+    Bounding box [x, y, width, height] satu mask (H, W); lihat bounding_boxes.
+    """
+    return [int(value) for value in bounding_boxes(np.asarray(mask)[None], margin=margin)[0]]
+
+def crop_to_box(image, box):
+    """
+    Memotong citra atau matriks ke box [x, y, width, height] (view tanpa salinan).
+    """
+    x, y, width, height = box
+    return image[y:y + height, x:x + width]
+
+def foot_box(image, threshold=0.0, margin=0):
+    """
+    Bounding box kaki dari citra itu sendiri (dipakai saat inferensi ketika matriks suhu tidak tersedia).
+    """
+    return bounding_box(foreground_mask(image, threshold), margin=margin)
+
+def _subject_part(file_name):
+    """
+    Memisahkan nama file '<Subject>_<Gender>_<Part>.png' menjadi (subject, part), misalnya ('CG001', 'L_LCA').
+    """
+    stem = os.path.splitext(file_name)[0].split('_')
+    if len(stem) < 3:
+        return None, None
+    return stem[0], '_'.join(stem[2:])
+
+def _collect_images(input_dir):
+    paths = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        for fname in sorted(files):
+            if fname.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.join(root, fname))
+    return paths
+
+def compute_roi_index(input_dir, temperature_store=None, threshold=0.0, margin=0, output_path=None, num_workers=None):
+    """
+    Menghitung bounding box kaki untuk setiap citra di input_dir (termasuk subdirektori) dan menyimpannya di index.
+
+    Box diambil dari matriks suhu subjek (nilai 0 di luar kaki) jika store matriks suhu diberikan dan ukurannya
+    sama dengan citra; selain itu dari piksel citra yang tidak nol. Index dikunci dengan nama file, sehingga
+    berlaku untuk citra di 'data/raw/', 'images_per_part', maupun hasil image enhancement.
+
+    Parameters
+    ----------
+    input_dir : str
+        Direktori citra (misalnya, 'data/raw/' atau 'data/processed/images_per_part/').
+    temperature_store : str or TemperatureStore, optional
+        Store hasil convert_temperature_matrices.
+    threshold : float, optional
+        Nilai maksimum latar belakang.
+    margin : int, optional
+        Piksel tambahan di setiap sisi box.
+    output_path : str, optional
+        Jalur file JSON index. Default: tidak disimpan.
+    num_workers : int, optional
+        Jumlah thread. Default: jumlah core CPU.
+
+    Returns
+    -------
+    roi_index : dict
+        {'threshold', 'margin', 'boxes': {nama file: [x, y, width, height]}, 'frames': {nama file: [width, height]},
+        'sources': {'temperature': n, 'image': n}}.
+
+    Raises
+    ------
+    FileNotFoundError
+        Jika direktori input tidak ditemukan atau tidak berisi citra.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    import cv2
+
+    try:
+        if not os.path.exists(input_dir):
+            raise FileNotFoundError(f"Direktori {input_dir} tidak ditemukan.")
+        paths = _collect_images(input_dir)
+        if not paths:
+            raise FileNotFoundError(f"Tidak ada file gambar di direktori {input_dir} dan subdirektorinya.")
+        if isinstance(temperature_store, str):
+            from .temperature_store import load_temperature_store
+
+            temperature_store = load_temperature_store(temperature_store)
+
+        metrics = get_metrics()
+
+        def _box(path):
+            file_name = os.path.basename(path)
+            width, height = read_image_size(path)
+            mask = None
+            if temperature_store is not None:
+                subject, part = _subject_part(file_name)
+                try:
+                    matrix = temperature_store.get(subject, part)
+                except KeyError:
+                    matrix = None
+                if matrix is not None and matrix.shape == (height, width):
+                    with metrics.phase('roi', 'compute'):
+                        mask = foreground_mask(matrix, threshold)
+                    source = 'temperature'
+                elif matrix is not None:
+                    logger.debug(f"Ukuran matriks suhu {file_name} {matrix.shape} berbeda dengan citra, "
+                                 f"box dihitung dari citra.")
+            if mask is None:
+                with metrics.phase('roi', 'decode'):
+                    image = cv2.imread(path, cv2.IMREAD_COLOR)
+                if image is None:
+                    logger.warning(f"Citra {path} tidak dapat dibaca, melewatkan file ini.")
+                    return file_name, None, None, None
+                with metrics.phase('roi', 'compute'):
+                    mask = foreground_mask(image, threshold)
+                source = 'image'
+            return file_name, bounding_box(mask, margin=margin), [width, height], source
+
+        with metrics.stage('roi'):
+            with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count() or 1) as executor:
+                results = list(executor.map(_box, paths))
+        metrics.count('roi', files=len(paths))
+
+        roi_index = {'threshold': threshold, 'margin': margin, 'boxes': {}, 'frames': {},
+                     'sources': {'temperature': 0, 'image': 0}}
+        for file_name, box, frame, source in results:
+            if box is None:
+                continue
+            if file_name in roi_index['boxes']:
+                logger.warning(f"Nama file {file_name} muncul lebih dari sekali, box terakhir yang dipakai.")
+            roi_index['boxes'][file_name] = box
+            roi_index['frames'][file_name] = frame
+            roi_index['sources'][source] += 1
+
+        if roi_index['boxes']:
+            area = np.array([box[2] * box[3] for box in roi_index['boxes'].values()], dtype=np.float64)
+            frame_area = np.array([w * h for w, h in roi_index['frames'].values()], dtype=np.float64)
+            logger.info(f"ROI kaki {len(area)} citra dari {input_dir}: rata-rata {100 * np.mean(area / frame_area):.1f}% "
+                        f"luas frame (matriks suhu {roi_index['sources']['temperature']}, "
+                        f"citra {roi_index['sources']['image']})")
+        if output_path is not None:
+            save_roi_index(roi_index, output_path)
+        return roi_index
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat menghitung ROI kaki di {input_dir}: {e}")
+        raise
+
+def save_roi_index(roi_index, path):
+    """
+    Menyimpan index ROI ke file JSON (ditulis ke file sementara lalu diganti).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(roi_index, f, indent=2)
+    os.replace(tmp_path, path)
+
+def load_roi_index(roi_index):
+    """
+    Memuat index ROI dari jalur JSON; dict dikembalikan apa adanya.
+    """
+    if isinstance(roi_index, dict):
+        return roi_index
+    if not os.path.exists(roi_index):
+        raise FileNotFoundError(f"Index ROI {roi_index} tidak ditemukan.")
+    with open(roi_index, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def roi_box(roi_index, file_name, image, threshold=0.0, margin=0):
+    """
+    Box kaki untuk satu citra: dari index jika ada, selain itu dihitung dari citra.
+    """
+    if roi_index is not None:
+        box = roi_index['boxes'].get(file_name)
+        if box is not None and box[0] + box[2] <= image.shape[1] and box[1] + box[3] <= image.shape[0]:
+            return box
+    return foot_box(image, threshold=threshold, margin=margin)
+
+def crop_images(input_dir, output_dir, roi_index=None, threshold=0.0, margin=0, manifest=None):
+    """
+    Memotong semua citra di input_dir (termasuk subdirektori) ke bounding box kaki dan menyimpannya ke output_dir.
+
+    Tahap ini dijalankan sebelum resize sehingga ukuran target (calculate_average) dihitung dari ukuran kaki,
+    bukan frame, dan citra hasil resize tidak berisi latar belakang kosong.
+
+    Parameters
+    ----------
+    input_dir : str
+        Direktori citra (misalnya, 'data/processed/images_per_part/').
+    output_dir : str
+        Direktori output dengan struktur yang sama.
+    roi_index : dict or str, optional
+        Index hasil compute_roi_index (atau jalurnya). Citra yang tidak ada di index dipotong berdasarkan
+        piksel tidak nol.
+    threshold, margin : optional
+        Dipakai untuk citra yang tidak ada di index (lihat compute_roi_index).
+    manifest : str or BuildManifest, optional
+        Manifest build inkremental (lihat resize_images).
+
+    Returns
+    -------
+    boxes : dict
+        Box yang dipakai untuk setiap nama file.
+
+    Raises
+    ------
+    FileNotFoundError
+        Jika direktori input tidak ditemukan atau tidak berisi citra.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    import cv2
+    from ..utils.manifest import BuildManifest
+
+    try:
+        if not os.path.exists(input_dir):
+            raise FileNotFoundError(f"Direktori {input_dir} tidak ditemukan.")
+        paths = _collect_images(input_dir)
+        if not paths:
+            raise FileNotFoundError(f"Tidak ada file gambar di direktori {input_dir} dan subdirektorinya.")
+        if roi_index is not None:
+            roi_index = load_roi_index(roi_index)
+
+        owns_manifest = manifest is not None and not isinstance(manifest, BuildManifest)
+        manifest = BuildManifest.open(manifest)
+        expected_outputs = []
+        boxes = {}
+        metrics = get_metrics()
+        with metrics.stage('crop'):
+            for input_path in paths:
+                file_name = os.path.basename(input_path)
+                output_path = os.path.join(output_dir, os.path.relpath(input_path, input_dir))
+                expected_outputs.append(output_path)
+                indexed_box = roi_index['boxes'].get(file_name) if roi_index is not None else None
+                params = {'box': indexed_box, 'threshold': threshold, 'margin': margin}
+                if manifest is not None and manifest.is_fresh(output_path, input_path, 'crop', params):
+                    metrics.count('crop', skipped=1)
+                    continue
+
+                with metrics.phase('crop', 'decode'):
+                    image = cv2.imread(input_path)
+                if image is None:
+                    logger.warning(f"Citra {input_path} tidak dapat dibaca, melewatkan file ini.")
+                    continue
+                with metrics.phase('crop', 'compute'):
+                    box = roi_box(roi_index, file_name, image, threshold=threshold, margin=margin)
+                    cropped = crop_to_box(image, box)
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                with metrics.phase('crop', 'encode'):
+                    cv2.imwrite(output_path, cropped)
+                boxes[file_name] = box
+                metrics.count('crop', files=1, bytes_read=os.path.getsize(input_path),
+                              bytes_written=os.path.getsize(output_path))
+                if manifest is not None:
+                    manifest.record(output_path, input_path, 'crop', params)
+                logger.debug(f"Memotong {input_path} ke box {box}")
+
+        logger.info(metrics.summary('crop'))
+        if manifest is not None:
+            manifest.evict_stale(output_dir, 'crop', expected_outputs)
+            if owns_manifest:
+                manifest.save()
+        return boxes
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat memotong citra di {input_dir}: {e}")
+        raise
+
+if __name__ == "__main__":
+    # Jalankan dengan: python -m src.data.foot_roi
+    import argparse
+    from ..utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Menghitung ROI kaki dan memotong citra sebelum resize.")
+    parser.add_argument('--input_dir', default='./data/processed/images_per_part/')
+    parser.add_argument('--output_dir', default='./data/processed/cropped_images/')
+    parser.add_argument('--temperature_store', default=None,
+                        help="Store matriks suhu (src.data.temperature_store) sebagai sumber mask.")
+    parser.add_argument('--roi_index', default=f'./data/processed/{ROI_INDEX_FILE}')
+    parser.add_argument('--threshold', type=float, default=0.0)
+    parser.add_argument('--margin', type=int, default=0)
+    args = parser.parse_args()
+    configure_logging()
+
+    roi_index = compute_roi_index(args.input_dir, temperature_store=args.temperature_store, threshold=args.threshold,
+                                  margin=args.margin, output_path=args.roi_index)
+    crop_images(args.input_dir, args.output_dir, roi_index=roi_index, threshold=args.threshold, margin=args.margin,
+                manifest='./data/processed/.build_manifest.json')
\ No newline at end of file
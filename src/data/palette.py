@@ -0,0 +1,253 @@
+# src/data/palette.py
+
+import os
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .foot_roi import _collect_images, _subject_part
+from ..utils.instrumentation import get_metrics
+
+logger = logging.getLogger('src.data.palette')
+
+PALETTE_LUT_FILE = 'palette_lut.npz'
+DEFAULT_BINS = 32
+
+# table: suhu rata-rata (°C) per sel warna RGB berbentuk (bins, bins, bins); t_min/t_max: rentang suhu kalibrasi
+PaletteLut = namedtuple('PaletteLut', ['table', 'bins', 't_min', 't_max', 'rmse'])
+
+def _color_keys(image, bins, channel_order='BGR'):
+    """
+    Indeks sel LUT datar untuk setiap piksel (H, W, 3) uint8.
+    """
+    image = np.asarray(image)
+    if channel_order == 'BGR':
+        image = image[..., ::-1]
+    quantized = image.astype(np.int32) * bins // 256
+    return (quantized[..., 0] * bins + quantized[..., 1]) * bins + quantized[..., 2]
+
+def _calibration_pairs(input_dir, temperature_store=None):
+    """
+    Pasangan (jalur citra, sumber matriks suhu) untuk setiap citra yang memiliki matriks suhu.
+
+    Sumber matriks adalah (subject, part) di temperature_store jika diberikan, atau jalur CSV dengan nama yang sama
+    di samping citra.
+    """
+    pairs = []
+    for path in _collect_images(input_dir):
+        if temperature_store is not None:
+            subject, part = _subject_part(os.path.basename(path))
+            if subject is not None and part in temperature_store.index['subjects'].get(subject, {}):
+                pairs.append((path, (subject, part)))
+            continue
+        csv_path = os.path.splitext(path)[0] + '.csv'
+        if os.path.exists(csv_path):
+            pairs.append((path, csv_path))
+    return pairs
+
+def calibrate_palette_lut(input_dir, temperature_store=None, bins=DEFAULT_BINS, output_path=None, num_workers=None):
+    """
+    Mengkalibrasi LUT 3-D warna pseudo-colour -> suhu dari pasangan citra PNG dan matriks suhu mentah.
+
+    Setiap piksel kaki (suhu > 0) dikelompokkan ke sel warna (bins^3 sel) dengan np.bincount, lalu setiap sel
+    berisi suhu rata-ratanya. Sel yang tidak pernah muncul diisi dengan sel terisi terdekat di ruang RGB.
+
+    Parameters
+    ----------
+    input_dir : str
+        Direktori data mentah berisi pasangan '<Subject>_<Gender>_<Part>.png' dan '.csv' ('data/raw/').
+    temperature_store : str or TemperatureStore, optional
+        Store hasil convert_temperature_matrices sebagai pengganti parsing CSV.
+    bins : int, optional
+        Jumlah sel per channel warna (1-256).
+    output_path : str, optional
+        Jalur file .npz LUT. Default: tidak disimpan.
+    num_workers : int, optional
+        Jumlah thread. Default: jumlah core CPU.
+
+    Returns
+    -------
+    lut : PaletteLut
+        LUT beserta rentang suhu kalibrasi dan RMSE rekonstruksi suhu pada piksel kalibrasi.
+
+    Raises
+    ------
+    ValueError
+        Jika bins di luar rentang 1-256, atau semua piksel kalibrasi bersuhu sama (rentang suhu nol
+        sehingga suhu tidak dapat dinormalisasi).
+    FileNotFoundError
+        Jika direktori input tidak ditemukan atau tidak ada pasangan citra dan matriks suhu.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    import cv2
+
+    try:
+        if not 1 <= int(bins) <= 256:
+            raise ValueError(f"bins harus berada di rentang 1-256, bukan {bins}.")
+        bins = int(bins)
+        if not os.path.exists(input_dir):
+            raise FileNotFoundError(f"Direktori {input_dir} tidak ditemukan.")
+        if isinstance(temperature_store, str):
+            from .temperature_store import load_temperature_store
+
+            temperature_store = load_temperature_store(temperature_store)
+        pairs = _calibration_pairs(input_dir, temperature_store)
+        if not pairs:
+            raise FileNotFoundError(f"Tidak ada pasangan citra dan matriks suhu di direktori {input_dir}.")
+
+        n_cells = bins ** 3
+        metrics = get_metrics()
+
+        def _accumulate(pair):
+            path, source = pair
+            with metrics.phase('palette', 'decode'):
+                image = cv2.imread(path, cv2.IMREAD_COLOR)
+                if isinstance(source, tuple):
+                    matrix = temperature_store.get(*source)
+                else:
+                    from .temperature_store import parse_temperature_csv
+
+                    matrix = parse_temperature_csv(source)
+            if image is None or matrix.shape != image.shape[:2]:
+                logger.warning(f"Citra {path} tidak dapat dibaca atau ukurannya berbeda dengan matriks suhu, "
+                               f"melewatkan file ini.")
+                return None
+            with metrics.phase('palette', 'compute'):
+                mask = matrix > 0
+                keys = _color_keys(image, bins)[mask]
+                temperatures = np.asarray(matrix[mask], dtype=np.float64)
+                return (np.bincount(keys, minlength=n_cells),
+                        np.bincount(keys, weights=temperatures, minlength=n_cells),
+                        np.bincount(keys, weights=temperatures ** 2, minlength=n_cells),
+                        temperatures.min(initial=np.inf), temperatures.max(initial=-np.inf))
+
+        counts = np.zeros(n_cells, dtype=np.int64)
+        sums = np.zeros(n_cells, dtype=np.float64)
+        squares = np.zeros(n_cells, dtype=np.float64)
+        t_min, t_max = np.inf, -np.inf
+        with metrics.stage('palette'):
+            with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count() or 1) as executor:
+                for result in executor.map(_accumulate, pairs):
+                    if result is None:
+                        continue
+                    counts += result[0]
+                    sums += result[1]
+                    squares += result[2]
+                    t_min, t_max = min(t_min, result[3]), max(t_max, result[4])
+            metrics.count('palette', files=len(pairs))
+
+            filled = counts > 0
+            if not filled.any():
+                raise FileNotFoundError(f"Tidak ada piksel kaki (suhu > 0) di pasangan citra {input_dir}.")
+            if t_max <= t_min:
+                raise ValueError(f"Rentang suhu kalibrasi nol ({t_min:.2f} °C); "
+                                 f"dibutuhkan matriks suhu yang bervariasi.")
+            table = np.zeros(n_cells, dtype=np.float64)
+            table[filled] = sums[filled] / counts[filled]
+            # Galat rekonstruksi pada data kalibrasi = variasi suhu di dalam setiap sel warna
+            rmse = float(np.sqrt(max(squares[filled].sum() - (sums[filled] ** 2 / counts[filled]).sum(), 0.0)
+                                 / counts.sum()))
+
+            if not filled.all():
+                from sklearn.neighbors import NearestNeighbors
+
+                cells = np.stack(np.unravel_index(np.arange(n_cells), (bins,) * 3), axis=1)
+                nearest = NearestNeighbors(n_neighbors=1).fit(cells[filled])
+                _, neighbor = nearest.kneighbors(cells[~filled])
+                table[~filled] = table[filled][neighbor[:, 0]]
+
+        lut = PaletteLut(table=table.reshape((bins,) * 3).astype(np.float32), bins=bins, t_min=float(t_min),
+                         t_max=float(t_max), rmse=rmse)
+        logger.info(f"LUT palet {bins}^3 dikalibrasi dari {len(pairs)} citra: {100 * filled.mean():.1f}% sel terisi, "
+                    f"suhu {t_min:.2f}-{t_max:.2f} °C, RMSE {rmse:.3f} °C")
+        logger.info(metrics.summary('palette'))
+        if output_path is not None:
+            save_palette_lut(lut, output_path)
+        return lut
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat mengkalibrasi LUT palet dari {input_dir}: {e}")
+        raise
+
+def save_palette_lut(lut, path):
+    """
+    Menyimpan LUT palet ke file .npz.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    np.savez(path, table=lut.table, bins=lut.bins, t_min=lut.t_min, t_max=lut.t_max, rmse=lut.rmse)
+    logger.info(f"LUT palet disimpan ke {path}")
+
+def load_palette_lut(lut):
+    """
+    Membuka LUT palet dari jalur file .npz (PaletteLut dikembalikan apa adanya).
+    """
+    if isinstance(lut, PaletteLut):
+        return lut
+    if not os.path.exists(lut):
+        raise FileNotFoundError(f"LUT palet {lut} tidak ditemukan.")
+    with np.load(lut) as data:
+        return PaletteLut(table=data['table'].astype(np.float32), bins=int(data['bins']), t_min=float(data['t_min']),
+                          t_max=float(data['t_max']), rmse=float(data['rmse']))
+
+def palette_metadata(lut):
+    """
+    Ringkasan LUT untuk index dataset store dan konfigurasi ekspor.
+    """
+    return {'bins': lut.bins, 't_min': lut.t_min, 't_max': lut.t_max, 'rmse': lut.rmse}
+
+def invert_palette(image, lut, channel_order='BGR', normalize=True):
+    """
+    Mengubah citra pseudo-colour menjadi citra suhu satu channel dengan satu lookup per piksel.
+
+    Parameters
+    ----------
+    image : numpy.ndarray
+        Citra (H, W, 3) uint8, atau tumpukan citra (N, H, W, 3).
+    lut : PaletteLut or str
+        LUT hasil calibrate_palette_lut atau jalur file-nya.
+    channel_order : str, optional
+        'BGR' (konvensi OpenCV) atau 'RGB'.
+    normalize : bool, optional
+        True untuk suhu ternormalisasi (t - t_min) / (t_max - t_min) yang dipotong ke [0, 1];
+        False untuk suhu dalam °C.
+
+    Returns
+    -------
+    temperature : numpy.ndarray
+        Citra suhu float32 berbentuk (..., H, W); piksel latar belakang (hitam) bernilai 0.
+
+    Raises
+    ------
+    ValueError
+        Jika normalize=True dan rentang suhu LUT nol.
+    """
+    lut = load_palette_lut(lut)
+    image = np.asarray(image)
+    temperature = lut.table.reshape(-1)[_color_keys(image, lut.bins, channel_order)]
+    if normalize:
+        if lut.t_max <= lut.t_min:
+            raise ValueError(f"Rentang suhu LUT nol ({lut.t_min:.2f} °C); suhu tidak dapat dinormalisasi.")
+        temperature = (temperature - lut.t_min) * np.float32(1.0 / (lut.t_max - lut.t_min))
+        np.clip(temperature, 0.0, 1.0, out=temperature)
+    temperature[~image.any(axis=-1)] = 0.0
+    return temperature
+
+if __name__ == "__main__":
+    # Jalankan dengan: python -m src.data.palette
+    import argparse
+    from ..utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Mengkalibrasi LUT pseudo-colour -> suhu dari pasangan PNG/CSV.")
+    parser.add_argument('--input_dir', default='./data/raw/')
+    parser.add_argument('--temperature_store', default=None,
+                        help="Store matriks suhu (src.data.temperature_store) sebagai pengganti parsing CSV.")
+    parser.add_argument('--bins', type=int, default=DEFAULT_BINS)
+    parser.add_argument('--output_path', default=f'./data/processed/{PALETTE_LUT_FILE}')
+    parser.add_argument('--num_workers', type=int, default=None)
+    args = parser.parse_args()
+    configure_logging()
+
+    calibrate_palette_lut(args.input_dir, temperature_store=args.temperature_store, bins=args.bins,
+                          output_path=args.output_path, num_workers=args.num_workers)
\ No newline at end of file
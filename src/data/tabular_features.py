@@ -0,0 +1,287 @@
+# src/data/tabular_features.py
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .angiosome_store import ANGIOSOMES
+from .temperature_store import GROUPS, sample_temperature_files, _parse_task
+from ..utils.instrumentation import get_metrics
+
+logger = logging.getLogger('src.data.tabular_features')
+
+# Suhu referensi (°C) setiap angiosom untuk TCI, sama dengan nilai yang dipakai di
+# 'Plantar Thermogram Data Analysis.csv' (TCI = rata-rata |suhu angiosom - referensi|)
+TCI_REFERENCE = {'LCA': 26.1, 'LPA': 25.7, 'MCA': 26.4, 'MPA': 25.8}
+SIDES = {'right': 'R', 'left': 'L'}
+REGIONS = ('General',) + ANGIOSOMES
+# Urutan kolom sama dengan sheet data tabular sehingga hasilnya dapat dipakai load_tabular_data/normalize_tabular_data
+TABULAR_COLUMNS = ['Subject', 'Gender'] + [f'{name}_{side}' for side in SIDES for name in REGIONS + ('TCI',)]
+
+def _region_part(code, region):
+    """
+    Nama bagian matriks di store/data mentah: 'R' untuk seluruh kaki kanan, 'R_LCA' untuk angiosom.
+    """
+    return code if region == 'General' else f'{code}_{region}'
+
+def masked_means(matrices):
+    """
+    Rata-rata suhu piksel kaki (> 0) setiap matriks, dihitung sekaligus untuk semua matriks.
+
+    Matriks berukuran berbeda digabung ke satu buffer datar, lalu jumlah dan jumlah piksel kaki setiap matriks
+    dihitung dengan satu np.bincount per besaran (tanpa loop per matriks).
+
+    Parameters
+    ----------
+    matrices : list of numpy.ndarray
+        Matriks suhu (0 di luar telapak kaki).
+
+    Returns
+    -------
+    means : numpy.ndarray
+        Rata-rata float64 berbentuk (len(matrices),); NaN untuk matriks tanpa piksel kaki.
+    """
+    n = len(matrices)
+    if n == 0:
+        return np.empty(0, dtype=np.float64)
+    sizes = np.array([np.size(matrix) for matrix in matrices], dtype=np.int64)
+    flat = np.concatenate([np.asarray(matrix, dtype=np.float32).ravel() for matrix in matrices])
+    segments = np.repeat(np.arange(n), sizes)
+    foot = flat > 0
+    counts = np.bincount(segments, weights=foot, minlength=n)
+    sums = np.bincount(segments, weights=np.where(foot, flat, 0.0), minlength=n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+def thermal_change_index(angiosome_means, reference=None):
+    """
+    Thermal Change Index: rata-rata selisih absolut suhu keempat angiosom terhadap suhu referensi.
+
+    Parameters
+    ----------
+    angiosome_means : numpy.ndarray
+        Rata-rata suhu angiosom berbentuk (..., 4) dengan urutan ANGIOSOMES.
+    reference : dict, optional
+        Suhu referensi per angiosom. Default: TCI_REFERENCE.
+
+    Returns
+    -------
+    tci : numpy.ndarray
+        TCI berbentuk (...,).
+    """
+    reference = TCI_REFERENCE if reference is None else reference
+    reference = np.array([reference[angiosome] for angiosome in ANGIOSOMES], dtype=np.float64)
+    return np.abs(np.asarray(angiosome_means, dtype=np.float64) - reference).mean(axis=-1)
+
+def _collect_samples(raw_dir):
+    samples = []
+    for group_name in GROUPS:
+        group_path = os.path.join(raw_dir, group_name)
+        if not os.path.isdir(group_path):
+            logger.warning(f"Direktori {group_path} tidak ditemukan, melewatkan grup ini.")
+            continue
+        for sample_name in sorted(os.listdir(group_path)):
+            sample_path = os.path.join(group_path, sample_name)
+            if os.path.isdir(sample_path) and '_' in sample_name:
+                samples.append(sample_path)
+    return samples
+
+def _feature_frame(samples, matrices, reference, decimals):
+    """
+    Menyusun DataFrame fitur dari matriks per (sampel, sisi, region) yang berurutan seperti _matrix_keys.
+    """
+    import pandas as pd
+
+    n_regions = len(REGIONS)
+    means = masked_means(matrices).reshape(len(samples), len(SIDES), n_regions)
+    tci = thermal_change_index(means[..., 1:], reference)
+
+    columns = {
+        'Subject': [os.path.basename(os.path.normpath(path)).split('_')[0] for path in samples],
+        'Gender': [os.path.basename(os.path.normpath(path)).split('_')[1] for path in samples],
+    }
+    for s, side in enumerate(SIDES):
+        for r, region in enumerate(REGIONS):
+            columns[f'{region}_{side}'] = means[:, s, r]
+        columns[f'TCI_{side}'] = tci[:, s]
+    data_tabular = pd.DataFrame(columns, columns=TABULAR_COLUMNS)
+    if decimals is not None:
+        data_tabular = data_tabular.round(decimals)
+    return data_tabular
+
+def _matrix_keys(sample_path):
+    """
+    Pasangan (part, path) matriks yang dibutuhkan satu sampel, berurutan per sisi lalu region; path None jika tidak ada.
+    """
+    available = {part: path for _, part, path in sample_temperature_files(sample_path)}
+    return [(_region_part(code, region), available.get(_region_part(code, region)))
+            for code in SIDES.values() for region in REGIONS]
+
+def extract_tabular_features(raw_dir, temperature_store=None, subjects=None, reference=None, decimals=2,
+                             output_path=None, num_workers=None):
+    """
+    Menghitung fitur tabular (General, LCA, LPA, MCA, MPA, dan TCI per kaki) langsung dari matriks suhu mentah.
+
+    Rata-rata suhu piksel kaki semua matriks semua subjek dihitung dalam satu operasi (masked_means), dan TCI
+    dihitung tervektorisasi untuk seluruh subjek. Hasilnya memiliki kolom yang sama dengan sheet
+    'Plantar Thermogram Data Analysis.csv', sehingga dapat menggantikan load_tabular_data.
+
+    Parameters
+    ----------
+    raw_dir : str
+        Direktori data mentah ('data/raw/'), berisi '<grup>/<Subject>_<Gender>/' dengan CSV kaki dan 'Angiosoms/'.
+    temperature_store : str or TemperatureStore, optional
+        Store hasil convert_temperature_matrices; jika diberikan, matriks dibaca dari store (tanpa parsing CSV).
+    subjects : list of str, optional
+        Subjek yang dihitung. Default: semua subjek di raw_dir.
+    reference : dict, optional
+        Suhu referensi angiosom untuk TCI. Default: TCI_REFERENCE.
+    decimals : int or None, optional
+        Pembulatan seperti sheet (2 desimal); None tanpa pembulatan.
+    output_path : str, optional
+        Jalur file CSV (pemisah ';', dapat dibaca load_tabular_data). Default: tidak disimpan.
+    num_workers : int, optional
+        Jumlah proses untuk parsing CSV. Default: jumlah core CPU.
+
+    Returns
+    -------
+    data_tabular : pandas.DataFrame
+        Satu baris per subjek dengan kolom TABULAR_COLUMNS; nilai NaN untuk matriks yang tidak ada.
+
+    Raises
+    ------
+    FileNotFoundError
+        Jika direktori input tidak ditemukan atau tidak ada subjek.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    try:
+        if not os.path.exists(raw_dir):
+            raise FileNotFoundError(f"Direktori {raw_dir} tidak ditemukan.")
+        samples = _collect_samples(raw_dir)
+        if subjects is not None:
+            wanted = {str(subject) for subject in subjects}
+            samples = [path for path in samples if os.path.basename(path).split('_')[0] in wanted]
+        if not samples:
+            raise FileNotFoundError(f"Tidak ada subjek di direktori {raw_dir}.")
+        if isinstance(temperature_store, str):
+            from .temperature_store import load_temperature_store
+
+            temperature_store = load_temperature_store(temperature_store)
+
+        metrics = get_metrics()
+        with metrics.stage('tabular_features'):
+            keys = [(os.path.basename(path).split('_')[0], part, csv_path)
+                    for path in samples for part, csv_path in _matrix_keys(path)]
+            missing = [f'{subject}_{part}' for subject, part, csv_path in keys if csv_path is None]
+            if missing:
+                logger.warning(f"{len(missing)} matriks suhu tidak ditemukan (misalnya {missing[0]}), nilainya NaN.")
+
+            with metrics.phase('tabular_features', 'decode'):
+                if temperature_store is not None:
+                    matrices = [temperature_store.get(subject, part) if csv_path is not None else np.zeros(0)
+                                for subject, part, csv_path in keys]
+                else:
+                    tasks = [(csv_path, np.float32) for _, _, csv_path in keys if csv_path is not None]
+                    num_workers = max(1, min(num_workers or os.cpu_count() or 1, len(tasks)))
+                    if num_workers == 1:
+                        parsed = [_parse_task(task) for task in tasks]
+                    else:
+                        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                            parsed = list(executor.map(_parse_task, tasks,
+                                                       chunksize=max(1, len(tasks) // (num_workers * 4))))
+                    parsed = iter(parsed)
+                    matrices = [next(parsed) if csv_path is not None else np.zeros(0) for _, _, csv_path in keys]
+                    metrics.count('tabular_features', bytes_read=sum(os.path.getsize(path) for path, _ in tasks))
+
+            with metrics.phase('tabular_features', 'compute'):
+                data_tabular = _feature_frame(samples, matrices, reference, decimals)
+            metrics.count('tabular_features', files=len(keys) - len(missing))
+
+        logger.info(f"Fitur tabular {len(data_tabular)} subjek dihitung dari matriks suhu di {raw_dir}")
+        logger.info(metrics.summary('tabular_features'))
+        if output_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+            data_tabular.to_csv(output_path, sep=';', index=False)
+            logger.info(f"Fitur tabular disimpan ke {output_path}")
+        return data_tabular
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat menghitung fitur tabular dari {raw_dir}: {e}")
+        raise
+
+def extract_sample_features(sample_path, reference=None, decimals=2):
+    """
+    Menghitung fitur tabular satu pasien baru dari direktori '<Subject>_<Gender>/' (CSV kaki dan 'Angiosoms/').
+
+    Returns
+    -------
+    data_tabular : pandas.DataFrame
+        Satu baris dengan kolom TABULAR_COLUMNS (lihat extract_tabular_features).
+
+    Raises
+    ------
+    FileNotFoundError
+        Jika direktori tidak ditemukan atau matriks suhu tidak lengkap.
+    """
+    from .temperature_store import parse_temperature_csv
+
+    if not os.path.isdir(sample_path):
+        raise FileNotFoundError(f"Direktori {sample_path} tidak ditemukan.")
+    keys = _matrix_keys(sample_path)
+    missing = [part for part, path in keys if path is None]
+    if missing:
+        raise FileNotFoundError(f"Matriks suhu {', '.join(missing)} tidak ditemukan di {sample_path}.")
+    matrices = [parse_temperature_csv(path) for _, path in keys]
+    return _feature_frame([sample_path], matrices, reference, decimals)
+
+def compare_tabular_features(computed, reference_table, tolerance=0.01):
+    """
+    Membandingkan fitur hasil ekstraksi dengan sheet data tabular per kolom (subjek dicocokkan dengan 'Subject').
+
+    Returns
+    -------
+    report : pandas.DataFrame
+        Satu baris per kolom fitur: jumlah subjek, rata-rata dan maksimum selisih absolut, serta proporsi
+        subjek dengan selisih <= tolerance.
+    """
+    import pandas as pd
+
+    merged = computed.merge(reference_table, on='Subject', suffixes=('', '_reference'))
+    rows = []
+    for column in TABULAR_COLUMNS[2:]:
+        if f'{column}_reference' not in merged.columns:
+            continue
+        diff = (merged[column] - merged[f'{column}_reference']).abs()
+        rows.append({'feature': column, 'n': int(diff.notna().sum()), 'mean_abs_diff': diff.mean(),
+                     'max_abs_diff': diff.max(), 'within_tolerance': float((diff <= tolerance + 1e-9).mean())})
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    # Jalankan dengan: python -m src.data.tabular_features
+    import argparse
+    from .data_preprocessing import load_tabular_data
+    from ..utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Menghitung fitur tabular suhu langsung dari matriks suhu mentah.")
+    parser.add_argument('--raw_dir', default='./data/raw/')
+    parser.add_argument('--sample_dir', default=None,
+                        help="Direktori satu pasien baru ('<grup>/<Subject>_<Gender>/'); hasil dicetak ke stdout.")
+    parser.add_argument('--temperature_store', default=None,
+                        help="Store matriks suhu (src.data.temperature_store) sebagai pengganti parsing CSV.")
+    parser.add_argument('--output_path', default='./data/processed/tabular_features.csv')
+    parser.add_argument('--reference_path', default=None,
+                        help="Sheet data tabular untuk verifikasi, misalnya "
+                             "'./data/external/Plantar Thermogram Data Analysis.csv'.")
+    parser.add_argument('--num_workers', type=int, default=None)
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.sample_dir is not None:
+        print(extract_sample_features(args.sample_dir).to_csv(sep=';', index=False), end='')
+    else:
+        features = extract_tabular_features(args.raw_dir, temperature_store=args.temperature_store,
+                                            output_path=args.output_path, num_workers=args.num_workers)
+        if args.reference_path is not None:
+            report = compare_tabular_features(features, load_tabular_data(args.reference_path))
+            logger.info("Perbandingan dengan sheet data tabular:\n" + report.to_string(index=False))
\ No newline at end of file
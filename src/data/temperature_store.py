@@ -0,0 +1,242 @@
+# src/data/temperature_store.py
+
+import os
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ..utils.instrumentation import get_metrics
+
+logger = logging.getLogger('src.data.temperature_store')
+
+INDEX_FILE = 'index.json'
+DATA_FILE = 'temperatures.npy'
+GROUPS = ['Control Group', 'DM Group']
+
+def parse_temperature_csv(path, dtype=np.float32):
+    """
+    Membaca satu matriks suhu CSV (nilai dipisahkan koma, 0 di luar telapak kaki).
+    """
+    return np.loadtxt(path, delimiter=',', dtype=dtype, ndmin=2)
+
+def sample_temperature_files(sample_path, include_angiosomes=True):
+    """
+    Mengumpulkan file matriks suhu satu subjek dari direktori '<grup>/<Subject>_<Gender>/'.
+
+    Returns
+    -------
+    entries : list of tuple
+        Daftar (subject, part, path) yang terurut (lihat collect_temperature_files).
+    """
+    sample_name = os.path.basename(os.path.normpath(sample_path))
+    subject = sample_name.split('_')[0]
+    search_dirs = [sample_path]
+    if include_angiosomes:
+        search_dirs.append(os.path.join(sample_path, 'Angiosoms'))
+    entries = []
+    for search_dir in search_dirs:
+        if not os.path.isdir(search_dir):
+            continue
+        for file_name in sorted(os.listdir(search_dir)):
+            if not file_name.endswith('.csv') or not file_name.startswith(f'{sample_name}_'):
+                continue
+            part = file_name[len(sample_name) + 1:-len('.csv')]
+            entries.append((subject, part, os.path.join(search_dir, file_name)))
+    return entries
+
+def collect_temperature_files(raw_dir, include_angiosomes=True):
+    """
+    Mengumpulkan file matriks suhu dari struktur 'data/raw/{Control Group,DM Group}/<ID>/'.
+
+    Parameters
+    ----------
+    raw_dir : str
+        Jalur ke direktori data mentah.
+    include_angiosomes : bool, optional
+        Ikut mengumpulkan matriks angiosom di subdirektori 'Angiosoms'.
+
+    Returns
+    -------
+    entries : list of tuple
+        Daftar (subject, part, path) yang terurut, misalnya ('CG001', 'L', ...) atau ('CG001', 'L_LCA', ...).
+    """
+    entries = []
+    for group_name in GROUPS:
+        group_path = os.path.join(raw_dir, group_name)
+        if not os.path.exists(group_path):
+            logger.warning(f"Direktori {group_path} tidak ditemukan, melewatkan grup ini.")
+            continue
+        for sample_name in sorted(os.listdir(group_path)):
+            sample_path = os.path.join(group_path, sample_name)
+            if not os.path.isdir(sample_path):
+                continue
+            entries.extend(sample_temperature_files(sample_path, include_angiosomes=include_angiosomes))
+    return entries
+
+def _parse_task(task):
+    path, dtype = task
+    return parse_temperature_csv(path, dtype=np.float32).astype(dtype, copy=False)
+
+def convert_temperature_matrices(raw_dir, output_dir, dtype='float32', include_angiosomes=True, num_workers=None):
+    """
+    Mengonversi seluruh matriks suhu CSV menjadi satu store biner dengan index per subjek.
+
+    Matriks memiliki ukuran berbeda-beda sehingga disimpan berurutan dalam satu buffer datar
+    ('temperatures.npy'); posisi dan bentuk setiap matriks dicatat di 'index.json'.
+
+    Parameters
+    ----------
+    raw_dir : str
+        Jalur ke direktori data mentah ('data/raw/').
+    output_dir : str
+        Direktori tujuan store (misalnya, 'data/processed/temperature_store/').
+    dtype : str, optional
+        Tipe data penyimpanan, 'float32' atau 'float16'.
+    include_angiosomes : bool, optional
+        Ikut mengonversi matriks angiosom.
+    num_workers : int, optional
+        Jumlah proses untuk parsing CSV. Default: jumlah core CPU.
+
+    Returns
+    -------
+    index : dict
+        Metadata store yang juga disimpan ke 'index.json'.
+
+    Raises
+    ------
+    FileNotFoundError
+        Jika direktori input tidak ditemukan atau tidak ada file CSV di dalamnya.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    try:
+        if not os.path.exists(raw_dir):
+            raise FileNotFoundError(f"Direktori {raw_dir} tidak ditemukan.")
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float16, np.float32):
+            raise ValueError(f"dtype {dtype} tidak didukung, gunakan 'float32' atau 'float16'.")
+
+        entries = collect_temperature_files(raw_dir, include_angiosomes=include_angiosomes)
+        if not entries:
+            raise FileNotFoundError(f"Tidak ada file matriks suhu di direktori {raw_dir}.")
+
+        tasks = [(path, dtype) for _, _, path in entries]
+        num_workers = max(1, min(num_workers or os.cpu_count() or 1, len(tasks)))
+        metrics = get_metrics()
+        with metrics.stage('temperature_store'):
+            with metrics.phase('temperature_store', 'decode'):
+                if num_workers == 1:
+                    matrices = [_parse_task(task) for task in tasks]
+                else:
+                    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                        matrices = list(executor.map(_parse_task, tasks,
+                                                     chunksize=max(1, len(tasks) // (num_workers * 4))))
+            metrics.count('temperature_store', files=len(tasks),
+                          bytes_read=sum(os.path.getsize(path) for path, _ in tasks))
+
+            os.makedirs(output_dir, exist_ok=True)
+            total = sum(matrix.size for matrix in matrices)
+            buffer = np.lib.format.open_memmap(os.path.join(output_dir, DATA_FILE), mode='w+', dtype=dtype,
+                                               shape=(total,))
+            subjects = {}
+            offset = 0
+            with metrics.phase('temperature_store', 'encode'):
+                for (subject, part, _), matrix in zip(entries, matrices):
+                    buffer[offset:offset + matrix.size] = matrix.ravel()
+                    subjects.setdefault(subject, {})[part] = {'offset': offset, 'shape': list(matrix.shape)}
+                    offset += matrix.size
+                buffer.flush()
+            metrics.count('temperature_store', bytes_written=buffer.nbytes)
+            del buffer
+
+        index = {'dtype': dtype.name, 'subjects': subjects}
+        with open(os.path.join(output_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+
+        logger.info(f"Store matriks suhu disimpan ke {output_dir}: {len(entries)} matriks, {len(subjects)} subjek")
+        logger.info(metrics.summary('temperature_store'))
+        return index
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat mengonversi matriks suhu dari {raw_dir}: {e}")
+        raise
+
+class TemperatureStore:
+    """
+    Akses baca ke store matriks suhu hasil convert_temperature_matrices.
+
+    Parameters
+    ----------
+    store_dir : str
+        Direktori store.
+    mmap_mode : str or None, optional
+        Mode memmap numpy; None memuat seluruh buffer ke memori.
+    """
+
+    def __init__(self, store_dir, mmap_mode='r'):
+        index_path = os.path.join(store_dir, INDEX_FILE)
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"Index store matriks suhu {index_path} tidak ditemukan.")
+        with open(index_path, 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.buffer = np.load(os.path.join(store_dir, DATA_FILE), mmap_mode=mmap_mode)
+
+    @property
+    def subjects(self):
+        return sorted(self.index['subjects'])
+
+    def parts(self, subject):
+        """
+        Daftar bagian yang tersedia untuk subjek, misalnya ['L', 'L_LCA', ..., 'R_MPA'].
+        """
+        return sorted(self.index['subjects'][subject])
+
+    def get(self, subject, part='L'):
+        """
+        Mengambil matriks suhu (view tanpa salinan) untuk subjek dan bagian tertentu.
+
+        Parameters
+        ----------
+        subject : str
+            ID subjek, misalnya 'CG001' atau 'DM012'.
+        part : str, optional
+            'L', 'R', atau angiosom seperti 'L_LCA'.
+
+        Returns
+        -------
+        matrix : numpy.ndarray
+            Matriks suhu berbentuk (H, W).
+
+        Raises
+        ------
+        KeyError
+            Jika subjek atau bagian tidak ada di store.
+        """
+        try:
+            entry = self.index['subjects'][subject][part]
+        except KeyError:
+            raise KeyError(f"Matriks suhu {subject} bagian {part} tidak ditemukan di store.")
+        offset = entry['offset']
+        size = int(np.prod(entry['shape']))
+        return self.buffer[offset:offset + size].reshape(entry['shape'])
+
+def load_temperature_store(store_dir, mmap_mode='r'):
+    """
+    Membuka store matriks suhu (lihat TemperatureStore).
+    """
+    return TemperatureStore(store_dir, mmap_mode=mmap_mode)
+
+if __name__ == "__main__":
+    # Jalankan dengan: python -m src.data.temperature_store
+    import argparse
+    from ..utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Mengonversi matriks suhu CSV menjadi store biner.")
+    parser.add_argument('--raw_dir', default='./data/raw/')
+    parser.add_argument('--output_dir', default='./data/processed/temperature_store/')
+    parser.add_argument('--dtype', default='float32', choices=['float32', 'float16'])
+    parser.add_argument('--num_workers', type=int, default=None)
+    args = parser.parse_args()
+    configure_logging()
+
+    convert_temperature_matrices(args.raw_dir, args.output_dir, dtype=args.dtype, num_workers=args.num_workers)
\ No newline at end of file
@@ -0,0 +1,208 @@
+# src/data/tf_pipeline.py
+
+import logging
+import numpy as np
+from .dataset_store import load_dataset_store, termogram_image_paths, tabular_arrays, PackedDataset
+
+logger = logging.getLogger('src.data.tf_pipeline')
+
+def _enhancement_fn(enhancement):
+    """
+    Membuat fungsi enhancement untuk satu citra RGB uint8 (tensor) dari rangkaian (technique, params).
+
+    Rangkaian yang seluruhnya point-wise (Posterize, Solarize, Gamma) digabung menjadi satu LUT
+    dan dijalankan di graph TensorFlow dengan tf.gather; rangkaian yang memuat CLAHE dijalankan
+    dengan OpenCV melalui tf.numpy_function.
+    """
+    import tensorflow as tf
+    from ..utils.image_enhancement import LUT_BUILDERS, get_lut_chain, apply_enhancement_chain
+
+    steps = [(technique, dict(params)) for technique, params in enhancement]
+    if all(technique in LUT_BUILDERS for technique, _ in steps):
+        table = tf.constant(get_lut_chain(steps))
+        return lambda image: tf.gather(table, tf.cast(image, tf.int32))
+
+    def _apply_numpy(image):
+        # clahe_image bekerja pada urutan channel BGR
+        image = apply_enhancement_chain(np.ascontiguousarray(image[..., ::-1]), steps)
+        return np.ascontiguousarray(image[..., ::-1])
+
+    def _apply(image):
+        enhanced = tf.numpy_function(_apply_numpy, [image], tf.uint8)
+        enhanced.set_shape(image.shape)
+        return enhanced
+
+    return _apply
+
+def _build_pipeline(dataset, load_fn, n, batch_size, shuffle, seed, cache, shuffle_buffer,
+                    enhancement, normalize, num_parallel_calls, prefetch):
+    """
+    Menyusun tahapan pipeline bersama: load paralel, enhancement, cache, shuffle, normalisasi, batch, prefetch.
+    """
+    import tensorflow as tf
+
+    autotune = tf.data.AUTOTUNE
+    num_parallel_calls = num_parallel_calls or autotune
+
+    # Tanpa cache, yang diacak cukup indeks/jalur sehingga buffer shuffle tidak menyimpan citra
+    if shuffle and not cache:
+        dataset = dataset.shuffle(n, seed=seed, reshuffle_each_iteration=True)
+
+    dataset = dataset.map(load_fn, num_parallel_calls=num_parallel_calls, deterministic=not shuffle)
+
+    if enhancement:
+        enhance = _enhancement_fn(enhancement)
+        dataset = dataset.map(
+            lambda left, right, tabular, label: (enhance(left), enhance(right), tabular, label),
+            num_parallel_calls=num_parallel_calls, deterministic=not shuffle)
+
+    # Cache menyimpan citra uint8 (sebelum normalisasi) agar 4x lebih kecil dari float32
+    if cache:
+        dataset = dataset.cache(cache if isinstance(cache, str) else '')
+        if shuffle:
+            dataset = dataset.shuffle(shuffle_buffer or n, seed=seed, reshuffle_each_iteration=True)
+
+    def _to_model_inputs(left, right, tabular, label):
+        # Citra float (load_termogram_arrays dengan dtype float) sudah berada di rentang [0, 1]
+        if normalize and left.dtype == tf.uint8:
+            left = tf.cast(left, tf.float32) / 255.0
+            right = tf.cast(right, tf.float32) / 255.0
+        elif normalize:
+            left = tf.cast(left, tf.float32)
+            right = tf.cast(right, tf.float32)
+        return {'input_left': left, 'input_right': right, 'input_tabular': tabular}, label
+
+    dataset = dataset.map(_to_model_inputs, num_parallel_calls=num_parallel_calls)
+    dataset = dataset.batch(batch_size)
+    return dataset.prefetch(prefetch or autotune)
+
+def create_store_dataset(store, indices=None, batch_size=32, shuffle=False, seed=None, cache=False,
+                         shuffle_buffer=None, enhancement=None, normalize=True, tabular_scaler=None,
+                         num_parallel_calls=None, prefetch=None):
+    """
+    Membuat tf.data.Dataset untuk model tiga input dari dataset store (lihat build_dataset_store).
+
+    Citra dibaca per sampel dari array memory-mapped sehingga seluruh varian tidak perlu dimuat ke RAM.
+
+    Parameters
+    ----------
+    store : str or PackedDataset
+        Direktori dataset store, hasil load_dataset_store, atau hasil load_termogram_arrays (array di memori).
+    indices : array-like of int, optional
+        Indeks sampel yang digunakan (misalnya, indeks train/test suatu fold). Default: semua sampel.
+    batch_size : int, optional
+        Ukuran batch.
+    shuffle : bool, optional
+        Mengacak urutan sampel di setiap epoch.
+    seed : int, optional
+        Seed untuk shuffle.
+    cache : bool or str, optional
+        True untuk cache di memori, atau jalur file untuk cache di disk.
+    shuffle_buffer : int, optional
+        Ukuran buffer shuffle setelah cache. Default: jumlah sampel.
+    enhancement : list of tuple, optional
+        Rangkaian (technique, params) yang diterapkan on-the-fly, misalnya [('Solarize', {'threshold': 128})].
+    normalize : bool, optional
+        Mengubah citra menjadi float32 pada rentang [0, 1]. Gunakan False untuk model dengan rescale_input=True
+        sehingga batch citra tetap uint8.
+    tabular_scaler : sklearn.preprocessing.StandardScaler, optional
+        Scaler yang telah di-fit untuk fitur tabular.
+    num_parallel_calls : int, optional
+        Paralelisme tahap map. Default: tf.data.AUTOTUNE.
+    prefetch : int, optional
+        Jumlah batch yang di-prefetch. Default: tf.data.AUTOTUNE.
+
+    Returns
+    -------
+    dataset : tf.data.Dataset
+        Dataset yang menghasilkan ({'input_left', 'input_right', 'input_tabular'}, label).
+    """
+    import tensorflow as tf
+
+    try:
+        if not isinstance(store, PackedDataset):
+            store = load_dataset_store(store)
+        indices = np.arange(len(store.labels)) if indices is None else np.asarray(indices, dtype=np.int64)
+
+        tabular = np.asarray(store.tabular[indices], dtype=np.float32)
+        if tabular_scaler is not None:
+            tabular = tabular_scaler.transform(tabular).astype(np.float32)
+        labels = np.asarray(store.labels[indices], dtype=np.float32)
+
+        image_shape = tuple(store.left.shape[1:])
+        image_dtype = tf.as_dtype(store.left.dtype)
+        if enhancement and image_dtype != tf.uint8:
+            raise ValueError("Enhancement on-the-fly membutuhkan citra uint8.")
+        left_images, right_images = store.left, store.right
+
+        def _read_pair(index):
+            return left_images[index], right_images[index]
+
+        def _load(index, tabular_row, label):
+            left, right = tf.numpy_function(_read_pair, [index], (image_dtype, image_dtype))
+            left.set_shape(image_shape)
+            right.set_shape(image_shape)
+            return left, right, tabular_row, label
+
+        dataset = tf.data.Dataset.from_tensor_slices((indices, tabular, labels))
+        return _build_pipeline(dataset, _load, len(indices), batch_size, shuffle, seed, cache, shuffle_buffer,
+                               enhancement, normalize, num_parallel_calls, prefetch)
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat membuat tf.data dari dataset store: {e}")
+        raise
+
+def create_image_dataset(data_tabular, img_dir, target_size=None, features=None, batch_size=32, shuffle=False,
+                         seed=None, cache=False, shuffle_buffer=None, enhancement=None, normalize=True,
+                         tabular_scaler=None, num_parallel_calls=None, prefetch=None):
+    """
+    Membuat tf.data.Dataset untuk model tiga input langsung dari file PNG dengan dekode paralel di TensorFlow.
+
+    Parameters
+    ----------
+    data_tabular : pandas.DataFrame
+        Data tabular hasil load_tabular_data (kolom 'Gender' masih berupa 'M'/'F').
+    img_dir : str
+        Direktori dasar citra dengan folder 'Left' dan 'Right'.
+    target_size : tuple of int, optional
+        Ukuran (width, height) citra; jika diberikan, citra di-resize saat dekode.
+    features : list of str, optional
+        Kolom fitur tabular. Default: semua kolom selain 'Subject' dan 'label'.
+    batch_size, shuffle, seed, cache, shuffle_buffer, enhancement, normalize, tabular_scaler, num_parallel_calls, prefetch
+        Lihat create_store_dataset.
+
+    Returns
+    -------
+    dataset : tf.data.Dataset
+        Dataset yang menghasilkan ({'input_left', 'input_right', 'input_tabular'}, label).
+    """
+    import tensorflow as tf
+
+    try:
+        entries = termogram_image_paths(data_tabular, img_dir)
+        if not entries:
+            raise FileNotFoundError(f"Tidak ada pasangan citra subjek yang ditemukan di {img_dir}.")
+        positions = [position for position, _, _, _ in entries]
+        tabular, labels, _ = tabular_arrays(data_tabular, positions, features)
+        if tabular_scaler is not None:
+            tabular = tabular_scaler.transform(tabular).astype(np.float32)
+        left_paths = [left_path for _, _, left_path, _ in entries]
+        right_paths = [right_path for _, _, _, right_path in entries]
+
+        def _decode(path):
+            image = tf.io.decode_png(tf.io.read_file(path), channels=3)
+            if target_size is not None:
+                image = tf.image.resize(image, (target_size[1], target_size[0]), method='area')
+                image = tf.cast(tf.round(image), tf.uint8)
+            return image
+
+        def _load(left_path, right_path, tabular_row, label):
+            return _decode(left_path), _decode(right_path), tabular_row, label
+
+        dataset = tf.data.Dataset.from_tensor_slices((left_paths, right_paths, tabular, labels.astype(np.float32)))
+        return _build_pipeline(dataset, _load, len(entries), batch_size, shuffle, seed, cache, shuffle_buffer,
+                               enhancement, normalize, num_parallel_calls, prefetch)
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat membuat tf.data dari {img_dir}: {e}")
+        raise
\ No newline at end of file
@@ -0,0 +1,119 @@
+# src/models/blocks.py
+
+from tensorflow.keras import layers, models
+
+GLOBAL_POOLING_LAYERS = {
+    'avg': layers.GlobalAveragePooling2D,
+    'max': layers.GlobalMaxPooling2D,
+}
+
+# Normalisasi citra uint8 ke [0, 1] di dalam model (pengganti pembagian /255 di pipeline data)
+RESCALE_FACTOR = 1.0 / 255.0
+
+def rescale_images(input_left, input_right, rescale_input=False):
+    """
+    Menambahkan layer Rescaling (1/255) pada input citra kiri dan kanan jika rescale_input=True.
+
+    Dengan opsi ini model menerima citra mentah 0-255 (misalnya uint8 langsung dari dataset store), sehingga
+    pipeline data tidak perlu menyimpan salinan float citra.
+    """
+    if not rescale_input:
+        return input_left, input_right
+    return (layers.Rescaling(RESCALE_FACTOR, name='rescale_left')(input_left),
+            layers.Rescaling(RESCALE_FACTOR, name='rescale_right')(input_right))
+
+def has_rescaling(model):
+    """
+    True jika model menormalisasi citranya sendiri (dibuat dengan rescale_input=True).
+    """
+    return any(layer.name == 'rescale_left' for layer in model.layers)
+
+def _conv_block(x, filters):
+    x = layers.Conv2D(filters, (3, 3), activation='relu')(x)
+    x = layers.MaxPooling2D(pool_size=(2, 2))(x)
+    return layers.BatchNormalization()(x)
+
+def _to_vector(x, global_pooling):
+    if global_pooling is None:
+        return layers.Flatten()(x)
+    if global_pooling not in GLOBAL_POOLING_LAYERS:
+        raise ValueError(f"global_pooling harus salah satu dari {', '.join(GLOBAL_POOLING_LAYERS)} atau None.")
+    return GLOBAL_POOLING_LAYERS[global_pooling]()(x)
+
+def _build_trunk(image_shape, conv_filters, global_pooling, name, input_name):
+    """
+    Tower konvolusi sebagai sub-model Keras, untuk dijalankan dengan TimeDistributed.
+    """
+    trunk_input = layers.Input(shape=image_shape, name=input_name)
+    x = trunk_input
+    for filters in conv_filters:
+        x = _conv_block(x, filters)
+    return models.Model(inputs=trunk_input, outputs=_to_vector(x, global_pooling), name=name)
+
+def _patch_features(input_left, input_right, conv_filters, shared_trunk, global_pooling):
+    """
+    Fitur tumpukan patch angiosom (batch, n_patch, H, W, C): satu tower per kaki yang dipakai bersama oleh
+    semua patch kaki tersebut, atau satu tower untuk seluruh patch kedua kaki jika shared_trunk=True.
+    """
+    patch_shape = tuple(input_left.shape[2:])
+    if shared_trunk:
+        trunk = _build_trunk(patch_shape, conv_filters, global_pooling, 'patch_trunk', 'patch_input')
+        stacked = layers.Concatenate(axis=1, name='stack_patches')([input_left, input_right])
+        patches = layers.TimeDistributed(trunk, name='shared_patch_trunk')(stacked)
+        return [layers.Flatten(name='flatten_patches')(patches)]
+
+    features = []
+    for side, image_input in [('left', input_left), ('right', input_right)]:
+        trunk = _build_trunk(patch_shape, conv_filters, global_pooling, f'patch_trunk_{side}', f'patch_input_{side}')
+        patches = layers.TimeDistributed(trunk, name=f'patches_{side}')(image_input)
+        features.append(layers.Flatten(name=f'flatten_patches_{side}')(patches))
+    return features
+
+def image_features(input_left, input_right, conv_filters, shared_trunk=False, global_pooling=None):
+    """
+    Membangun cabang konvolusi citra kiri dan kanan, lalu mengembalikan fitur yang siap digabung.
+
+    Setiap blok konvolusi terdiri dari Conv2D 3x3 (ReLU), MaxPooling2D 2x2, dan BatchNormalization.
+
+    Parameters
+    ----------
+    input_left, input_right : tf.Tensor
+        Input Keras citra kiri dan kanan dengan ukuran yang sama: citra penuh (batch, H, W, C) atau tumpukan
+        patch angiosom (batch, n_patch, H, W, C) dari build_angiosome_store.
+    conv_filters : list of int
+        Jumlah filter setiap blok konvolusi, misalnya [64, 128].
+    shared_trunk : bool, optional
+        True untuk satu tower bersama (siamese, bobot sama) yang memproses kedua kaki sebagai satu batch;
+        False untuk dua tower terpisah seperti arsitektur awal.
+    global_pooling : str, optional
+        'avg' atau 'max' untuk global pooling di akhir tower sebagai pengganti Flatten,
+        sehingga jumlah fitur tidak bergantung pada ukuran citra.
+
+    Returns
+    -------
+    features : list of tf.Tensor
+        Fitur citra untuk layers.concatenate, berurutan kiri lalu kanan.
+    """
+    if len(input_left.shape) == 5:
+        return _patch_features(input_left, input_right, conv_filters, shared_trunk, global_pooling)
+
+    if not shared_trunk:
+        features = []
+        for image_input in [input_left, input_right]:
+            x = image_input
+            for filters in conv_filters:
+                x = _conv_block(x, filters)
+            features.append(_to_vector(x, global_pooling))
+        return features
+
+    image_shape = tuple(input_left.shape[1:])
+    trunk = _build_trunk(image_shape, conv_filters, global_pooling, 'image_trunk', 'trunk_input')
+
+    # Citra kiri dan kanan ditumpuk menjadi (batch, 2, H, W, C) sehingga TimeDistributed menjalankan
+    # tower bersama sekali untuk batch 2x; hasil Flatten sama dengan [fitur kiri, fitur kanan]
+    stacked = layers.Concatenate(axis=1, name='stack_feet')([
+        layers.Reshape((1,) + image_shape, name='expand_left')(input_left),
+        layers.Reshape((1,) + image_shape, name='expand_right')(input_right),
+    ])
+    paired = layers.TimeDistributed(trunk, name='shared_trunk')(stacked)
+    return [layers.Flatten(name='flatten_feet')(paired)]
\ No newline at end of file
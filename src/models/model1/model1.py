@@ -2,40 +2,39 @@
 
 import tensorflow as tf
 from tensorflow.keras import layers, models, regularizers
+from ..blocks import image_features, rescale_images
 
-def create_model(input_shape_image, input_shape_tabular):
+def create_model(input_shape_image, input_shape_tabular, shared_trunk=False, global_pooling=None,
+                 rescale_input=False):
     """
     Membuat arsitektur model untuk menggabungkan data citra (kiri dan kanan) dan data tabular.
 
     Parameters
     ----------
     input_shape_image : tuple
-        Ukuran input untuk citra, dalam format (height, width, channels).
+        Ukuran input untuk citra, dalam format (height, width, channels), atau (n_patch, height, width, channels)
+        untuk tumpukan patch angiosom (lihat build_angiosome_store).
     input_shape_tabular : int
         Ukuran input untuk data tabular (jumlah fitur tabular).
+    shared_trunk : bool, optional
+        Menggunakan satu tower konvolusi bersama (bobot sama) untuk citra kiri dan kanan.
+    global_pooling : str, optional
+        'avg' atau 'max' untuk global pooling sebagai pengganti Flatten di akhir tower citra.
+    rescale_input : bool, optional
+        Menormalisasi citra 0-255 ke [0, 1] di dalam model dengan layer Rescaling.
     
     Returns
     -------
     model : tf.keras.Model
         Model Keras yang telah dibangun.
     """
-    # Input citra kiri
+    # Input citra kiri dan kanan
     input_left = layers.Input(shape=input_shape_image, name='input_left')
-
-    conv1_left = layers.Conv2D(64, (3, 3), activation='relu')(input_left)
-    pool1_left = layers.MaxPooling2D(pool_size=(2, 2))(conv1_left)
-    batch1_left = layers.BatchNormalization()(pool1_left)
-    
-    flatten_left = layers.Flatten()(batch1_left)
-
-    # Input citra kanan
     input_right = layers.Input(shape=input_shape_image, name='input_right')
 
-    conv1_right = layers.Conv2D(64, (3, 3), activation='relu')(input_right)
-    pool1_right = layers.MaxPooling2D(pool_size=(2, 2))(conv1_right)
-    batch1_right = layers.BatchNormalization()(pool1_right)
-    
-    flatten_right = layers.Flatten()(batch1_right)
+    image_left, image_right = rescale_images(input_left, input_right, rescale_input)
+    features_image = image_features(image_left, image_right, [64], shared_trunk=shared_trunk,
+                                    global_pooling=global_pooling)
 
     # Input data tabular
     input_tabular = layers.Input(shape=(input_shape_tabular,), name='input_tabular')
@@ -43,7 +42,7 @@ def create_model(input_shape_image, input_shape_tabular):
     drop1_tabular = layers.Dropout(0.5)(dense1_tabular)
 
     # Menggabungkan fitur dari citra dan data tabular
-    concat = layers.concatenate([flatten_left, flatten_right, drop1_tabular], name='concatenate')
+    concat = layers.concatenate(features_image + [drop1_tabular], name='concatenate')
 
     # Layer fully connected untuk output gabungan
     dense1 = layers.Dense(32, activation='relu', kernel_regularizer=regularizers.l2())(concat)
@@ -2,37 +2,44 @@
 
 import tensorflow as tf
 from tensorflow.keras import layers, models, regularizers
+from ..blocks import rescale_images
 
-def create_model(input_shape_image, input_shape_tabular):
+def create_model(input_shape_image, input_shape_tabular, rescale_input=False):
     """
     Membuat arsitektur model yang menggabungkan data citra (kiri dan kanan) dan data tabular dengan arsitektur yang berbeda dari model sebelumnya.
 
     Parameters
     ----------
     input_shape_image : tuple
-        Ukuran input untuk citra, dalam format (height, width, channels).
+        Ukuran input untuk citra, dalam format (height, width, channels), atau (n_patch, height, width, channels)
+        untuk tumpukan patch angiosom (lihat build_angiosome_store).
     input_shape_tabular : int
         Ukuran input untuk data tabular (jumlah fitur tabular).
+    rescale_input : bool, optional
+        Menormalisasi citra 0-255 ke [0, 1] di dalam model dengan layer Rescaling.
     
     Returns
     -------
     model : tf.keras.Model
         Model Keras yang telah dibangun.
     """
-    # Input citra kiri
+    # Input citra kiri dan kanan
     input_left = layers.Input(shape=input_shape_image, name='input_left')
+    input_right = layers.Input(shape=input_shape_image, name='input_right')
+    image_left, image_right = rescale_images(input_left, input_right, rescale_input)
+    # Tumpukan patch angiosom: setiap layer citra dijalankan per patch dengan bobot yang sama
+    per_image = layers.TimeDistributed if len(input_shape_image) == 4 else (lambda layer: layer)
 
-    conv1_left = layers.Conv2D(64, (3, 3), activation='relu')(input_left)
-    pool1_left = layers.MaxPooling2D(pool_size=(2, 2))(conv1_left)
+    # Citra kiri
+    conv1_left = per_image(layers.Conv2D(64, (3, 3), activation='relu'))(image_left)
+    pool1_left = per_image(layers.MaxPooling2D(pool_size=(2, 2)))(conv1_left)
     batch1_left = layers.BatchNormalization()(pool1_left)
     
     flatten_left = layers.Flatten()(batch1_left)
 
-    # Input citra kanan
-    input_right = layers.Input(shape=input_shape_image, name='input_right')
-
-    conv1_right = layers.Conv2D(128, (3, 3), activation='relu')(input_right)
-    pool1_right = layers.MaxPooling2D(pool_size=(2, 2))(conv1_right)
+    # Citra kanan
+    conv1_right = per_image(layers.Conv2D(128, (3, 3), activation='relu'))(image_right)
+    pool1_right = per_image(layers.MaxPooling2D(pool_size=(2, 2)))(conv1_right)
     batch1_right = layers.BatchNormalization()(pool1_right)
     
     flatten_right = layers.Flatten()(batch1_right)
@@ -0,0 +1,599 @@
+# src/predict.py
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.utils.image_sizes import IMAGE_EXTENSIONS
+from src.utils.instrumentation import get_metrics, dump_metrics
+
+logger = logging.getLogger('src.predict')
+
+PREPROCESSING_FILE = 'preprocessing.json'
+SCALER_FILE = 'tabular_scaler.joblib'
+SAVED_MODEL_DIR = 'saved_model'
+TFLITE_FILE = 'model.tflite'
+BACKENDS = ('saved_model', 'tflite')
+INPUT_NAMES = ('input_left', 'input_right', 'input_tabular')
+
+# Kode gender sama dengan convert_gender_to_numeric
+GENDER_CODES = {'M': 1, 'F': 0}
+
+def enhancement_from_index(index):
+    """
+    Mengambil rangkaian enhancement [(technique, params)] dari metadata dataset store (lihat stream_resize_enhance).
+    """
+    enhancement = index.get('enhancement')
+    if not enhancement:
+        return []
+    return [(enhancement['name'], dict(enhancement['parameters']))]
+
+def export_model(model, export_dir, features, enhancement=None, scaler=None, formats=BACKENDS, crop=None,
+                 palette_lut=None):
+    """
+    Mengekspor model terlatih beserta konfigurasi preprocessing-nya untuk inferensi CPU.
+
+    Isi direktori ekspor: 'saved_model/' (SavedModel dengan signature 'serving_default'), 'model.tflite'
+    (jika diminta), 'preprocessing.json' (ukuran citra, enhancement, urutan fitur tabular),
+    'tabular_scaler.joblib' (jika ada), dan 'palette_lut.npz' (untuk model citra suhu).
+
+    Parameters
+    ----------
+    model : tf.keras.Model or str
+        Model Keras atau jalur file .keras.
+    export_dir : str
+        Direktori tujuan ekspor.
+    features : list of str
+        Urutan kolom fitur tabular yang dipakai saat pelatihan (misalnya, index['features'] dari dataset store).
+    enhancement : list of tuple, optional
+        Rangkaian (technique, params) yang diterapkan setelah resize, sama seperti saat pelatihan.
+    scaler : sklearn.preprocessing.StandardScaler or str, optional
+        Scaler fitur tabular atau jalur file joblib-nya. Untuk model hasil train_fold, gunakan scaler fold yang
+        disimpan di samping checkpoint (src.training.scaler_path_for) agar skala sama dengan saat pelatihan.
+    formats : sequence of str, optional
+        Format ekspor: 'saved_model' dan/atau 'tflite'.
+    crop : dict, optional
+        {'threshold', 'margin'} jika citra pelatihan dipotong ke ROI kaki sebelum resize (index['crop'] dari
+        dataset store); saat inferensi box dihitung dari piksel citra yang tidak nol.
+    palette_lut : PaletteLut or str, optional
+        LUT palet jika model dilatih dengan citra suhu satu channel (store 'Temperature/palette'); citra
+        pseudo-colour diubah dengan invert_palette sebelum crop dan resize saat inferensi.
+
+    Returns
+    -------
+    config : dict
+        Isi 'preprocessing.json'.
+
+    Raises
+    ------
+    ValueError
+        Jika format tidak dikenal atau input model tidak sesuai dengan fitur tabular.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    import tensorflow as tf
+    from src.models.blocks import has_rescaling
+
+    try:
+        unknown = [name for name in formats if name not in BACKENDS]
+        if unknown:
+            raise ValueError(f"Format ekspor {', '.join(unknown)} tidak dikenal. Pilihan: {', '.join(BACKENDS)}.")
+        if isinstance(model, str):
+            model = tf.keras.models.load_model(model)
+
+        shapes = {tensor.name: tuple(tensor.shape[1:]) for tensor in model.inputs}
+        if sorted(shapes) != sorted(INPUT_NAMES):
+            raise ValueError(f"Model harus memiliki input {', '.join(INPUT_NAMES)}.")
+        if shapes['input_tabular'] != (len(features),):
+            raise ValueError(f"Model membutuhkan {shapes['input_tabular'][0]} fitur tabular, "
+                             f"tetapi {len(features)} fitur diberikan.")
+        image_shape = shapes['input_left']
+        if len(image_shape) != 3:
+            raise ValueError(f"Ekspor hanya mendukung model citra penuh (H, W, C), bukan input {image_shape} "
+                             f"(misalnya tumpukan patch angiosom).")
+        palette = None
+        if palette_lut is not None:
+            from src.data.palette import PALETTE_LUT_FILE, load_palette_lut, save_palette_lut, palette_metadata
+
+            palette = load_palette_lut(palette_lut)
+            if image_shape[-1] != 1:
+                raise ValueError(f"Model citra suhu harus memiliki input satu channel, bukan {image_shape}.")
+
+        os.makedirs(export_dir, exist_ok=True)
+        saved_model_dir = os.path.join(export_dir, SAVED_MODEL_DIR)
+        model.export(saved_model_dir, verbose=False)
+        if 'tflite' in formats:
+            converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+            with open(os.path.join(export_dir, TFLITE_FILE), 'wb') as f:
+                f.write(converter.convert())
+
+        if scaler is not None:
+            import joblib
+
+            if isinstance(scaler, str):
+                scaler = joblib.load(scaler)
+            joblib.dump(scaler, os.path.join(export_dir, SCALER_FILE))
+        if palette is not None:
+            save_palette_lut(palette, os.path.join(export_dir, PALETTE_LUT_FILE))
+
+        config = {
+            'model_name': model.name,
+            'image_shape': list(image_shape),
+            'target_size': [image_shape[1], image_shape[0]],
+            'channel_order': 'temperature' if palette is not None else 'RGB',
+            # Model dengan layer Rescaling menerima citra 0-255 dan menormalisasinya sendiri;
+            # citra suhu sudah berada di rentang [0, 1]
+            'normalize': palette is None and not has_rescaling(model),
+            'features': list(features),
+            'enhancement': [[technique, dict(params)] for technique, params in (enhancement or [])],
+            'crop': dict(crop) if crop else None,
+            'palette': palette_metadata(palette) if palette is not None else None,
+            'formats': sorted(set(formats) | {'saved_model'}),
+        }
+        with open(os.path.join(export_dir, PREPROCESSING_FILE), 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2)
+        logger.info(f"Model {model.name} diekspor ke {export_dir} ({', '.join(config['formats'])})")
+        return config
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat mengekspor model: {e}")
+        raise
+
+def collect_image_pairs(img_dir):
+    """
+    Mencari pasangan citra kiri/kanan ('<Subject>_..._L.png' dan '<Subject>_..._R.png') di img_dir dan subdirektorinya.
+
+    Returns
+    -------
+    pairs : dict
+        Pemetaan Subject ke (left_path, right_path), terurut sesuai Subject.
+    """
+    sides = {}
+    pattern = re.compile(r'^(?P<prefix>.+)_(?P<side>[LR])$')
+    for root, dirs, files in os.walk(img_dir):
+        dirs.sort()
+        for fname in sorted(files):
+            stem, ext = os.path.splitext(fname)
+            match = pattern.match(stem)
+            if ext.lower() not in IMAGE_EXTENSIONS or match is None:
+                continue
+            subject = match.group('prefix').split('_')[0]
+            sides.setdefault(subject, {})[match.group('side')] = os.path.join(root, fname)
+    return {subject: (paths['L'], paths['R']) for subject, paths in sorted(sides.items())
+            if 'L' in paths and 'R' in paths}
+
+class Predictor:
+    """
+    Mesin inferensi CPU untuk model tiga input hasil export_model.
+
+    Model dimuat sekali dan dipanaskan (warm-up) saat dibuat, lalu dapat dipakai berulang kali
+    untuk banyak permintaan. Preprocessing sama dengan pelatihan: resize (INTER_AREA) ke ukuran
+    target, enhancement pada citra BGR, konversi ke RGB, normalisasi [0, 1], dan scaler tabular.
+    Pemanggilan model dilindungi lock sehingga aman dipakai dari beberapa thread.
+
+    Parameters
+    ----------
+    export_dir : str
+        Direktori hasil export_model.
+    backend : str, optional
+        'saved_model' atau 'tflite'. Default: 'tflite' jika tersedia, selain itu 'saved_model'.
+    batch_size : int, optional
+        Ukuran batch maksimum per pemanggilan model.
+    num_threads : int, optional
+        Jumlah thread inferensi. Default: pengaturan bawaan TensorFlow/TFLite.
+    scaler : sklearn.preprocessing.StandardScaler or str, optional
+        Scaler tabular atau jalur joblib-nya. Default: 'tabular_scaler.joblib' di export_dir jika ada.
+    warmup : bool, optional
+        Menjalankan satu batch dummy saat inisialisasi agar permintaan pertama tidak menanggung biaya tracing/alokasi.
+    tflite_file : str, optional
+        Nama file TFLite di export_dir untuk backend 'tflite' (misalnya, 'model_int8.tflite' hasil quantize_export).
+        Default: 'model.tflite'.
+    """
+
+    def __init__(self, export_dir, backend=None, batch_size=32, num_threads=None, scaler=None, warmup=True,
+                 tflite_file=None):
+        config_path = os.path.join(export_dir, PREPROCESSING_FILE)
+        if not os.path.exists(config_path):
+            raise FileNotFoundError(f"Konfigurasi preprocessing {config_path} tidak ditemukan.")
+        with open(config_path, 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+
+        self.export_dir = export_dir
+        self.features = list(self.config['features'])
+        self.image_shape = tuple(self.config['image_shape'])
+        self.target_size = tuple(self.config['target_size'])
+        self.enhancement = [(technique, params) for technique, params in self.config['enhancement']]
+        self.normalize = self.config.get('normalize', True)
+        self.crop = self.config.get('crop')
+        self.palette = None
+        if self.config.get('palette'):
+            from src.data.palette import PALETTE_LUT_FILE, load_palette_lut
+
+            self.palette = load_palette_lut(os.path.join(export_dir, PALETTE_LUT_FILE))
+        self.batch_size = max(1, int(batch_size))
+        self._lock = threading.Lock()
+        self._scaler_columns = None
+
+        if scaler is None and os.path.exists(os.path.join(export_dir, SCALER_FILE)):
+            scaler = os.path.join(export_dir, SCALER_FILE)
+        if isinstance(scaler, str):
+            import joblib
+
+            scaler = joblib.load(scaler)
+        self.scaler = scaler
+        if scaler is not None and getattr(scaler, 'feature_names_in_', None) is not None:
+            # Scaler data_preprocessing hanya di-fit pada kolom numerik; kolom lain (misalnya Gender) tidak diubah
+            missing = [name for name in scaler.feature_names_in_ if name not in self.features]
+            if missing:
+                raise ValueError(f"Fitur scaler {', '.join(missing)} tidak ada di fitur model.")
+            self._scaler_columns = [self.features.index(name) for name in scaler.feature_names_in_]
+        elif scaler is not None and getattr(scaler, 'n_features_in_', len(self.features)) != len(self.features):
+            raise ValueError(f"Scaler di-fit pada {scaler.n_features_in_} fitur, tetapi model memiliki "
+                             f"{len(self.features)} fitur.")
+
+        self.tflite_file = tflite_file or TFLITE_FILE
+        if backend is None:
+            backend = 'tflite' if os.path.exists(os.path.join(export_dir, self.tflite_file)) else 'saved_model'
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend {backend} tidak dikenal. Pilihan: {', '.join(BACKENDS)}.")
+        self.backend = backend
+        self._load_backend(num_threads)
+        logger.info(f"Model dimuat dari {export_dir} dengan backend {backend}"
+                    + (f" ({self.tflite_file})" if backend == 'tflite' else ''))
+
+        if warmup:
+            self.warmup()
+
+    def _load_backend(self, num_threads):
+        import tensorflow as tf
+
+        if self.backend == 'tflite':
+            try:
+                from ai_edge_litert.interpreter import Interpreter
+            except ImportError:
+                Interpreter = tf.lite.Interpreter
+            interpreter = Interpreter(model_path=os.path.join(self.export_dir, self.tflite_file),
+                                      num_threads=num_threads)
+            runner = interpreter.get_signature_runner('serving_default')
+            output_name = interpreter.get_signature_list()['serving_default']['outputs'][0]
+            self._interpreter = interpreter
+            self._infer = lambda inputs: runner(**inputs)[output_name]
+            return
+
+        if num_threads is not None:
+            try:
+                tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+            except RuntimeError as e:
+                logger.debug(f"Jumlah thread TensorFlow tidak dapat diatur: {e}")
+        loaded = tf.saved_model.load(os.path.join(self.export_dir, SAVED_MODEL_DIR))
+        serving = loaded.signatures['serving_default']
+        output_name = next(iter(serving.structured_outputs))
+        self._saved_model = loaded
+
+        def _infer(inputs):
+            outputs = serving(**{name: tf.constant(value) for name, value in inputs.items()})
+            return outputs[output_name].numpy()
+
+        self._infer = _infer
+
+    def warmup(self):
+        """
+        Menjalankan inferensi pada satu batch nol berukuran batch_size.
+        """
+        start = time.perf_counter()
+        left = np.zeros((self.batch_size,) + self.image_shape, dtype=np.uint8)
+        self.predict_arrays(left, left, np.zeros((self.batch_size, len(self.features)), dtype=np.float32),
+                            scaled=True)
+        logger.info(f"Warm-up selesai dalam {time.perf_counter() - start:.3f} s")
+
+    def preprocess_image(self, image):
+        """
+        Menyiapkan satu citra seperti saat pelatihan.
+
+        Parameters
+        ----------
+        image : str or numpy.ndarray
+            Jalur file citra, atau citra BGR uint8 (konvensi OpenCV).
+
+        Returns
+        -------
+        image : numpy.ndarray
+            Citra RGB uint8 berukuran image_shape, atau citra suhu (H, W, 1) float16 untuk model citra suhu.
+        """
+        import cv2
+
+        metrics = get_metrics()
+        if isinstance(image, str):
+            with metrics.phase('predict', 'decode'):
+                path, image = image, cv2.imread(image, cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError(f"Citra {path} tidak dapat dibaca.")
+        elif image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        with metrics.phase('predict', 'compute'):
+            if self.palette is not None:
+                from src.data.palette import invert_palette
+
+                temperature = invert_palette(image, self.palette)
+                if self.crop:
+                    from src.data.foot_roi import foot_box, crop_to_box
+
+                    temperature = crop_to_box(temperature, foot_box(image, **self.crop))
+                if (temperature.shape[1], temperature.shape[0]) != self.target_size:
+                    temperature = cv2.resize(temperature, self.target_size, interpolation=cv2.INTER_AREA)
+                return temperature[..., None].astype(np.float16)
+            if self.crop:
+                from src.data.foot_roi import foot_box, crop_to_box
+
+                image = crop_to_box(image, foot_box(image, **self.crop))
+            if (image.shape[1], image.shape[0]) != self.target_size:
+                image = cv2.resize(image, self.target_size, interpolation=cv2.INTER_AREA)
+            if self.enhancement:
+                from src.utils.image_enhancement import apply_enhancement_chain
+
+                image = apply_enhancement_chain(image, self.enhancement)
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    def preprocess_tabular(self, records):
+        """
+        Menyusun dan menskalakan fitur tabular sesuai urutan fitur model.
+
+        Parameters
+        ----------
+        records : dict, list of dict, or pandas.DataFrame
+            Nilai fitur per sampel; 'Gender' boleh berupa 'M'/'F'.
+
+        Returns
+        -------
+        tabular : numpy.ndarray
+            Fitur tabular float32 berbentuk (N, F) yang sudah diskalakan.
+        """
+        if isinstance(records, dict):
+            records = [records]
+        if isinstance(records, list):
+            missing = sorted({name for record in records for name in self.features if name not in record})
+            rows = [[record[name] for name in self.features] for record in records]
+        else:
+            missing = [name for name in self.features if name not in records.columns]
+            rows = records[[name for name in self.features if name in records.columns]].values.tolist()
+        if missing:
+            raise ValueError(f"Fitur tabular {', '.join(missing)} tidak ditemukan.")
+
+        tabular = np.array([[GENDER_CODES.get(value, value) if isinstance(value, str) else value for value in row]
+                            for row in rows], dtype=np.float32).reshape(len(rows), len(self.features))
+        return self._scale(tabular)
+
+    def _scale(self, tabular):
+        if self.scaler is None:
+            return tabular
+        if self._scaler_columns is None:
+            return self.scaler.transform(tabular).astype(np.float32)
+        import pandas as pd
+
+        columns = pd.DataFrame(tabular[:, self._scaler_columns], columns=list(self.scaler.feature_names_in_))
+        tabular = tabular.copy()
+        tabular[:, self._scaler_columns] = self.scaler.transform(columns)
+        return tabular
+
+    def _image_input(self, images):
+        """
+        Citra menjadi input float32 model; citra uint8 dibagi 255 kecuali model menormalisasi sendiri (Rescaling)
+        atau citranya adalah citra suhu ternormalisasi.
+        """
+        images = np.asarray(images, dtype=np.float32)
+        if self.normalize:
+            images /= 255.0
+        return images
+
+    def predict_arrays(self, left, right, tabular, scaled=False):
+        """
+        Inferensi batch dari citra yang sudah dipreprocess.
+
+        Parameters
+        ----------
+        left, right : numpy.ndarray
+            Citra berbentuk (N, H, W, C) hasil preprocess_image.
+        tabular : numpy.ndarray
+            Fitur tabular (N, F); diskalakan di sini kecuali scaled=True.
+        scaled : bool, optional
+            True jika tabular sudah melalui preprocess_tabular.
+
+        Returns
+        -------
+        probabilities : numpy.ndarray
+            Probabilitas kelas positif (DM) berbentuk (N,).
+        """
+        tabular = np.asarray(tabular, dtype=np.float32)
+        if not scaled:
+            tabular = self._scale(tabular)
+        n = len(tabular)
+        probabilities = np.empty(n, dtype=np.float32)
+        metrics = get_metrics()
+        for start in range(0, n, self.batch_size):
+            stop = min(start + self.batch_size, n)
+            inputs = {
+                'input_left': self._image_input(left[start:stop]),
+                'input_right': self._image_input(right[start:stop]),
+                'input_tabular': tabular[start:stop],
+            }
+            with self._lock, metrics.phase('predict', 'inference'):
+                probabilities[start:stop] = np.asarray(self._infer(inputs)).reshape(-1)
+        metrics.count('predict', files=n)
+        return probabilities
+
+    def predict(self, samples):
+        """
+        Memprediksi daftar sampel {'left', 'right', 'tabular'} (citra berupa jalur file atau array BGR).
+
+        Returns
+        -------
+        probabilities : numpy.ndarray
+            Probabilitas kelas positif berbentuk (N,).
+        """
+        if isinstance(samples, dict):
+            samples = [samples]
+        left = np.stack([self.preprocess_image(sample['left']) for sample in samples])
+        right = np.stack([self.preprocess_image(sample['right']) for sample in samples])
+        tabular = self.preprocess_tabular([sample['tabular'] for sample in samples])
+        return self.predict_arrays(left, right, tabular, scaled=True)
+
+    def predict_directory(self, img_dir, data_tabular, threshold=0.5, num_workers=None):
+        """
+        Memprediksi semua pasangan citra di direktori yang memiliki baris data tabular (kolom 'Subject').
+
+        Citra didekode paralel per batch sehingga memori tetap terbatas pada satu batch.
+
+        Parameters
+        ----------
+        img_dir : str
+            Direktori berisi pasangan '<Subject>_..._L.png' dan '<Subject>_..._R.png' (boleh di subdirektori).
+        data_tabular : pandas.DataFrame
+            Data tabular dengan kolom 'Subject' dan fitur model.
+        threshold : float, optional
+            Ambang probabilitas untuk prediksi kelas positif.
+        num_workers : int, optional
+            Jumlah thread dekode citra. Default: jumlah core CPU.
+
+        Returns
+        -------
+        predictions : pandas.DataFrame
+            Kolom 'Subject', 'probability', dan 'prediction'.
+        """
+        import pandas as pd
+
+        try:
+            if not os.path.exists(img_dir):
+                raise FileNotFoundError(f"Direktori {img_dir} tidak ditemukan.")
+            pairs = collect_image_pairs(img_dir)
+            rows = {str(subject): row for subject, row in zip(data_tabular['Subject'], data_tabular.to_dict('records'))}
+            subjects = [subject for subject in pairs if subject in rows]
+            for subject in pairs:
+                if subject not in rows:
+                    logger.warning(f"Data tabular untuk subjek {subject} tidak ditemukan, melewatkan subjek ini.")
+            if not subjects:
+                raise FileNotFoundError(f"Tidak ada pasangan citra dengan data tabular di {img_dir}.")
+
+            metrics = get_metrics()
+            probabilities = []
+            with metrics.stage('predict'), ThreadPoolExecutor(max_workers=num_workers) as executor:
+                for start in range(0, len(subjects), self.batch_size):
+                    batch = subjects[start:start + self.batch_size]
+                    left = np.stack(list(executor.map(self.preprocess_image, [pairs[s][0] for s in batch])))
+                    right = np.stack(list(executor.map(self.preprocess_image, [pairs[s][1] for s in batch])))
+                    tabular = self.preprocess_tabular([rows[s] for s in batch])
+                    probabilities.append(self.predict_arrays(left, right, tabular, scaled=True))
+            probabilities = np.concatenate(probabilities)
+
+            logger.info(f"Memprediksi {len(subjects)} subjek dari {img_dir}")
+            logger.info(metrics.summary('predict'))
+            return pd.DataFrame({
+                'Subject': subjects,
+                'probability': probabilities,
+                'prediction': (probabilities > threshold).astype(int),
+            })
+
+        except Exception as e:
+            logger.error(f"Terjadi kesalahan saat memprediksi direktori {img_dir}: {e}")
+            raise
+
+    def predict_stream(self, input_stream, output_stream, threshold=0.5):
+        """
+        Mode stream: membaca satu permintaan JSON per baris dan menulis satu hasil JSON per baris.
+
+        Setiap baris berisi {"id", "left", "right", "tabular"}; hasilnya {"id", "probability", "prediction"}
+        atau {"id", "error"} jika permintaan gagal. Model tetap dimuat selama stream terbuka.
+
+        Returns
+        -------
+        n_requests : int
+            Jumlah permintaan yang diproses.
+        """
+        n_requests = 0
+        for line in input_stream:
+            line = line.strip()
+            if not line:
+                continue
+            n_requests += 1
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get('id')
+                probability = float(self.predict(request)[0])
+                response = {'id': request_id, 'probability': probability, 'prediction': int(probability > threshold)}
+            except Exception as e:
+                logger.error(f"Permintaan {request_id} gagal: {e}")
+                response = {'id': request_id, 'error': str(e)}
+            output_stream.write(json.dumps(response) + '\n')
+            output_stream.flush()
+        return n_requests
+
+if __name__ == "__main__":
+    import argparse
+    from src.utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Ekspor model dan prediksi termogram kaki untuk data baru.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help="Mengekspor model .keras beserta preprocessing-nya.")
+    export_parser.add_argument('--model_path', required=True, help="File model .keras hasil pelatihan.")
+    export_parser.add_argument('--store_dir', required=True,
+                               help="Dataset store yang dipakai saat pelatihan (sumber fitur dan enhancement).")
+    export_parser.add_argument('--scaler_path', default=None,
+                               help="Scaler tabular joblib. Default: scaler fold di samping --model_path (train_fold).")
+    export_parser.add_argument('--export_dir', default='./models/export/')
+    export_parser.add_argument('--formats', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+
+    for name, help_text in [('directory', "Memprediksi semua pasangan citra di direktori."),
+                            ('stream', "Membaca permintaan JSON per baris dari stdin.")]:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--export_dir', default='./models/export/')
+        sub.add_argument('--backend', default=None, choices=BACKENDS)
+        sub.add_argument('--tflite_file', default=None,
+                         help="File TFLite di export_dir, misalnya 'model_int8.tflite' hasil src/quantize.py.")
+        sub.add_argument('--batch_size', type=int, default=32)
+        sub.add_argument('--num_threads', type=int, default=None)
+        sub.add_argument('--threshold', type=float, default=0.5)
+        if name == 'directory':
+            sub.add_argument('--input_path', required=True, help="Direktori citra termogram.")
+            sub.add_argument('--tabular_path', required=True, help="File CSV data tabular (';' sebagai pemisah).")
+            sub.add_argument('--output_path', default='./results/predictions.csv')
+    parser.add_argument('--verbose', action='store_true', help="Menulis log level DEBUG.")
+    args = parser.parse_args()
+    configure_logging(verbose=args.verbose)
+
+    if args.command == 'export':
+        from src.data.palette import PALETTE_LUT_FILE
+        from src.training import scaler_path_for
+
+        scaler_path = args.scaler_path or scaler_path_for(args.model_path)
+        if not os.path.exists(scaler_path):
+            raise FileNotFoundError(f"Scaler tabular {scaler_path} tidak ditemukan; model harus diekspor dengan "
+                                    f"scaler yang sama dengan saat pelatihan.")
+        with open(os.path.join(args.store_dir, 'index.json'), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        export_model(args.model_path, args.export_dir, index['features'], enhancement=enhancement_from_index(index),
+                     scaler=scaler_path, formats=args.formats, crop=index.get('crop'),
+                     palette_lut=os.path.join(args.store_dir, PALETTE_LUT_FILE) if index.get('palette') else None)
+    else:
+        predictor = Predictor(args.export_dir, backend=args.backend, batch_size=args.batch_size,
+                              num_threads=args.num_threads, tflite_file=args.tflite_file)
+        if args.command == 'directory':
+            from src.data.data_preprocessing import load_tabular_data
+
+            predictions = predictor.predict_directory(args.input_path, load_tabular_data(args.tabular_path),
+                                                      threshold=args.threshold)
+            os.makedirs(os.path.dirname(os.path.abspath(args.output_path)), exist_ok=True)
+            predictions.to_csv(args.output_path, index=False)
+            logger.info(f"Hasil prediksi disimpan ke {args.output_path}")
+        else:
+            predictor.predict_stream(sys.stdin, sys.stdout, threshold=args.threshold)
+        dump_metrics()
\ No newline at end of file
@@ -0,0 +1,383 @@
+# src/quantize.py
+
+import os
+import sys
+import csv
+import json
+import time
+import logging
+import numpy as np
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.predict import PREPROCESSING_FILE, SAVED_MODEL_DIR, TFLITE_FILE, Predictor
+from src.utils.metrics import METRIC_NAMES, classification_metrics
+
+logger = logging.getLogger('src.quantize')
+
+# Mode kuantisasi pasca-pelatihan -> nama file TFLite di direktori ekspor
+QUANTIZATION_FILES = {
+    'dynamic': 'model_dynamic.tflite',
+    'float16': 'model_float16.tflite',
+    'int8': 'model_int8.tflite',
+}
+REPORT_FILE = 'quantization_report.json'
+REPORT_CSV = 'quantization_report.csv'
+
+def calibration_indices(n_samples, n_calibration=100, random_state=42):
+    """
+    Memilih indeks sampel kalibrasi secara acak (terurut, tanpa pengulangan).
+    """
+    rng = np.random.default_rng(random_state)
+    n_calibration = min(int(n_calibration), n_samples)
+    return np.sort(rng.choice(n_samples, size=n_calibration, replace=False))
+
+def load_indices(spec):
+    """
+    Membaca indeks sampel dari '<file>.npz:<kunci>' (misalnya 'folds.npz:train_0' atau 'folds.npz:test_0' hasil
+    compute_fold_indices), '<file>.npy', atau daftar bilangan bulat yang dipisahkan koma.
+    """
+    path, separator, key = spec.rpartition(':')
+    if separator and path.endswith('.npz'):
+        with np.load(path) as data:
+            return np.asarray(data[key], dtype=np.int64)
+    if spec.endswith('.npy'):
+        return np.asarray(np.load(spec), dtype=np.int64)
+    return np.asarray([int(value) for value in spec.split(',') if value.strip()], dtype=np.int64)
+
+def split_calibration_eval(n_samples, calibration_index=None, eval_index=None, same_store=True,
+                           n_calibration=100, random_state=42):
+    """
+    Menentukan indeks sampel kalibrasi int8 dan evaluasi sehingga kedua himpunan tidak beririsan.
+
+    Jika kalibrasi dan evaluasi memakai dataset store yang sama, eval_index wajib diberikan (misalnya fold uji
+    dari compute_fold_indices) dan sampel kalibrasi default dipilih acak dari sampel di luar eval_index.
+
+    Returns
+    -------
+    calibration_index, eval_index : numpy.ndarray or None
+        None berarti pilihan default quantize_export (sampel acak) atau compare_models (semua sampel).
+
+    Raises
+    ------
+    ValueError
+        Jika store sama tetapi eval_index tidak diberikan, tidak ada sampel tersisa untuk kalibrasi,
+        atau kedua himpunan indeks beririsan.
+    """
+    if calibration_index is not None:
+        calibration_index = np.asarray(calibration_index, dtype=np.int64)
+    if eval_index is not None:
+        eval_index = np.asarray(eval_index, dtype=np.int64)
+    if not same_store:
+        return calibration_index, eval_index
+    if eval_index is None:
+        raise ValueError("Kalibrasi dan evaluasi memakai store yang sama; indeks evaluasi (misalnya fold uji) "
+                         "harus diberikan agar sampel kalibrasi tidak ikut dievaluasi.")
+    if calibration_index is None:
+        remaining = np.setdiff1d(np.arange(n_samples), eval_index)
+        if len(remaining) == 0:
+            raise ValueError("Tidak ada sampel di luar indeks evaluasi untuk kalibrasi.")
+        calibration_index = remaining[calibration_indices(len(remaining), n_calibration, random_state)]
+    overlap = np.intersect1d(calibration_index, eval_index)
+    if len(overlap):
+        raise ValueError(f"{len(overlap)} sampel kalibrasi juga termasuk sampel evaluasi.")
+    return calibration_index, eval_index
+
+def _representative_dataset(predictor, dataset, indices):
+    """
+    Generator input kalibrasi per sampel dengan preprocessing yang sama seperti Predictor.predict_arrays.
+    """
+    tabular = predictor._scale(np.asarray(dataset.tabular[indices], dtype=np.float32))
+
+    def _generator():
+        for position, index in enumerate(indices):
+            yield {
+                'input_left': predictor._image_input(dataset.left[index:index + 1]),
+                'input_right': predictor._image_input(dataset.right[index:index + 1]),
+                'input_tabular': tabular[position:position + 1],
+            }
+
+    return _generator
+
+def quantize_export(export_dir, modes=tuple(QUANTIZATION_FILES), store_dir=None, n_calibration=100,
+                    indices=None, random_state=42):
+    """
+    Membuat artefak TFLite terkuantisasi dari SavedModel hasil export_model.
+
+    Mode yang tersedia:
+    - 'dynamic': bobot int8, aktivasi float (dynamic-range); tidak membutuhkan data kalibrasi.
+    - 'float16': bobot float16.
+    - 'int8': bobot dan aktivasi int8 dengan rentang aktivasi dikalibrasi dari sampel dataset store;
+      input dan output tetap float32 sehingga Predictor dapat memakainya tanpa perubahan.
+
+    Parameters
+    ----------
+    export_dir : str
+        Direktori hasil export_model; artefak ditulis di direktori yang sama.
+    modes : sequence of str, optional
+        Mode kuantisasi yang dibuat.
+    store_dir : str, optional
+        Dataset store untuk kalibrasi mode 'int8' (sebaiknya data latih, bukan data uji).
+    n_calibration : int, optional
+        Jumlah sampel kalibrasi yang dipilih acak jika indices tidak diberikan.
+    indices : array-like, optional
+        Indeks sampel kalibrasi di dataset store.
+    random_state : int, optional
+        Seed pemilihan sampel kalibrasi.
+
+    Returns
+    -------
+    artifacts : dict
+        Pemetaan mode ke jalur file TFLite.
+
+    Raises
+    ------
+    ValueError
+        Jika mode tidak dikenal, atau mode 'int8' diminta tanpa store_dir.
+    FileNotFoundError
+        Jika SavedModel tidak ditemukan di export_dir.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    import tensorflow as tf
+
+    try:
+        unknown = [mode for mode in modes if mode not in QUANTIZATION_FILES]
+        if unknown:
+            raise ValueError(f"Mode kuantisasi {', '.join(unknown)} tidak dikenal. "
+                             f"Pilihan: {', '.join(QUANTIZATION_FILES)}.")
+        if 'int8' in modes and store_dir is None:
+            raise ValueError("Mode 'int8' membutuhkan store_dir untuk kalibrasi.")
+        saved_model_dir = os.path.join(export_dir, SAVED_MODEL_DIR)
+        if not os.path.isdir(saved_model_dir):
+            raise FileNotFoundError(f"SavedModel {saved_model_dir} tidak ditemukan.")
+
+        with open(os.path.join(export_dir, PREPROCESSING_FILE), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        quantized = dict(config.get('quantized', {}))
+
+        artifacts = {}
+        for mode in modes:
+            start = time.perf_counter()
+            converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            entry = {'file': QUANTIZATION_FILES[mode]}
+            if mode == 'float16':
+                converter.target_spec.supported_types = [tf.float16]
+            elif mode == 'int8':
+                from src.data.dataset_store import load_dataset_store
+
+                dataset = load_dataset_store(store_dir)
+                if list(dataset.features) != list(config['features']):
+                    raise ValueError(f"Fitur dataset store {store_dir} tidak sama dengan fitur model.")
+                if indices is None:
+                    indices = calibration_indices(len(dataset.labels), n_calibration, random_state)
+                indices = np.asarray(indices, dtype=np.int64)
+                predictor = Predictor(export_dir, backend='saved_model', warmup=False)
+                converter.representative_dataset = _representative_dataset(predictor, dataset, indices)
+                entry.update({'calibration_store': os.path.abspath(store_dir),
+                              'calibration_samples': int(len(indices)),
+                              'calibration_indices': indices.tolist()})
+
+            path = os.path.join(export_dir, QUANTIZATION_FILES[mode])
+            with open(path, 'wb') as f:
+                f.write(converter.convert())
+            artifacts[mode] = path
+            quantized[mode] = entry
+            logger.info(f"Artefak {mode} ditulis ke {path} ({os.path.getsize(path) / 1024:.1f} KiB) "
+                        f"dalam {time.perf_counter() - start:.1f} s")
+
+        config['quantized'] = quantized
+        with open(os.path.join(export_dir, PREPROCESSING_FILE), 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2)
+        return artifacts
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat kuantisasi model di {export_dir}: {e}")
+        raise
+
+def _artifact_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, fname)) for root, _, files in os.walk(path) for fname in files)
+
+def _measure_latency(predictor, left, right, tabular, n_runs):
+    """
+    Latensi satu sampel (ms) untuk n_runs pemanggilan berurutan, termasuk normalisasi dan penskalaan tabular.
+    """
+    latencies = []
+    for run in range(n_runs):
+        index = run % len(tabular)
+        start = time.perf_counter()
+        predictor.predict_arrays(left[index:index + 1], right[index:index + 1], tabular[index:index + 1])
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.asarray(latencies)
+
+def compare_models(export_dir, store_dir, indices=None, modes=None, batch_size=32, num_threads=None,
+                   n_latency=50, threshold=0.5, output_dir=None):
+    """
+    Membandingkan akurasi, ukuran, dan latensi artefak terkuantisasi terhadap model float.
+
+    Baseline adalah SavedModel float32; setiap artefak TFLite (float32 dan terkuantisasi) dievaluasi pada sampel
+    dataset store yang sama melalui Predictor, sehingga preprocessing identik dengan inferensi produksi.
+
+    Parameters
+    ----------
+    export_dir : str
+        Direktori hasil export_model dan quantize_export.
+    store_dir : str
+        Dataset store evaluasi (sebaiknya data uji yang tidak dipakai untuk kalibrasi).
+    indices : array-like, optional
+        Indeks sampel evaluasi. Default: semua sampel. Jika store_dir juga dipakai untuk kalibrasi int8,
+        indeks ini tidak boleh beririsan dengan sampel kalibrasi.
+    modes : sequence of str, optional
+        Mode kuantisasi yang dibandingkan. Default: semua artefak yang ada di export_dir.
+    batch_size : int, optional
+        Ukuran batch untuk evaluasi akurasi dan throughput.
+    num_threads : int, optional
+        Jumlah thread inferensi.
+    n_latency : int, optional
+        Jumlah pemanggilan satu sampel untuk mengukur latensi.
+    threshold : float, optional
+        Ambang probabilitas untuk metrik klasifikasi dan kesepakatan prediksi.
+    output_dir : str, optional
+        Direktori laporan ('quantization_report.json' dan '.csv'). Default: export_dir.
+
+    Returns
+    -------
+    report : list of dict
+        Satu baris per artefak: 'artifact', 'backend', 'file', 'size_bytes', 'size_ratio', metrik klasifikasi,
+        'max_abs_diff' dan 'agreement' terhadap baseline, 'latency_p50_ms', 'latency_p95_ms',
+        dan 'throughput' (sampel/detik).
+
+    Raises
+    ------
+    FileNotFoundError
+        Jika tidak ada artefak terkuantisasi yang dapat dibandingkan.
+    ValueError
+        Jika sampel evaluasi beririsan dengan sampel kalibrasi int8 dari store yang sama.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    from src.data.dataset_store import load_dataset_store
+
+    try:
+        if modes is None:
+            modes = [mode for mode, fname in QUANTIZATION_FILES.items()
+                     if os.path.exists(os.path.join(export_dir, fname))]
+        if not modes:
+            raise FileNotFoundError(f"Tidak ada artefak terkuantisasi di {export_dir}; jalankan quantize_export.")
+
+        dataset = load_dataset_store(store_dir)
+        if indices is None:
+            indices = np.arange(len(dataset.labels))
+        indices = np.asarray(indices, dtype=np.int64)
+        with open(os.path.join(export_dir, PREPROCESSING_FILE), 'r', encoding='utf-8') as f:
+            calibration = json.load(f).get('quantized', {}).get('int8', {})
+        if 'int8' in modes and calibration.get('calibration_store') == os.path.abspath(store_dir):
+            # Sampel kalibrasi int8 tidak boleh ikut dievaluasi
+            split_calibration_eval(len(dataset.labels), calibration.get('calibration_indices'), indices)
+        left = np.asarray(dataset.left[indices])
+        right = np.asarray(dataset.right[indices])
+        tabular = np.asarray(dataset.tabular[indices], dtype=np.float32)
+        labels = np.asarray(dataset.labels[indices])
+
+        artifacts = [('float32', 'saved_model', None)]
+        if os.path.exists(os.path.join(export_dir, TFLITE_FILE)):
+            artifacts.append(('float32_tflite', 'tflite', TFLITE_FILE))
+        artifacts.extend((mode, 'tflite', QUANTIZATION_FILES[mode]) for mode in modes)
+
+        report = []
+        reference = None
+        for name, backend, fname in artifacts:
+            predictor = Predictor(export_dir, backend=backend, batch_size=batch_size, num_threads=num_threads,
+                                  tflite_file=fname)
+            start = time.perf_counter()
+            probabilities = predictor.predict_arrays(left, right, tabular)
+            elapsed = time.perf_counter() - start
+            latencies = _measure_latency(predictor, left, right, tabular, n_latency)
+            if reference is None:
+                reference = probabilities
+
+            path = os.path.join(export_dir, fname or SAVED_MODEL_DIR)
+            row = {'artifact': name, 'backend': backend, 'file': fname or SAVED_MODEL_DIR,
+                   'size_bytes': _artifact_size(path)}
+            row.update(classification_metrics(labels, probabilities, threshold))
+            row.update({
+                'max_abs_diff': float(np.max(np.abs(probabilities - reference))),
+                'agreement': float(np.mean((probabilities > threshold) == (reference > threshold))),
+                'latency_p50_ms': float(np.percentile(latencies, 50)),
+                'latency_p95_ms': float(np.percentile(latencies, 95)),
+                'throughput': float(len(indices) / elapsed) if elapsed > 0 else float('nan'),
+            })
+            report.append(row)
+            logger.info(f"{name}: {row['size_bytes'] / 1024:.1f} KiB, auc={row['auc']:.4f}, "
+                        f"agreement={row['agreement']:.3f}, p50={row['latency_p50_ms']:.2f} ms")
+
+        # Rasio ukuran terhadap TFLite float32 jika ada (SavedModel menyimpan metadata tambahan)
+        baseline_size = report[1]['size_bytes'] if len(report) > 1 and report[1]['artifact'] == 'float32_tflite' \
+            else report[0]['size_bytes']
+        for row in report:
+            row['size_ratio'] = row['size_bytes'] / baseline_size
+
+        output_dir = output_dir or export_dir
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, REPORT_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'store_dir': os.path.abspath(store_dir), 'n_samples': int(len(indices)),
+                       'threshold': threshold, 'results': report}, f, indent=2)
+        columns = ['artifact', 'backend', 'file', 'size_bytes', 'size_ratio'] + METRIC_NAMES + \
+            ['max_abs_diff', 'agreement', 'latency_p50_ms', 'latency_p95_ms', 'throughput']
+        with open(os.path.join(output_dir, REPORT_CSV), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(report)
+        logger.info(f"Laporan kuantisasi disimpan ke {output_dir}")
+        return report
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat membandingkan artefak di {export_dir}: {e}")
+        raise
+
+if __name__ == "__main__":
+    import argparse
+    from src.utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Kuantisasi pasca-pelatihan (int8/float16) dan laporan perbandingan.")
+    parser.add_argument('--export_dir', default='./models/export/', help="Direktori hasil 'src/predict.py export'.")
+    parser.add_argument('--modes', nargs='+', default=list(QUANTIZATION_FILES), choices=list(QUANTIZATION_FILES))
+    parser.add_argument('--calibration_store', default=None,
+                        help="Dataset store untuk kalibrasi int8 (data latih). Default: sama dengan --eval_store.")
+    parser.add_argument('--eval_store', default=None, help="Dataset store untuk laporan perbandingan (data uji).")
+    parser.add_argument('--calibration_indices', default=None,
+                        help="Indeks sampel kalibrasi, misalnya 'results/cross_validation/folds.npz:train_0'.")
+    parser.add_argument('--eval_indices', default=None,
+                        help="Indeks sampel evaluasi, misalnya 'results/cross_validation/folds.npz:test_0'. "
+                             "Wajib jika kalibrasi dan evaluasi memakai store yang sama.")
+    parser.add_argument('--n_calibration', type=int, default=100)
+    parser.add_argument('--batch_size', type=int, default=32)
+    parser.add_argument('--num_threads', type=int, default=None)
+    parser.add_argument('--n_latency', type=int, default=50)
+    parser.add_argument('--skip_report', action='store_true', help="Hanya membuat artefak tanpa laporan.")
+    parser.add_argument('--verbose', action='store_true', help="Menulis log level DEBUG.")
+    args = parser.parse_args()
+    configure_logging(verbose=args.verbose)
+
+    if args.eval_store is None and not args.skip_report:
+        parser.error("--eval_store dibutuhkan untuk laporan perbandingan (atau gunakan --skip_report).")
+
+    calibration_store = args.calibration_store or args.eval_store
+    calibration_index = load_indices(args.calibration_indices) if args.calibration_indices else None
+    eval_index = load_indices(args.eval_indices) if args.eval_indices else None
+    if 'int8' in args.modes and not args.skip_report:
+        from src.data.dataset_store import load_dataset_store
+
+        same_store = os.path.realpath(calibration_store) == os.path.realpath(args.eval_store)
+        calibration_index, eval_index = split_calibration_eval(
+            len(load_dataset_store(args.eval_store).labels), calibration_index, eval_index, same_store=same_store,
+            n_calibration=args.n_calibration)
+    quantize_export(args.export_dir, modes=args.modes, store_dir=calibration_store, n_calibration=args.n_calibration,
+                    indices=calibration_index)
+    if not args.skip_report:
+        compare_models(args.export_dir, args.eval_store, indices=eval_index, modes=args.modes,
+                       batch_size=args.batch_size, num_threads=args.num_threads, n_latency=args.n_latency)
\ No newline at end of file
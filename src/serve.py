@@ -0,0 +1,451 @@
+# src/serve.py
+
+import os
+import sys
+import json
+import time
+import queue
+import base64
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.predict import BACKENDS, Predictor
+from src.utils.instrumentation import METRIC_PREFIX, get_metrics
+
+logger = logging.getLogger('src.serve')
+
+PERCENTILES = (50, 90, 95, 99)
+# Batas ukuran body permintaan (dua citra termogram dan fitur tabular)
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+class QueueFullError(RuntimeError):
+    """
+    Antrean micro-batch penuh; klien sebaiknya mencoba lagi nanti (HTTP 503).
+    """
+
+class LatencyTracker:
+    """
+    Menyimpan latensi permintaan terakhir (ms) dalam jendela geser untuk menghitung persentil (thread-safe).
+    """
+
+    def __init__(self, window=2048):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, latency_ms):
+        with self._lock:
+            self._latencies.append(latency_ms)
+            self.count += 1
+            self.total += latency_ms
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """
+        Persentil latensi di jendela saat ini, misalnya {'p50': ..., 'p95': ...}; None jika belum ada permintaan.
+        """
+        with self._lock:
+            latencies = np.asarray(self._latencies, dtype=np.float64)
+        if not len(latencies):
+            return {f'p{p}': None for p in percentiles}
+        return {f'p{p}': float(value) for p, value in zip(percentiles, np.percentile(latencies, percentiles))}
+
+class MicroBatcher:
+    """
+    Menggabungkan permintaan konkuren menjadi micro-batch untuk satu pemanggilan Predictor.predict_arrays.
+
+    Satu thread worker mengambil permintaan pertama dari antrean, lalu menunggu permintaan lain hingga batch penuh
+    (max_batch_size) atau tenggat max_wait_ms sejak permintaan pertama tercapai, mana yang lebih dulu.
+    Dekode dan preprocessing citra tetap berjalan di thread permintaan sehingga worker hanya menjalankan inferensi.
+
+    Parameters
+    ----------
+    predictor : Predictor
+        Model yang sudah dimuat.
+    max_batch_size : int, optional
+        Ukuran micro-batch maksimum. Default: predictor.batch_size.
+    max_wait_ms : float, optional
+        Waktu tunggu maksimum permintaan pertama sebelum batch dijalankan.
+    max_queue : int, optional
+        Jumlah maksimum permintaan yang menunggu; permintaan berikutnya ditolak dengan QueueFullError.
+    """
+
+    def __init__(self, predictor, max_batch_size=None, max_wait_ms=10.0, max_queue=256):
+        self.predictor = predictor
+        self.max_batch_size = max(1, int(max_batch_size or predictor.batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self.stats = {'batches': 0, 'samples': 0, 'max_batch': 0, 'errors': 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def submit(self, left, right, tabular):
+        """
+        Menambahkan satu sampel yang sudah dipreprocess (citra RGB uint8 dan fitur tabular terskala) ke antrean.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Menghasilkan probabilitas kelas positif (float).
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher sudah ditutup.")
+        future = Future()
+        try:
+            self._queue.put_nowait((left, right, tabular, future))
+        except queue.Full:
+            raise QueueFullError(f"Antrean inferensi penuh ({self._queue.maxsize} permintaan).")
+        return future
+
+    def _collect(self):
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Tanda berhenti dikembalikan agar loop worker berakhir setelah batch ini
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        metrics = get_metrics()
+        while True:
+            batch = self._collect()
+            if batch is None:
+                break
+            try:
+                with metrics.stage('serve'):
+                    left = np.stack([item[0] for item in batch])
+                    right = np.stack([item[1] for item in batch])
+                    tabular = np.concatenate([item[2] for item in batch])
+                    probabilities = self.predictor.predict_arrays(left, right, tabular, scaled=True)
+                metrics.count('serve', files=len(batch))
+                for item, probability in zip(batch, probabilities):
+                    item[3].set_result(float(probability))
+            except Exception as e:
+                logger.error(f"Inferensi micro-batch ({len(batch)} sampel) gagal: {e}")
+                with self._stats_lock:
+                    self.stats['errors'] += 1
+                for item in batch:
+                    item[3].set_exception(e)
+                continue
+            with self._stats_lock:
+                self.stats['batches'] += 1
+                self.stats['samples'] += len(batch)
+                self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+            logger.debug(f"Micro-batch {len(batch)} sampel selesai")
+
+    def snapshot(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['mean_batch'] = stats['samples'] / stats['batches'] if stats['batches'] else 0.0
+        stats['queue_depth'] = self.queue_depth
+        return stats
+
+    def close(self, timeout=None):
+        """
+        Menghentikan worker setelah permintaan yang sudah diantrekan selesai.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+def _decode_image(data):
+    """
+    Mendekode byte citra (PNG/JPEG) menjadi array BGR seperti cv2.imread.
+    """
+    import cv2
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Citra tidak dapat didekode.")
+    return image
+
+def parse_predict_request(content_type, body):
+    """
+    Mengurai body permintaan /predict menjadi (left_bytes, right_bytes, tabular).
+
+    Dua format diterima:
+    - 'multipart/form-data': file 'left' dan 'right', dan setiap field lain sebagai fitur tabular.
+    - 'application/json': {"left": <base64>, "right": <base64>, "tabular": {...}}.
+
+    Raises
+    ------
+    ValueError
+        Jika format tidak didukung atau citra/fitur tidak lengkap.
+    """
+    content_type = content_type or ''
+    if content_type.startswith('multipart/form-data'):
+        header = f"Content-Type: {content_type}\r\nMIME-Version: 1.0\r\n\r\n".encode('latin-1')
+        message = BytesParser().parsebytes(header + body)
+        if not message.is_multipart():
+            raise ValueError("Body multipart tidak valid.")
+        images, tabular = {}, {}
+        for part in message.get_payload():
+            name = part.get_param('name', header='content-disposition')
+            if name is None:
+                continue
+            payload = part.get_payload(decode=True)
+            if name in ('left', 'right'):
+                images[name] = payload
+            else:
+                tabular[name] = _parse_field(payload.decode('utf-8'))
+    elif content_type.startswith('application/json'):
+        try:
+            request = json.loads(body)
+            if not isinstance(request, dict):
+                raise ValueError("body harus berupa objek JSON")
+            images = {name: base64.b64decode(request[name]) for name in ('left', 'right') if name in request}
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Body JSON tidak valid: {e}")
+        tabular = request.get('tabular', {})
+        if not isinstance(tabular, dict):
+            raise ValueError("Field 'tabular' harus berupa objek JSON.")
+    else:
+        raise ValueError(f"Content-Type {content_type or '(kosong)'} tidak didukung; "
+                         "gunakan multipart/form-data atau application/json.")
+
+    missing = [name for name in ('left', 'right') if not images.get(name)]
+    if missing:
+        raise ValueError(f"Citra {', '.join(missing)} tidak ditemukan di permintaan.")
+    return images['left'], images['right'], tabular
+
+def _parse_field(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value.strip()
+
+class InferenceServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer yang menyimpan Predictor, MicroBatcher, dan LatencyTracker untuk handler.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, predictor, max_batch_size=None, max_wait_ms=10.0, max_queue=256, threshold=0.5):
+        super().__init__(address, InferenceHandler)
+        self.predictor = predictor
+        self.batcher = MicroBatcher(predictor, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+                                    max_queue=max_queue)
+        self.latency = LatencyTracker()
+        self.threshold = threshold
+        self.started = time.time()
+        self._counter_lock = threading.Lock()
+        self.counters = {'requests': 0, 'errors': 0, 'rejected': 0}
+
+    def increment(self, name):
+        with self._counter_lock:
+            self.counters[name] += 1
+
+    def predict(self, left_bytes, right_bytes, tabular):
+        """
+        Preprocessing di thread pemanggil lalu inferensi melalui micro-batch; mengembalikan probabilitas.
+        """
+        predictor = self.predictor
+        left = predictor.preprocess_image(_decode_image(left_bytes))
+        right = predictor.preprocess_image(_decode_image(right_bytes))
+        tabular = predictor.preprocess_tabular(tabular)
+        return self.batcher.submit(left, right, tabular).result()
+
+    def server_close(self):
+        self.batcher.close()
+        super().server_close()
+
+    def latency_report(self):
+        with self._counter_lock:
+            counters = dict(self.counters)
+        report = {'latency_ms': self.latency.percentiles(), 'batching': self.batcher.snapshot()}
+        report.update(counters)
+        return report
+
+    def prometheus(self):
+        """
+        Metrik server dalam format teks Prometheus, ditambah metrik tahap global (predict/serve).
+        """
+        report = self.latency_report()
+        prefix = f'{METRIC_PREFIX}_server'
+        lines = []
+        for name, help_text in [('requests', 'Jumlah permintaan /predict.'),
+                                ('errors', 'Jumlah permintaan /predict yang gagal.'),
+                                ('rejected', 'Jumlah permintaan yang ditolak karena antrean penuh.')]:
+            lines.append(f"# HELP {prefix}_{name}_total {help_text}")
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {report[name]}")
+        batching = report['batching']
+        lines.append(f"# HELP {prefix}_batches_total Jumlah micro-batch yang dijalankan.")
+        lines.append(f"# TYPE {prefix}_batches_total counter")
+        lines.append(f"{prefix}_batches_total {batching['batches']}")
+        lines.append(f"# HELP {prefix}_queue_depth Jumlah permintaan yang menunggu di antrean.")
+        lines.append(f"# TYPE {prefix}_queue_depth gauge")
+        lines.append(f"{prefix}_queue_depth {batching['queue_depth']}")
+        lines.append(f"# HELP {prefix}_latency_ms Latensi permintaan /predict dalam milidetik.")
+        lines.append(f"# TYPE {prefix}_latency_ms summary")
+        for name, value in report['latency_ms'].items():
+            if value is not None:
+                lines.append(f'{prefix}_latency_ms{{quantile="{int(name[1:]) / 100}"}} {value}')
+        lines.append(f"{prefix}_latency_ms_sum {self.latency.total}")
+        lines.append(f"{prefix}_latency_ms_count {self.latency.count}")
+        return '\n'.join(lines) + '\n' + get_metrics().to_prometheus()
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    """
+    Endpoint: GET /health, GET /metrics (Prometheus), GET /latency (JSON), dan POST /predict.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _send(self, status, body, content_type='application/json'):
+        if not isinstance(body, bytes):
+            body = (json.dumps(body) if content_type == 'application/json' else body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        if self.path == '/health':
+            self._send(200, {'status': 'ok', 'model_name': server.predictor.config.get('model_name'),
+                             'backend': server.predictor.backend, 'queue_depth': server.batcher.queue_depth,
+                             'uptime': time.time() - server.started})
+        elif self.path == '/metrics':
+            self._send(200, server.prometheus(), content_type='text/plain; version=0.0.4')
+        elif self.path == '/latency':
+            self._send(200, server.latency_report())
+        else:
+            self._send(404, {'error': f"Endpoint {self.path} tidak ditemukan."})
+
+    def do_POST(self):
+        server = self.server
+        if self.path != '/predict':
+            self._send(404, {'error': f"Endpoint {self.path} tidak ditemukan."})
+            return
+        start = time.perf_counter()
+        server.increment('requests')
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length <= 0 or length > MAX_BODY_BYTES:
+                raise ValueError(f"Content-Length harus antara 1 dan {MAX_BODY_BYTES} byte.")
+            left, right, tabular = parse_predict_request(self.headers.get('Content-Type'), self.rfile.read(length))
+            probability = server.predict(left, right, tabular)
+        except QueueFullError as e:
+            server.increment('rejected')
+            logger.warning(str(e))
+            self._send(503, {'error': str(e)})
+            return
+        except ValueError as e:
+            server.increment('errors')
+            logger.warning(f"Permintaan tidak valid: {e}")
+            self._send(400, {'error': str(e)})
+            return
+        except Exception as e:
+            server.increment('errors')
+            logger.error(f"Permintaan /predict gagal: {e}")
+            self._send(500, {'error': str(e)})
+            return
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        server.latency.record(latency_ms)
+        self._send(200, {'probability': probability, 'prediction': int(probability > server.threshold),
+                         'latency_ms': latency_ms})
+
+def create_server(export_dir, host='127.0.0.1', port=8000, backend=None, tflite_file=None, batch_size=32,
+                  num_threads=None, max_wait_ms=10.0, max_queue=256, threshold=0.5):
+    """
+    Memuat model hasil export_model dan membuat server inferensi lokal (belum berjalan; panggil serve_forever).
+
+    Server tidak mengakses jaringan luar: model, scaler, dan konfigurasi preprocessing dibaca dari export_dir,
+    dan secara default hanya mendengarkan di 127.0.0.1.
+
+    Parameters
+    ----------
+    export_dir : str
+        Direktori hasil export_model (atau quantize_export).
+    host, port : str, int
+        Alamat server; gunakan host '0.0.0.0' agar dapat diakses workstation lain di jaringan lokal.
+    backend, tflite_file, num_threads : optional
+        Diteruskan ke Predictor.
+    batch_size : int, optional
+        Ukuran micro-batch maksimum.
+    max_wait_ms : float, optional
+        Tenggat pengumpulan micro-batch sejak permintaan pertama.
+    max_queue : int, optional
+        Jumlah maksimum permintaan yang menunggu sebelum ditolak dengan HTTP 503.
+    threshold : float, optional
+        Ambang probabilitas untuk prediksi kelas positif.
+
+    Returns
+    -------
+    server : InferenceServer
+    """
+    try:
+        predictor = Predictor(export_dir, backend=backend, batch_size=batch_size, num_threads=num_threads,
+                              tflite_file=tflite_file)
+        server = InferenceServer((host, port), predictor, max_batch_size=batch_size, max_wait_ms=max_wait_ms,
+                                 max_queue=max_queue, threshold=threshold)
+        logger.info(f"Server inferensi siap di http://{server.server_address[0]}:{server.server_address[1]} "
+                    f"(batch {server.batcher.max_batch_size}, tenggat {max_wait_ms} ms)")
+        return server
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat membuat server inferensi: {e}")
+        raise
+
+if __name__ == "__main__":
+    import argparse
+    from src.utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Server inferensi lokal dengan micro-batching.")
+    parser.add_argument('--export_dir', default='./models/export/')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--backend', default=None, choices=BACKENDS)
+    parser.add_argument('--tflite_file', default=None,
+                        help="File TFLite di export_dir, misalnya 'model_int8.tflite' hasil src/quantize.py.")
+    parser.add_argument('--batch_size', type=int, default=32, help="Ukuran micro-batch maksimum.")
+    parser.add_argument('--max_wait_ms', type=float, default=10.0, help="Tenggat pengumpulan micro-batch.")
+    parser.add_argument('--max_queue', type=int, default=256)
+    parser.add_argument('--num_threads', type=int, default=None)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--verbose', action='store_true', help="Menulis log level DEBUG.")
+    args = parser.parse_args()
+    configure_logging(verbose=args.verbose)
+
+    server = create_server(args.export_dir, host=args.host, port=args.port, backend=args.backend,
+                           tflite_file=args.tflite_file, batch_size=args.batch_size, num_threads=args.num_threads,
+                           max_wait_ms=args.max_wait_ms, max_queue=args.max_queue, threshold=args.threshold)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Server inferensi dihentikan.")
+    finally:
+        server.server_close()
\ No newline at end of file
@@ -0,0 +1,357 @@
+# src/stream_pipeline.py
+
+import os
+import sys
+import queue
+import logging
+import threading
+import cv2
+import numpy as np
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.apply_image_enhancement import (
+    DEFAULT_ENHANCEMENTS,
+    collect_image_files,
+    iter_variants,
+    variant_subdir_name
+)
+from src.data.data_loader import iter_raw_images
+from src.data.dataset_store import open_store_arrays, finalize_store, tabular_arrays, termogram_relative_paths
+from src.data.foot_roi import load_roi_index, roi_box, crop_to_box
+from src.data.palette import PALETTE_LUT_FILE, load_palette_lut, save_palette_lut, palette_metadata, invert_palette
+from src.utils.image_sizes import read_image_size, image_size_stats
+from src.utils.instrumentation import get_metrics, dump_metrics
+
+logger = logging.getLogger('src.stream_pipeline')
+
+# Penanda akhir aliran data di setiap antrean
+_END = object()
+
+# Varian store citra suhu satu channel (float16) hasil inversi palet
+TEMPERATURE_VARIANT = os.path.join('Temperature', 'palette')
+
+def collect_source_images(input_dir):
+    """
+    Mengumpulkan citra sumber beserta jalur relatifnya di struktur 'images_per_part'.
+
+    input_dir dapat berupa direktori 'images_per_part' (berisi folder 'Left' dan 'Right')
+    atau direktori data mentah ('data/raw/', berisi folder grup).
+    """
+    if os.path.isdir(os.path.join(input_dir, 'Left')) or os.path.isdir(os.path.join(input_dir, 'Right')):
+        return collect_image_files(input_dir)
+    return list(iter_raw_images(input_dir))
+
+def _run_stage(name, function, input_queue, output_queue, num_workers, counters, lock):
+    """
+    Menjalankan satu tahap pipeline dengan num_workers thread yang membaca input_queue dan menulis ke output_queue.
+
+    Kesalahan per item dicatat ke log (counters['errors'] dinaikkan di bawah lock) dan item dilewati
+    agar tahap lain tidak macet.
+    """
+    def _worker():
+        while True:
+            item = input_queue.get()
+            if item is _END:
+                break
+            try:
+                result = function(item)
+            except Exception as e:
+                logger.error(f"Tahap {name} gagal memproses {item[0]}: {e}")
+                with lock:
+                    counters['errors'] += 1
+                continue
+            if result is not None and output_queue is not None:
+                output_queue.put(result)
+
+    threads = [threading.Thread(target=_worker, name=f'{name}-{i}', daemon=True) for i in range(num_workers)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+def stream_resize_enhance(input_dir, target_size=None, output_dir=None, store_dir=None, data_tabular=None,
+                          enhancements=None, features=None, queue_depth=16, num_workers=None, roi_index=None,
+                          palette_lut=None):
+    """
+    Menjalankan resize dan seluruh varian image enhancement secara streaming tanpa menulis citra hasil resize ke disk.
+
+    Tahapan (baca+resize, enhancement+tulis) dihubungkan dengan antrean berukuran tetap,
+    sehingga memori puncak bergantung pada queue_depth, bukan jumlah citra.
+
+    Parameters
+    ----------
+    input_dir : str
+        Direktori 'images_per_part' atau direktori data mentah ('data/raw/').
+    target_size : tuple of int, optional
+        Ukuran target (width, height). Default: rata-rata ukuran citra sumber (dibaca dari header).
+    output_dir : str, optional
+        Direktori dasar output file varian, dengan struktur yang sama seperti process_images
+        ('<output_dir>/<teknik>/<parameter>/Left/CG Left/...').
+    store_dir : str, optional
+        Direktori dasar dataset store; setiap varian ditulis sebagai store di '<store_dir>/<teknik>/<parameter>/'
+        yang dapat dibuka dengan load_dataset_store. Membutuhkan data_tabular.
+    data_tabular : pandas.DataFrame, optional
+        Data tabular hasil load_tabular_data, untuk mode store.
+    enhancements : dict, optional
+        Teknik dan parameter image enhancement. Default: DEFAULT_ENHANCEMENTS.
+    features : list of str, optional
+        Kolom fitur tabular untuk mode store (lihat tabular_arrays).
+    queue_depth : int, optional
+        Jumlah maksimum citra yang menunggu di setiap antrean.
+    num_workers : int, optional
+        Jumlah thread per tahap. Default: jumlah core CPU.
+    roi_index : dict or str, optional
+        Index ROI kaki (lihat compute_roi_index). Jika diberikan, setiap citra dipotong ke box kakinya sebelum resize
+        dan ukuran target default dihitung dari ukuran box.
+    palette_lut : PaletteLut or str, optional
+        LUT palet hasil calibrate_palette_lut. Jika diberikan, setiap citra juga diubah menjadi citra suhu satu channel
+        sebelum crop dan resize, lalu ditulis sebagai store float16 di '<store_dir>/Temperature/palette/'
+        (ditambah varian enhancement; gunakan enhancements={} untuk store suhu saja). Membutuhkan store_dir.
+
+    Returns
+    -------
+    stats : dict
+        Jumlah citra sumber ('images'), file varian yang ditulis ('files'), citra yang ditulis ke store
+        ('store_images'), dan kesalahan ('errors').
+
+    Raises
+    ------
+    ValueError
+        Jika output_dir dan store_dir tidak diberikan, store_dir diberikan tanpa data_tabular, palette_lut
+        diberikan tanpa store_dir, atau ada citra subjek store yang tidak dapat dibaca atau diproses.
+    FileNotFoundError
+        Jika tidak ada citra sumber.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    if enhancements is None:
+        enhancements = DEFAULT_ENHANCEMENTS
+
+    try:
+        if output_dir is None and store_dir is None:
+            raise ValueError("Minimal salah satu dari output_dir atau store_dir harus diberikan.")
+        if store_dir is not None and data_tabular is None:
+            raise ValueError("Mode store membutuhkan data_tabular.")
+        if palette_lut is not None and store_dir is None:
+            raise ValueError("Citra suhu dari palette_lut hanya ditulis ke dataset store, store_dir harus diberikan.")
+        if not os.path.exists(input_dir):
+            raise FileNotFoundError(f"Direktori {input_dir} tidak ditemukan.")
+
+        sources = collect_source_images(input_dir)
+        if not sources:
+            raise FileNotFoundError(f"Tidak ada citra sumber di direktori {input_dir}.")
+        variants = list(iter_variants(enhancements))
+
+        # Posisi setiap citra di store: jalur relatif -> (indeks subjek, sisi)
+        slots = {}
+        if store_dir is not None:
+            available = {relative_path for _, relative_path in sources}
+            positions, subjects = [], []
+            for position, (subject, gender) in enumerate(zip(data_tabular['Subject'], data_tabular['Gender'])):
+                relative_paths = termogram_relative_paths(subject, gender)
+                if relative_paths is None or not all(path in available for path in relative_paths):
+                    continue
+                slots[relative_paths[0]] = (len(positions), 'left')
+                slots[relative_paths[1]] = (len(positions), 'right')
+                positions.append(position)
+                subjects.append(str(subject))
+            if not positions:
+                raise FileNotFoundError(f"Tidak ada pasangan citra subjek yang ditemukan di {input_dir}.")
+            tabular, labels, features = tabular_arrays(data_tabular, positions, features)
+            if output_dir is None:
+                sources = [source for source in sources if source[1] in slots]
+
+        crop = None
+        if roi_index is not None:
+            roi_index = load_roi_index(roi_index)
+            crop = {'threshold': roi_index['threshold'], 'margin': roi_index['margin']}
+        palette = load_palette_lut(palette_lut) if palette_lut is not None else None
+
+        if target_size is None:
+            sizes = [read_image_size(input_path) for input_path, _ in sources]
+            if roi_index is not None:
+                boxes = roi_index['boxes']
+                sizes = [tuple(boxes[os.path.basename(input_path)][2:]) if os.path.basename(input_path) in boxes
+                         else size for (input_path, _), size in zip(sources, sizes)]
+            stats = image_size_stats(sizes)
+            target_size = (int(stats['width']['mean']), int(stats['height']['mean']))
+            logger.info(f"Ukuran target dari rata-rata citra sumber: {target_size}")
+        target_size = tuple(target_size)
+
+        if output_dir is not None:
+            relative_roots = {os.path.dirname(relative_path) for _, relative_path in sources}
+            for enhancement_name, _, params in variants:
+                for relative_root in relative_roots:
+                    os.makedirs(os.path.join(output_dir, enhancement_name, variant_subdir_name(params), relative_root),
+                                exist_ok=True)
+
+        stores = []
+        if store_dir is not None:
+            image_shape = (target_size[1], target_size[0], 3)
+            for enhancement_name, _, params in variants:
+                variant_dir = os.path.join(store_dir, enhancement_name, variant_subdir_name(params))
+                left, right = open_store_arrays(variant_dir, len(positions), image_shape)
+                stores.append((variant_dir, {'left': left, 'right': right}))
+        temperature_output = None
+        if palette is not None:
+            temperature_dir = os.path.join(store_dir, TEMPERATURE_VARIANT)
+            temperature_shape = (target_size[1], target_size[0], 1)
+            left, right = open_store_arrays(temperature_dir, len(positions), temperature_shape, dtype=np.float16)
+            temperature_output = (temperature_dir, {'left': left, 'right': right})
+
+        counters = {'images': 0, 'files': 0, 'store_images': 0, 'errors': 0}
+        # Jalur relatif citra yang sudah ditulis ke slot store-nya
+        filled = set()
+        lock = threading.Lock()
+        metrics = get_metrics()
+
+        def _load(source):
+            input_path, relative_path = source
+            with metrics.phase('stream', 'decode'):
+                image = cv2.imread(input_path, cv2.IMREAD_COLOR)
+            if image is None:
+                logger.warning(f"Citra {input_path} tidak dapat dibaca, melewatkan file ini.")
+                return None
+            metrics.count('stream', bytes_read=os.path.getsize(input_path))
+            with metrics.phase('stream', 'compute'):
+                # Inversi palet dilakukan pada warna asli, sebelum interpolasi resize mencampur warna palet
+                temperature = None
+                if temperature_output is not None and relative_path in slots:
+                    temperature = invert_palette(image, palette)
+                if crop is not None:
+                    box = roi_box(roi_index, os.path.basename(input_path), image, **crop)
+                    image = crop_to_box(image, box)
+                    if temperature is not None:
+                        temperature = crop_to_box(temperature, box)
+                if variants:
+                    image = cv2.resize(image, target_size, interpolation=cv2.INTER_AREA)
+                if temperature is not None:
+                    temperature = cv2.resize(temperature, target_size, interpolation=cv2.INTER_AREA)
+            return input_path, relative_path, image, temperature
+
+        def _enhance(item):
+            input_path, relative_path, image, temperature = item
+            n_files = n_store = 0
+            slot = slots.get(relative_path)
+            n_bytes = 0
+            for variant_index, (enhancement_name, function, params) in enumerate(variants):
+                with metrics.phase('stream', 'compute'):
+                    enhanced_image = function(image, **params)
+                if output_dir is not None:
+                    output_path = os.path.join(output_dir, enhancement_name, variant_subdir_name(params), relative_path)
+                    with metrics.phase('stream', 'encode'):
+                        cv2.imwrite(output_path, enhanced_image)
+                    n_bytes += os.path.getsize(output_path)
+                    n_files += 1
+                if slot is not None:
+                    index, side = slot
+                    with metrics.phase('stream', 'encode'):
+                        stores[variant_index][1][side][index] = cv2.cvtColor(enhanced_image, cv2.COLOR_BGR2RGB)
+                    n_bytes += enhanced_image.nbytes
+                    n_store += 1
+            if temperature is not None and slot is not None:
+                index, side = slot
+                with metrics.phase('stream', 'encode'):
+                    temperature_output[1][side][index] = temperature[..., None]
+                n_bytes += temperature_output[1][side][index].nbytes
+                n_store += 1
+            metrics.count('stream', files=1, bytes_written=n_bytes)
+            logger.debug(f"Memproses {input_path}: {n_files} file varian, {n_store} citra store")
+            with lock:
+                counters['images'] += 1
+                counters['files'] += n_files
+                counters['store_images'] += n_store
+                if slot is not None and n_store:
+                    filled.add(relative_path)
+
+        num_workers = max(1, num_workers or os.cpu_count() or 1)
+        decoded_queue = queue.Queue(maxsize=queue_depth)
+        source_queue = queue.Queue(maxsize=queue_depth)
+        with metrics.stage('stream'):
+            load_threads = _run_stage('load', _load, source_queue, decoded_queue, num_workers, counters, lock)
+            enhance_threads = _run_stage('enhance', _enhance, decoded_queue, None, num_workers, counters, lock)
+
+            for source in sources:
+                source_queue.put(source)
+            for _ in load_threads:
+                source_queue.put(_END)
+            for thread in load_threads:
+                thread.join()
+            for _ in enhance_threads:
+                decoded_queue.put(_END)
+            for thread in enhance_threads:
+                thread.join()
+
+        # Slot citra yang gagal tetap berisi nol; store tidak difinalisasi agar citra hitam tidak masuk data latih
+        missing = sorted(set(slots) - filled) if stores or temperature_output is not None else []
+        if missing:
+            raise ValueError(f"{len(missing)} citra store tidak dapat dibaca atau diproses: "
+                             + ', '.join(missing[:5]) + (', ...' if len(missing) > 5 else ''))
+
+        for (variant_dir, arrays), (enhancement_name, _, params) in zip(stores, variants):
+            arrays['left'].flush()
+            arrays['right'].flush()
+            metadata = {'enhancement': {'name': enhancement_name, 'parameters': params}}
+            if crop is not None:
+                metadata['crop'] = crop
+            finalize_store(variant_dir, subjects, features, tabular, labels, image_shape, input_dir, **metadata)
+        stores.clear()
+        if temperature_output is not None:
+            temperature_dir, arrays = temperature_output
+            arrays['left'].flush()
+            arrays['right'].flush()
+            # LUT disimpan bersama store agar ekspor model dapat membawanya ke inferensi
+            save_palette_lut(palette, os.path.join(temperature_dir, PALETTE_LUT_FILE))
+            metadata = {'channel_order': 'temperature', 'palette': palette_metadata(palette)}
+            if crop is not None:
+                metadata['crop'] = crop
+            finalize_store(temperature_dir, subjects, features, tabular, labels, temperature_shape, input_dir,
+                           **metadata)
+            temperature_output = None
+
+        logger.info(f"Streaming selesai: {counters['images']} citra, {len(variants) + (palette is not None)} varian, "
+                    f"{counters['files']} file, {counters['store_images']} citra store, {counters['errors']} kesalahan")
+        logger.info(metrics.summary('stream'))
+        return counters
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan selama pipeline streaming: {e}")
+        raise
+
+if __name__ == "__main__":
+    import argparse
+    from src.utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Resize dan image enhancement secara streaming tanpa file perantara.")
+    parser.add_argument('--input_dir', default='./data/processed/images_per_part/')
+    parser.add_argument('--output_dir', default=None,
+                        help="Direktori dasar output file varian (misalnya, './data/processed/image enhancement/').")
+    parser.add_argument('--store_dir', default=None,
+                        help="Direktori dasar dataset store per varian (misalnya, './data/processed/dataset_store/').")
+    parser.add_argument('--tabular_path', default='./data/external/Plantar Thermogram Data Analysis.csv')
+    parser.add_argument('--target_size', type=int, nargs=2, default=None, metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--roi_index', default=None,
+                        help="Index ROI kaki (python -m src.data.foot_roi); citra dipotong ke box kaki sebelum resize.")
+    parser.add_argument('--palette_lut', default=None,
+                        help="LUT palet (python -m src.data.palette); menambahkan store citra suhu satu channel float16.")
+    parser.add_argument('--temperature_only', action='store_true',
+                        help="Hanya menulis store citra suhu (tanpa varian image enhancement), membutuhkan --palette_lut.")
+    parser.add_argument('--queue_depth', type=int, default=16)
+    parser.add_argument('--num_workers', type=int, default=None)
+    parser.add_argument('--metrics_json', default=None, help="Menyimpan metrik pipeline ke file JSON.")
+    parser.add_argument('--metrics_prom', default=None, help="Menyimpan metrik pipeline sebagai textfile Prometheus.")
+    parser.add_argument('--verbose', action='store_true', help="Menulis log per file (level DEBUG).")
+    args = parser.parse_args()
+    configure_logging(verbose=args.verbose)
+
+    data_tabular = None
+    if args.store_dir is not None:
+        from src.data.data_preprocessing import load_tabular_data
+        data_tabular = load_tabular_data(args.tabular_path)
+
+    stream_resize_enhance(args.input_dir, target_size=args.target_size, output_dir=args.output_dir,
+                          store_dir=args.store_dir, data_tabular=data_tabular, queue_depth=args.queue_depth,
+                          num_workers=args.num_workers, roi_index=args.roi_index, palette_lut=args.palette_lut,
+                          enhancements={} if args.temperature_only else None)
+    dump_metrics(args.metrics_json, args.metrics_prom)
\ No newline at end of file
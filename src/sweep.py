@@ -0,0 +1,335 @@
+# src/sweep.py
+
+import os
+import sys
+import csv
+import json
+import math
+import time
+import shutil
+import logging
+import numpy as np
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.training import (
+    FOLDS_FILE,
+    MODEL_MODULES,
+    prepare_stores,
+    compute_fold_indices,
+    run_jobs,
+    model_options_from_args,
+    scaler_path_for
+)
+from src.utils.metrics import METRIC_NAMES, summarize_metrics
+
+logger = logging.getLogger('src.sweep')
+
+LEADERBOARD_FILE = 'leaderboard.json'
+LEADERBOARD_CSV = 'leaderboard.csv'
+CHECKPOINT_DIR = 'checkpoints'
+PRUNERS = ('halving', 'median', 'none')
+
+def rung_schedule(min_epochs, max_epochs, reduction_factor=3):
+    """
+    Menentukan jumlah epoch kumulatif di setiap rung, misalnya (10, 200, 3) -> [10, 30, 90, 200].
+    """
+    if min_epochs < 1 or max_epochs < min_epochs or reduction_factor < 2:
+        raise ValueError("Diperlukan 1 <= min_epochs <= max_epochs dan reduction_factor >= 2.")
+    schedule = []
+    epochs = min_epochs
+    while epochs < max_epochs:
+        schedule.append(int(epochs))
+        epochs *= reduction_factor
+    schedule.append(int(max_epochs))
+    return schedule
+
+def select_survivors(scores, pruner='halving', reduction_factor=3):
+    """
+    Memilih kandidat yang lanjut ke rung berikutnya.
+
+    Parameters
+    ----------
+    scores : dict
+        Pemetaan kunci kandidat ke skor di rung ini (lebih besar lebih baik; NaN dianggap terburuk).
+    pruner : str, optional
+        'halving' (successive halving: mempertahankan ceil(n / reduction_factor) kandidat terbaik),
+        'median' (membuang kandidat di bawah median skor rung), atau 'none'.
+    reduction_factor : int, optional
+        Faktor pengurangan untuk 'halving'.
+
+    Returns
+    -------
+    survivors : set
+        Kunci kandidat yang dipertahankan.
+    """
+    if pruner not in PRUNERS:
+        raise ValueError(f"Pruner {pruner} tidak dikenal. Pilihan: {', '.join(PRUNERS)}.")
+    if pruner == 'none' or not scores:
+        return set(scores)
+
+    values = {key: (-math.inf if score is None or math.isnan(score) else score) for key, score in scores.items()}
+    if pruner == 'halving':
+        n_keep = max(1, math.ceil(len(values) / reduction_factor))
+        # Urutan kunci sebagai pemecah seri agar keputusan sama saat sweep dilanjutkan
+        ranked = sorted(values, key=lambda key: (-values[key], key))
+        return set(ranked[:n_keep])
+
+    finite = [value for value in values.values() if value != -math.inf]
+    if not finite:
+        return set(values)
+    median = float(np.median(finite))
+    return {key for key, value in values.items() if value >= median}
+
+def candidate_key(variant, model_name):
+    return f"{variant} / {model_name}"
+
+def _checkpoint_dir(output_dir, candidate):
+    return os.path.join(output_dir, CHECKPOINT_DIR, f"{candidate['variant'].replace('/', '__')}__{candidate['model']}")
+
+def _checkpoint_path(output_dir, candidate, fold, epochs):
+    return os.path.join(_checkpoint_dir(output_dir, candidate), f'fold_{fold}_epoch_{epochs}.keras')
+
+def load_leaderboard(output_dir):
+    """
+    Memuat leaderboard sweep dari '<output_dir>/leaderboard.json', atau None jika belum ada.
+    """
+    path = os.path.join(output_dir, LEADERBOARD_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def rank_candidates(leaderboard):
+    """
+    Mengurutkan kandidat: epoch yang dicapai (terbanyak dahulu), lalu skor rung terakhir.
+    """
+    def _sort_key(candidate):
+        score = candidate['score']
+        score = -math.inf if score is None or math.isnan(score) else score
+        return (-candidate['epochs'], -score, candidate['variant'], candidate['model'])
+
+    return sorted(leaderboard['candidates'].values(), key=_sort_key)
+
+def save_leaderboard(output_dir, leaderboard):
+    """
+    Menyimpan leaderboard secara atomik ke 'leaderboard.json' dan ringkasannya ke 'leaderboard.csv'.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, LEADERBOARD_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(leaderboard, f, indent=2)
+    os.replace(tmp_path, path)
+
+    metric = leaderboard['config']['metric']
+    rows = []
+    for rank, candidate in enumerate(rank_candidates(leaderboard), start=1):
+        row = {'rank': rank, 'variant': candidate['variant'], 'model': candidate['model'],
+               'status': candidate['status'], 'epochs': candidate['epochs'], metric: candidate['score'],
+               'train_time': candidate['train_time']}
+        last_rung = candidate['rungs'].get(str(candidate['epochs']), {})
+        row.update({f'{name}_mean': last_rung.get(f'{name}_mean') for name in METRIC_NAMES})
+        rows.append(row)
+    if rows:
+        with open(os.path.join(output_dir, LEADERBOARD_CSV), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+def run_sweep(stores, model_names=('model1',), output_dir='./results/sweep/', pruner='halving', min_epochs=10,
+              max_epochs=200, reduction_factor=3, metric='auc', n_splits=5, batch_size=32, learning_rate=1e-4,
+              random_state=42, cpu_budget=None, max_workers=None, keep_checkpoints=False, model_options=None):
+    """
+    Sweep semua kombinasi (varian enhancement, model) dengan pruning bertahap dan leaderboard yang dapat dilanjutkan.
+
+    Setiap kandidat dilatih dengan K-Fold cross-validation (fold sama untuk semua kandidat) secara
+    bertahap per rung (lihat rung_schedule). Di akhir setiap rung, rata-rata metrik antarfold
+    dibandingkan dan kandidat yang tertinggal dihentikan (lihat select_survivors); kandidat yang
+    lanjut meneruskan pelatihan dari checkpoint rung sebelumnya. Progres per fold disimpan ke
+    leaderboard setelah setiap pekerjaan selesai, sehingga sweep yang terhenti dapat dijalankan
+    ulang dengan output_dir yang sama dan hanya melanjutkan pekerjaan yang belum selesai.
+
+    Parameters
+    ----------
+    stores : str or dict
+        Direktori dasar dataset store per varian, atau pemetaan nama varian ke direktori store.
+    model_names : list of str, optional
+        Model yang dievaluasi ('model1'..'model4').
+    output_dir : str, optional
+        Direktori leaderboard, indeks fold, dan checkpoint.
+    pruner : str, optional
+        'halving', 'median', atau 'none' (lihat select_survivors).
+    min_epochs : int, optional
+        Jumlah epoch rung pertama.
+    max_epochs : int, optional
+        Jumlah epoch penuh untuk kandidat yang bertahan sampai akhir.
+    reduction_factor : int, optional
+        Faktor kenaikan epoch antar-rung dan faktor pengurangan kandidat untuk 'halving'.
+    metric : str, optional
+        Metrik pembanding kandidat ('accuracy', 'precision', 'recall', 'f1', atau 'auc').
+    n_splits, batch_size, learning_rate, random_state, cpu_budget, max_workers :
+        Sama seperti cross_validate.
+    keep_checkpoints : bool, optional
+        Tidak menghapus checkpoint kandidat yang dihentikan. Checkpoint kandidat yang selesai selalu disimpan.
+    model_options : dict, optional
+        Argumen tambahan create_model untuk semua kandidat (lihat cross_validate).
+
+    Returns
+    -------
+    ranking : list of dict
+        Kandidat terurut dari leaderboard (lihat rank_candidates).
+
+    Raises
+    ------
+    ValueError
+        Jika parameter tidak valid atau leaderboard yang ada dibuat dengan konfigurasi berbeda.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    try:
+        if metric not in METRIC_NAMES:
+            raise ValueError(f"Metrik {metric} tidak dikenal. Pilihan: {', '.join(METRIC_NAMES)}.")
+        if pruner not in PRUNERS:
+            raise ValueError(f"Pruner {pruner} tidak dikenal. Pilihan: {', '.join(PRUNERS)}.")
+        stores, subjects = prepare_stores(stores, model_names)
+        schedule = rung_schedule(min_epochs, max_epochs, reduction_factor)
+
+        config = {'pruner': pruner, 'schedule': schedule, 'reduction_factor': reduction_factor, 'metric': metric,
+                  'n_splits': n_splits, 'batch_size': batch_size, 'learning_rate': learning_rate,
+                  'random_state': random_state, 'model_options': dict(model_options or {})}
+        leaderboard = load_leaderboard(output_dir)
+        if leaderboard is None:
+            leaderboard = {'config': config, 'candidates': {}}
+        elif leaderboard['config'] != config:
+            raise ValueError(f"Leaderboard di {output_dir} dibuat dengan konfigurasi berbeda; "
+                             f"gunakan output_dir lain untuk konfigurasi baru.")
+        else:
+            logger.info(f"Melanjutkan sweep dari {os.path.join(output_dir, LEADERBOARD_FILE)}")
+
+        candidates = leaderboard['candidates']
+        for variant in stores:
+            for model_name in model_names:
+                key = candidate_key(variant, model_name)
+                if key not in candidates:
+                    candidates[key] = {'variant': variant, 'model': model_name, 'status': 'running', 'epochs': 0,
+                                       'score': None, 'train_time': 0.0, 'rungs': {}, 'folds': {}}
+        save_leaderboard(output_dir, leaderboard)
+
+        folds = compute_fold_indices(len(subjects), n_splits, random_state, os.path.join(output_dir, FOLDS_FILE))
+        start = time.perf_counter()
+
+        def _on_result(job, record):
+            candidate = candidates[candidate_key(job['variant'], job['model'])]
+            candidate['folds'][str(job['fold'])] = {key: value for key, value in record.items()
+                                                    if key not in ('variant', 'model', 'fold')}
+            candidate['train_time'] += record['train_time']
+            save_leaderboard(output_dir, leaderboard)
+            # Checkpoint lama (beserta scaler-nya) baru dihapus setelah progres fold tercatat
+            if job.get('resume_from') is not None:
+                for path in [job['resume_from'], scaler_path_for(job['resume_from'])]:
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        for rung, epochs in enumerate(schedule):
+            rung_key = str(epochs)
+            # Kandidat yang dihentikan di rung ini tetap ikut dibandingkan agar keputusan sama saat dilanjutkan
+            contenders = [key for key, candidate in candidates.items()
+                          if candidate['status'] == 'running' or rung_key in candidate['rungs']]
+            if not contenders:
+                break
+
+            jobs = []
+            for key in contenders:
+                candidate = candidates[key]
+                for fold, (train_index, test_index) in enumerate(folds):
+                    done_epochs = candidate['folds'].get(str(fold), {}).get('epochs', 0)
+                    if done_epochs >= epochs:
+                        continue
+                    jobs.append({
+                        'variant': candidate['variant'], 'store_dir': stores[candidate['variant']],
+                        'model': candidate['model'], 'fold': fold, 'train_index': train_index,
+                        'test_index': test_index, 'epochs': epochs, 'batch_size': batch_size,
+                        'learning_rate': learning_rate, 'seed': random_state,
+                        'model_options': config['model_options'], 'initial_epoch': done_epochs,
+                        'resume_from': _checkpoint_path(output_dir, candidate, fold, done_epochs) if done_epochs else None,
+                        'checkpoint': _checkpoint_path(output_dir, candidate, fold, epochs),
+                    })
+            logger.info(f"Rung {rung + 1}/{len(schedule)} ({epochs} epoch): {len(contenders)} kandidat, "
+                        f"{len(jobs)} pekerjaan tersisa")
+            run_jobs(jobs, cpu_budget=cpu_budget, max_workers=max_workers, on_result=_on_result)
+
+            scores = {}
+            for key in contenders:
+                candidate = candidates[key]
+                summary = summarize_metrics([candidate['folds'][str(fold)] for fold in range(len(folds))])
+                candidate['rungs'][rung_key] = summary
+                candidate['epochs'] = epochs
+                candidate['score'] = summary[f'{metric}_mean']
+                scores[key] = candidate['score']
+
+            is_last = rung == len(schedule) - 1
+            survivors = set(scores) if is_last else select_survivors(scores, pruner, reduction_factor)
+            for key in contenders:
+                candidate = candidates[key]
+                if key not in survivors:
+                    candidate['status'] = 'pruned'
+                    if not keep_checkpoints:
+                        shutil.rmtree(_checkpoint_dir(output_dir, candidate), ignore_errors=True)
+                elif is_last:
+                    candidate['status'] = 'complete'
+            save_leaderboard(output_dir, leaderboard)
+            logger.info(f"Rung {epochs} epoch: {len(survivors)}/{len(contenders)} kandidat lanjut; "
+                        + ', '.join(f"{key} {metric} {scores[key]:.4f}" for key in sorted(scores, key=scores.get,
+                                                                                         reverse=True)))
+
+        ranking = rank_candidates(leaderboard)
+        total_epochs = sum(candidate['epochs'] for candidate in ranking)
+        full_epochs = len(ranking) * max_epochs
+        logger.info(f"Sweep selesai dalam {time.perf_counter() - start:.1f} s: {total_epochs} dari {full_epochs} "
+                    f"epoch per fold dijalankan ({100.0 * (1 - total_epochs / full_epochs):.0f}% lebih hemat)")
+        for rank, candidate in enumerate(ranking[:5], start=1):
+            logger.info(f"#{rank} {candidate['variant']} / {candidate['model']} ({candidate['status']}, "
+                        f"{candidate['epochs']} epoch): {metric} {candidate['score']:.4f}")
+        return ranking
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan selama sweep varian: {e}")
+        raise
+
+if __name__ == "__main__":
+    import argparse
+    from src.utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Sweep varian image enhancement x model dengan pruning bertahap.")
+    parser.add_argument('--store_dir', default='./data/processed/dataset_store/',
+                        help="Direktori dasar dataset store per varian.")
+    parser.add_argument('--models', nargs='+', default=['model1'], choices=sorted(MODEL_MODULES))
+    parser.add_argument('--output_dir', default='./results/sweep/')
+    parser.add_argument('--pruner', default='halving', choices=PRUNERS)
+    parser.add_argument('--min_epochs', type=int, default=10)
+    parser.add_argument('--max_epochs', type=int, default=200)
+    parser.add_argument('--reduction_factor', type=int, default=3)
+    parser.add_argument('--metric', default='auc', choices=METRIC_NAMES)
+    parser.add_argument('--n_splits', type=int, default=5)
+    parser.add_argument('--batch_size', type=int, default=32)
+    parser.add_argument('--learning_rate', type=float, default=1e-4)
+    parser.add_argument('--cpu_budget', type=int, default=None, help="Jumlah core CPU yang boleh digunakan.")
+    parser.add_argument('--max_workers', type=int, default=None, help="Jumlah proses worker.")
+    parser.add_argument('--keep_checkpoints', action='store_true')
+    parser.add_argument('--shared_trunk', action='store_true',
+                        help="Satu tower konvolusi bersama untuk citra kiri dan kanan (model1-model3).")
+    parser.add_argument('--global_pooling', default=None, choices=['avg', 'max'],
+                        help="Global pooling sebagai pengganti Flatten (model1-model3).")
+    parser.add_argument('--rescale_input', action='store_true',
+                        help="Normalisasi citra di dalam model (layer Rescaling) sehingga batch tetap uint8.")
+    parser.add_argument('--verbose', action='store_true', help="Menulis log level DEBUG.")
+    args = parser.parse_args()
+    configure_logging(verbose=args.verbose)
+
+    run_sweep(args.store_dir, model_names=args.models, output_dir=args.output_dir, pruner=args.pruner,
+              min_epochs=args.min_epochs, max_epochs=args.max_epochs, reduction_factor=args.reduction_factor,
+              metric=args.metric, n_splits=args.n_splits, batch_size=args.batch_size,
+              learning_rate=args.learning_rate, cpu_budget=args.cpu_budget, max_workers=args.max_workers,
+              keep_checkpoints=args.keep_checkpoints, model_options=model_options_from_args(args))
\ No newline at end of file
@@ -0,0 +1,474 @@
+# src/training.py
+
+import os
+import sys
+import csv
+import json
+import time
+import logging
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data.dataset_store import INDEX_FILE, load_dataset_store
+from src.utils.metrics import METRIC_NAMES, classification_metrics, summarize_metrics
+
+logger = logging.getLogger('src.training')
+
+MODEL_MODULES = {
+    'model1': 'src.models.model1',
+    'model2': 'src.models.model2',
+    'model3': 'src.models.model3',
+    'model4': 'src.models.model4',
+}
+FOLDS_FILE = 'folds.npz'
+SCALER_SUFFIX = '_scaler.joblib'
+
+# Store yang sudah dibuka di proses ini (per worker), agar setiap fold tidak membuka ulang memmap
+_open_stores = {}
+
+def get_model_fn(model_name):
+    """
+    Mengambil fungsi create_model(input_shape_image, input_shape_tabular) berdasarkan nama model ('model1'..'model4').
+    """
+    if model_name not in MODEL_MODULES:
+        raise ValueError(f"Model {model_name} tidak dikenal. Pilihan: {', '.join(MODEL_MODULES)}.")
+    return importlib.import_module(MODEL_MODULES[model_name]).create_model
+
+def compute_fold_indices(n_samples, n_splits=5, random_state=42, path=None):
+    """
+    Menghitung indeks train/test K-Fold sekali dan (opsional) menyimpannya agar dipakai ulang.
+
+    Pembagian sama dengan notebook modeling: KFold(n_splits, shuffle=True, random_state=42).
+
+    Parameters
+    ----------
+    n_samples : int
+        Jumlah sampel di dataset store.
+    n_splits : int, optional
+        Jumlah fold.
+    random_state : int, optional
+        Seed pengacakan KFold.
+    path : str, optional
+        File .npz untuk menyimpan indeks fold. Jika sudah ada dan parameternya sama, indeks dimuat dari file ini.
+
+    Returns
+    -------
+    folds : list of tuple
+        Daftar (train_index, test_index) berupa numpy.ndarray int64.
+    """
+    if path is not None and os.path.exists(path):
+        with np.load(path) as data:
+            if (int(data['n_samples']) == n_samples and int(data['n_splits']) == n_splits
+                    and int(data['random_state']) == random_state):
+                return [(data[f'train_{i}'], data[f'test_{i}']) for i in range(n_splits)]
+        logger.warning(f"Indeks fold di {path} tidak cocok dengan parameter saat ini, menghitung ulang.")
+
+    from sklearn.model_selection import KFold
+
+    kf = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    folds = [(train_index.astype(np.int64), test_index.astype(np.int64))
+             for train_index, test_index in kf.split(np.zeros(n_samples))]
+
+    if path is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        arrays = {'n_samples': n_samples, 'n_splits': n_splits, 'random_state': random_state}
+        for i, (train_index, test_index) in enumerate(folds):
+            arrays[f'train_{i}'] = train_index
+            arrays[f'test_{i}'] = test_index
+        np.savez(path, **arrays)
+    return folds
+
+def scaler_path_for(checkpoint):
+    """
+    Jalur scaler tabular yang disimpan train_fold di samping checkpoint
+    (misalnya, 'fold_0_epoch_9.keras' -> 'fold_0_epoch_9_scaler.joblib').
+    """
+    return os.path.splitext(checkpoint)[0] + SCALER_SUFFIX
+
+def discover_stores(base_dir):
+    """
+    Mencari semua dataset store (direktori berisi 'index.json') di bawah base_dir.
+
+    Returns
+    -------
+    stores : dict
+        Pemetaan nama varian (jalur relatif, misalnya 'CLAHE/2.0_(8, 8)') ke direktori store.
+    """
+    if not os.path.exists(base_dir):
+        raise FileNotFoundError(f"Direktori {base_dir} tidak ditemukan.")
+    if os.path.exists(os.path.join(base_dir, INDEX_FILE)):
+        return {os.path.basename(os.path.normpath(base_dir)): base_dir}
+
+    stores = {}
+    for root, dirs, files in os.walk(base_dir):
+        dirs.sort()
+        if INDEX_FILE in files:
+            stores[os.path.relpath(root, base_dir).replace(os.sep, '/')] = root
+            dirs[:] = []
+    return stores
+
+def model_options_from_args(args):
+    """
+    Mengambil opsi arsitektur (--shared_trunk, --global_pooling, --rescale_input) dari argumen CLI;
+    hanya opsi yang diaktifkan.
+    """
+    options = {}
+    if args.shared_trunk:
+        options['shared_trunk'] = True
+    if args.rescale_input:
+        options['rescale_input'] = True
+    if args.global_pooling is not None:
+        options['global_pooling'] = args.global_pooling
+    return options
+
+def _read_subjects(store_dir):
+    with open(os.path.join(store_dir, INDEX_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)['subjects']
+
+def _init_worker(tf_threads, log_config):
+    """
+    Inisialisasi proses worker: membatasi thread TensorFlow sesuai jatah CPU dan mengatur logging.
+    """
+    for name in ['OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS']:
+        os.environ[name] = str(tf_threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    if log_config is not None:
+        from src.utils.logging_config import configure_logging
+        configure_logging(**log_config)
+
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(tf_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    except RuntimeError as e:
+        # TensorFlow yang sudah terinisialisasi tidak dapat diubah jumlah thread-nya
+        logger.debug(f"Jumlah thread TensorFlow tidak dapat diatur: {e}")
+
+def train_fold(job):
+    """
+    Melatih dan mengevaluasi satu model pada satu fold dari satu varian dataset store.
+
+    Store dibuka memory-mapped read-only sehingga worker-worker berbagi halaman yang sama di page cache.
+    Fitur tabular (semua fitur store, termasuk Gender) dinormalisasi dengan StandardScaler yang di-fit pada data
+    train fold tersebut; scaler ini disimpan bersama checkpoint agar inferensi memakai skala yang sama.
+
+    Parameters
+    ----------
+    job : dict
+        {'variant', 'store_dir', 'model', 'fold', 'train_index', 'test_index', 'epochs', 'batch_size',
+        'learning_rate', 'seed'}. Kunci opsional: 'model_options' (argumen tambahan create_model, misalnya
+        {'shared_trunk': True, 'global_pooling': 'avg'}), 'checkpoint' (jalur file .keras) untuk menyimpan model setelah
+        pelatihan beserta scaler tabularnya (lihat scaler_path_for), serta 'resume_from' dan 'initial_epoch' untuk
+        melanjutkan pelatihan dari checkpoint hingga 'epochs'.
+
+    Returns
+    -------
+    record : dict
+        {'variant', 'model', 'fold', 'n_train', 'n_test', 'epochs', 'train_time'} ditambah metrik classification_metrics.
+    """
+    import tensorflow as tf
+    from sklearn.preprocessing import StandardScaler
+    from src.data.tf_pipeline import create_store_dataset
+
+    store = _open_stores.get(job['store_dir'])
+    if store is None:
+        store = _open_stores[job['store_dir']] = load_dataset_store(job['store_dir'], mmap_mode='r')
+
+    train_index, test_index = job['train_index'], job['test_index']
+    checkpoint, resume_from = job.get('checkpoint'), job.get('resume_from')
+    initial_epoch = job.get('initial_epoch', 0) if resume_from is not None else 0
+    seed = job['seed'] + job['fold'] + initial_epoch
+    start = time.perf_counter()
+
+    tf.keras.backend.clear_session()
+    tf.keras.utils.set_random_seed(seed)
+    scaler = StandardScaler().fit(np.asarray(store.tabular[train_index]))
+    model_options = dict(job.get('model_options', {}))
+    if store.left.dtype != np.uint8:
+        # Citra float (misalnya citra suhu dari store 'Temperature/palette') sudah berada di rentang [0, 1]
+        model_options['rescale_input'] = False
+    # Model dengan rescale_input menerima batch uint8 dan menormalisasinya sendiri
+    normalize = not model_options.get('rescale_input', False)
+    # Citra fold train di-cache (uint8) setelah epoch pertama sehingga epoch berikutnya tidak membaca memmap lagi
+    train_dataset = create_store_dataset(store, indices=train_index, batch_size=job['batch_size'], shuffle=True,
+                                         seed=seed, cache=True, normalize=normalize, tabular_scaler=scaler)
+    test_dataset = create_store_dataset(store, indices=test_index, batch_size=job['batch_size'],
+                                        normalize=normalize, tabular_scaler=scaler)
+
+    if resume_from is not None:
+        # Bobot dan state optimizer dilanjutkan dari checkpoint sebelumnya
+        model = tf.keras.models.load_model(resume_from)
+    else:
+        model = get_model_fn(job['model'])(tuple(store.left.shape[1:]), store.tabular.shape[1],
+                                           **model_options)
+        model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=job['learning_rate']),
+                      loss='binary_crossentropy', metrics=['accuracy'])
+    # Urutan sampel sudah diacak oleh tf.data
+    model.fit(train_dataset, initial_epoch=initial_epoch, epochs=job['epochs'], shuffle=False, verbose=0)
+    y_prob = model.predict(test_dataset, verbose=0)
+    if checkpoint is not None:
+        import joblib
+
+        checkpoint_dir = os.path.dirname(os.path.abspath(checkpoint))
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        # Ditulis ke file sementara lalu diganti agar checkpoint tidak setengah jadi jika proses terhenti
+        tmp_path = os.path.join(checkpoint_dir, f"tmp_{os.path.basename(checkpoint)}")
+        model.save(tmp_path)
+        os.replace(tmp_path, checkpoint)
+        scaler_path = scaler_path_for(checkpoint)
+        tmp_path = os.path.join(checkpoint_dir, f"tmp_{os.path.basename(scaler_path)}")
+        joblib.dump(scaler, tmp_path)
+        os.replace(tmp_path, scaler_path)
+
+    record = {
+        'variant': job['variant'],
+        'model': job['model'],
+        'fold': job['fold'],
+        'n_train': int(len(train_index)),
+        'n_test': int(len(test_index)),
+        'epochs': job['epochs'],
+        'train_time': time.perf_counter() - start,
+    }
+    record.update(classification_metrics(store.labels[test_index], y_prob))
+    logger.info(f"{job['variant']} / {job['model']} fold {job['fold'] + 1}, epoch {job['epochs']}: "
+                + ', '.join(f"{name} {record[name]:.4f}" for name in METRIC_NAMES)
+                + f" ({record['train_time']:.1f} s)")
+    return record
+
+def prepare_stores(stores, model_names):
+    """
+    Memvalidasi store dan nama model sebelum pelatihan.
+
+    Indeks fold hanya dapat dipakai bersama jika semua store memuat subjek yang sama dengan urutan yang sama.
+
+    Returns
+    -------
+    stores : dict
+        Pemetaan nama varian ke direktori store.
+    subjects : list of str
+        Urutan subjek yang sama di semua store.
+
+    Raises
+    ------
+    ValueError
+        Jika tidak ada store, model tidak dikenal, atau urutan subjek antarstore berbeda.
+    """
+    if isinstance(stores, str):
+        stores = discover_stores(stores)
+    if not stores:
+        raise ValueError("Tidak ada dataset store yang ditemukan.")
+    # Model tidak diimpor di proses utama agar TensorFlow hanya dimuat oleh worker
+    unknown = [model_name for model_name in model_names if model_name not in MODEL_MODULES]
+    if unknown:
+        raise ValueError(f"Model {', '.join(unknown)} tidak dikenal. Pilihan: {', '.join(MODEL_MODULES)}.")
+
+    variants = list(stores)
+    subjects = _read_subjects(stores[variants[0]])
+    for variant in variants[1:]:
+        if _read_subjects(stores[variant]) != subjects:
+            raise ValueError(f"Urutan subjek store {variant} berbeda dengan store {variants[0]}.")
+    return dict(stores), subjects
+
+def run_jobs(jobs, cpu_budget=None, max_workers=None, on_result=None):
+    """
+    Menjalankan pekerjaan train_fold secara paralel di proses worker dengan batas jumlah core CPU.
+
+    Parameters
+    ----------
+    jobs : list of dict
+        Pekerjaan untuk train_fold.
+    cpu_budget : int, optional
+        Jumlah core CPU yang boleh digunakan. Default: jumlah core CPU.
+    max_workers : int, optional
+        Jumlah proses worker. Default: cpu_budget. Dengan 1 worker, pekerjaan dijalankan di proses ini.
+    on_result : callable, optional
+        Dipanggil dengan (job, record) setiap kali satu pekerjaan selesai (misalnya, untuk menyimpan progres).
+
+    Returns
+    -------
+    records : list of dict
+        Hasil train_fold dengan urutan yang sama seperti jobs.
+    """
+    if not jobs:
+        return []
+    cpu_budget = max(1, cpu_budget or os.cpu_count() or 1)
+    workers = max(1, min(max_workers or cpu_budget, cpu_budget, len(jobs)))
+    tf_threads = max(1, cpu_budget // workers)
+    logger.info(f"Menjalankan {len(jobs)} pekerjaan dengan {workers} worker x {tf_threads} thread")
+
+    from src.utils.logging_config import is_logging_configured
+
+    records = [None] * len(jobs)
+    if workers == 1:
+        _init_worker(tf_threads, None)
+        for i, job in enumerate(jobs):
+            records[i] = train_fold(job)
+            if on_result is not None:
+                on_result(job, records[i])
+        return records
+
+    log_config = {} if is_logging_configured() else None
+    # 'spawn' agar setiap worker memulai TensorFlow sendiri dengan jumlah thread yang sudah dibatasi
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(tf_threads, log_config)) as executor:
+        futures = {executor.submit(train_fold, job): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            records[i] = future.result()
+            if on_result is not None:
+                on_result(jobs[i], records[i])
+    return records
+
+def summarize_cv(records):
+    """
+    Merangkum hasil per fold menjadi rata-rata dan simpangan baku metrik per (varian, model).
+    """
+    groups = {}
+    for record in records:
+        groups.setdefault((record['variant'], record['model']), []).append(record)
+
+    summary = []
+    for (variant, model), group in groups.items():
+        row = {'variant': variant, 'model': model, 'n_folds': len(group),
+               'train_time': float(sum(record['train_time'] for record in group))}
+        row.update(summarize_metrics(group))
+        summary.append(row)
+    return summary
+
+def save_cv_results(output_dir, records, summary):
+    """
+    Menyimpan hasil cross-validation ke 'folds.csv', 'summary.csv', dan 'results.json' di output_dir.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for file_name, rows in [('folds.csv', records), ('summary.csv', summary)]:
+        with open(os.path.join(output_dir, file_name), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    with open(os.path.join(output_dir, 'results.json'), 'w', encoding='utf-8') as f:
+        json.dump({'folds': records, 'summary': summary}, f, indent=2)
+
+def cross_validate(stores, model_names=('model1',), n_splits=5, epochs=200, batch_size=32, learning_rate=1e-4,
+                   random_state=42, cpu_budget=None, max_workers=None, output_dir=None, model_options=None):
+    """
+    K-Fold cross-validation untuk semua varian dataset store dan model, dengan fold dijalankan paralel antarproses.
+
+    Indeks fold dihitung sekali dan dipakai untuk semua varian dan model, sehingga hasil antarvarian
+    dapat dibandingkan langsung. Setiap pekerjaan (varian, model, fold) dijalankan di proses worker
+    yang membuka store secara memory-mapped read-only; jumlah thread TensorFlow per worker adalah
+    cpu_budget // max_workers agar total thread tidak melebihi jatah CPU.
+
+    Parameters
+    ----------
+    stores : str or dict
+        Direktori dasar dataset store per varian (lihat stream_resize_enhance dan discover_stores),
+        atau pemetaan nama varian ke direktori store.
+    model_names : list of str, optional
+        Model yang dievaluasi ('model1'..'model4').
+    n_splits : int, optional
+        Jumlah fold.
+    epochs : int, optional
+        Jumlah epoch per fold.
+    batch_size : int, optional
+        Ukuran batch.
+    learning_rate : float, optional
+        Learning rate Adam.
+    random_state : int, optional
+        Seed KFold dan seed dasar pelatihan (seed fold = random_state + nomor fold).
+    cpu_budget : int, optional
+        Jumlah core CPU yang boleh digunakan. Default: jumlah core CPU.
+    max_workers : int, optional
+        Jumlah proses worker. Default: cpu_budget (satu thread TensorFlow per worker).
+        Dengan 1 worker, pelatihan dijalankan di proses ini.
+    output_dir : str, optional
+        Direktori untuk menyimpan indeks fold ('folds.npz') dan hasil (lihat save_cv_results).
+    model_options : dict, optional
+        Argumen tambahan create_model, misalnya {'shared_trunk': True, 'global_pooling': 'avg'} (model1-model3).
+
+    Returns
+    -------
+    results : dict
+        {'folds': hasil per fold, 'summary': rangkuman per (varian, model)}.
+
+    Raises
+    ------
+    ValueError
+        Jika tidak ada store, model tidak dikenal, atau urutan subjek antarstore berbeda.
+    Exception
+        Jika terjadi kesalahan lain selama proses.
+    """
+    try:
+        stores, subjects = prepare_stores(stores, model_names)
+        variants = list(stores)
+
+        folds_path = os.path.join(output_dir, FOLDS_FILE) if output_dir is not None else None
+        folds = compute_fold_indices(len(subjects), n_splits, random_state, folds_path)
+
+        jobs = [
+            {'variant': variant, 'store_dir': stores[variant], 'model': model_name, 'fold': fold,
+             'train_index': train_index, 'test_index': test_index, 'epochs': epochs,
+             'batch_size': batch_size, 'learning_rate': learning_rate, 'seed': random_state,
+             'model_options': dict(model_options or {})}
+            for variant in variants
+            for model_name in model_names
+            for fold, (train_index, test_index) in enumerate(folds)
+        ]
+
+        logger.info(f"Cross-validation: {len(variants)} varian x {len(model_names)} model x {n_splits} fold = "
+                    f"{len(jobs)} pekerjaan")
+        start = time.perf_counter()
+        records = run_jobs(jobs, cpu_budget=cpu_budget, max_workers=max_workers)
+
+        summary = summarize_cv(records)
+        logger.info(f"Cross-validation selesai dalam {time.perf_counter() - start:.1f} s")
+        for row in summary:
+            logger.info(f"{row['variant']} / {row['model']}: "
+                        + ', '.join(f"{name} {row[f'{name}_mean']:.4f} ± {row[f'{name}_std']:.4f}"
+                                    for name in METRIC_NAMES))
+
+        if output_dir is not None:
+            save_cv_results(output_dir, records, summary)
+            logger.info(f"Hasil cross-validation disimpan ke {output_dir}")
+        return {'folds': records, 'summary': summary}
+
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan selama cross-validation: {e}")
+        raise
+
+if __name__ == "__main__":
+    import argparse
+    from src.utils.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="K-Fold cross-validation paralel untuk semua varian dataset store.")
+    parser.add_argument('--store_dir', default='./data/processed/dataset_store/',
+                        help="Direktori dasar dataset store per varian, atau satu direktori store.")
+    parser.add_argument('--models', nargs='+', default=['model1'], choices=sorted(MODEL_MODULES))
+    parser.add_argument('--n_splits', type=int, default=5)
+    parser.add_argument('--epochs', type=int, default=200)
+    parser.add_argument('--batch_size', type=int, default=32)
+    parser.add_argument('--learning_rate', type=float, default=1e-4)
+    parser.add_argument('--cpu_budget', type=int, default=None, help="Jumlah core CPU yang boleh digunakan.")
+    parser.add_argument('--max_workers', type=int, default=None, help="Jumlah proses worker.")
+    parser.add_argument('--output_dir', default='./results/cross_validation/')
+    parser.add_argument('--shared_trunk', action='store_true',
+                        help="Satu tower konvolusi bersama untuk citra kiri dan kanan (model1-model3).")
+    parser.add_argument('--global_pooling', default=None, choices=['avg', 'max'],
+                        help="Global pooling sebagai pengganti Flatten (model1-model3).")
+    parser.add_argument('--rescale_input', action='store_true',
+                        help="Normalisasi citra di dalam model (layer Rescaling) sehingga batch tetap uint8.")
+    parser.add_argument('--verbose', action='store_true', help="Menulis log level DEBUG.")
+    args = parser.parse_args()
+    configure_logging(verbose=args.verbose)
+
+    cross_validate(args.store_dir, model_names=args.models, n_splits=args.n_splits, epochs=args.epochs,
+                   batch_size=args.batch_size, learning_rate=args.learning_rate, cpu_budget=args.cpu_budget,
+                   max_workers=args.max_workers, output_dir=args.output_dir,
+                   model_options=model_options_from_args(args))
\ No newline at end of file
@@ -1,6 +1,21 @@
-from .image_enhancement import (
-    posterize_image, 
-    solarize_image, 
-    clahe_image, 
-    adjust_gamma_image
-    )
\ No newline at end of file
+from .helpers import lazy_exports
+
+# image_enhancement (OpenCV) diimpor saat fungsinya pertama kali diakses
+__getattr__, __dir__ = lazy_exports(__name__, globals(), {
+    'posterize_image': '.image_enhancement',
+    'solarize_image': '.image_enhancement',
+    'clahe_image': '.image_enhancement',
+    'get_clahe': '.image_enhancement',
+    'clahe_matrix': '.image_enhancement',
+    'adjust_gamma_image': '.image_enhancement',
+    'get_lut': '.image_enhancement',
+    'compose_luts': '.image_enhancement',
+    'get_lut_chain': '.image_enhancement',
+    'apply_lut_chain': '.image_enhancement',
+    'apply_enhancement_chain': '.image_enhancement',
+    'apply_lut_batch': '.image_enhancement',
+    'posterize_batch': '.image_enhancement',
+    'solarize_batch': '.image_enhancement',
+    'clahe_batch': '.image_enhancement',
+    'adjust_gamma_batch': '.image_enhancement',
+})
\ No newline at end of file
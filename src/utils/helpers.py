@@ -0,0 +1,34 @@
+# src/utils/helpers.py
+
+import importlib
+
+def lazy_exports(package_name, package_globals, exports):
+    """
+    Membuat __getattr__ dan __dir__ (PEP 562) agar package mengimpor modul ekspornya saat atribut pertama kali diakses.
+
+    Parameters
+    ----------
+    package_name : str
+        Nama package (isi __name__ di __init__.py).
+    package_globals : dict
+        globals() package; atribut yang sudah dimuat disimpan di sini sehingga hanya diimpor sekali.
+    exports : dict
+        Pemetaan nama atribut ke modul relatif yang memuatnya, misalnya {'organize_images': '.data_loader'}.
+
+    Returns
+    -------
+    __getattr__, __dir__ : callable
+        Fungsi untuk didefinisikan di tingkat modul package.
+    """
+    def __getattr__(name):
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package_name), name)
+        package_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(package_globals) | set(exports))
+
+    return __getattr__, __dir__
\ No newline at end of file
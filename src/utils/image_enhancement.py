@@ -3,6 +3,8 @@
 import cv2
 import numpy as np
 import logging
+import threading
+from functools import lru_cache
 
 logger = logging.getLogger('src.utils.image_enhancement')
 
@@ -11,6 +13,8 @@ def posterize_image(image, bits):
     Menerapkan efek posterize pada citra.
     """
     try:
+        if image.dtype == np.uint8:
+            return cv2.LUT(image, get_lut('Posterize', bits=bits))
         factor = 2 ** (8 - bits)
         posterized_image = (image // factor) * factor
         return posterized_image
@@ -23,40 +27,308 @@ def solarize_image(image, threshold):
     Menerapkan efek solarize pada citra.
     """
     try:
+        if image.dtype == np.uint8:
+            return cv2.LUT(image, get_lut('Solarize', threshold=threshold))
         solarized_image = np.where(image < threshold, image, 255 - image)
         return solarized_image.astype(np.uint8)
     except Exception as e:
         logger.error(f"Error in solarize_image: {e}")
         raise
 
+# Instance CLAHE disimpan per thread karena objek cv2.CLAHE tidak thread-safe
+_clahe_local = threading.local()
+
+def get_clahe(clip_limit, tile_grid_size):
+    """
+    Mengambil objek cv2.CLAHE untuk (clip_limit, tile_grid_size); dibuat sekali per thread lalu dipakai ulang.
+    """
+    instances = getattr(_clahe_local, 'instances', None)
+    if instances is None:
+        instances = _clahe_local.instances = {}
+    key = (float(clip_limit), tuple(tile_grid_size))
+    clahe = instances.get(key)
+    if clahe is None:
+        clahe = cv2.createCLAHE(clipLimit=key[0], tileGridSize=key[1])
+        instances[key] = clahe
+    return clahe
+
 def clahe_image(image, clip_limit, tile_grid_size):
     """
     Menerapkan CLAHE pada citra.
+
+    Citra BGR diproses pada channel L ruang warna LAB. Citra satu channel (H, W) bertipe
+    uint8/uint16, misalnya plane grayscale, diproses langsung tanpa konversi ruang warna.
     """
     try:
-        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
+        clahe = get_clahe(clip_limit, tile_grid_size)
+        if image.ndim == 2:
+            return clahe.apply(image)
 
-        clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid_size)
-        cl = clahe.apply(l)
-
-        limg = cv2.merge((cl, a, b))
-        final_image = cv2.cvtColor(limg, cv2.COLOR_LAB2BGR)
+        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+        cl = clahe.apply(cv2.extractChannel(lab, 0))
+        cv2.insertChannel(cl, lab, 0)
+        final_image = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
         return final_image
     except Exception as e:
         logger.error(f"Error in clahe_image: {e}")
         raise
 
+def clahe_matrix(matrix, clip_limit, tile_grid_size, value_range=None):
+    """
+    Menerapkan CLAHE langsung pada matriks suhu satu channel (float).
+
+    Parameters
+    ----------
+    matrix : numpy.ndarray
+        Matriks suhu berbentuk (H, W).
+    clip_limit : float
+        Batas clip CLAHE.
+    tile_grid_size : tuple of int
+        Ukuran grid tile CLAHE.
+    value_range : tuple of float, optional
+        Rentang (min, max) suhu untuk kuantisasi ke uint16. Default: min dan max matriks.
+
+    Returns
+    -------
+    equalized : numpy.ndarray
+        Matriks float32 hasil CLAHE dalam satuan yang sama dengan input.
+    """
+    try:
+        matrix = np.asarray(matrix, dtype=np.float32)
+        low, high = value_range if value_range is not None else (float(matrix.min()), float(matrix.max()))
+        scale = (high - low) / 65535.0 if high > low else 1.0
+        quantized = np.clip((matrix - low) / scale, 0, 65535).astype(np.uint16)
+        equalized = get_clahe(clip_limit, tile_grid_size).apply(quantized)
+        return equalized.astype(np.float32) * scale + low
+    except Exception as e:
+        logger.error(f"Error in clahe_matrix: {e}")
+        raise
+
 def adjust_gamma_image(image, gamma):
     """
     Menerapkan gamma adjustment pada citra.
     """
     try:
-        inv_gamma = 1.0 / gamma if gamma != 0 else 0
-        table = np.array([((i / 255.0) ** inv_gamma) * 255
-                          for i in np.arange(256)]).astype("uint8")
+        table = get_lut('Gamma', gamma=gamma)
         adjusted_image = cv2.LUT(image, table)
         return adjusted_image
     except Exception as e:
         logger.error(f"Error in adjust_gamma_image: {e}")
+        raise
+
+# --- Tabel lookup 256 entri untuk operasi point-wise ---
+
+def _posterize_table(bits):
+    factor = 2 ** (8 - bits)
+    return ((np.arange(256) // factor) * factor).astype(np.uint8)
+
+def _solarize_table(threshold):
+    values = np.arange(256)
+    return np.where(values < threshold, values, 255 - values).astype(np.uint8)
+
+def _gamma_table(gamma):
+    inv_gamma = 1.0 / gamma if gamma != 0 else 0
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        return np.array([((i / 255.0) ** inv_gamma) * 255
+                         for i in np.arange(256)]).astype("uint8")
+
+# Registry pembangun tabel untuk setiap teknik point-wise (nama sama dengan DEFAULT_ENHANCEMENTS)
+LUT_BUILDERS = {
+    'Posterize': _posterize_table,
+    'Solarize': _solarize_table,
+    'Gamma': _gamma_table,
+}
+
+def _params_key(params):
+    return tuple(sorted(params.items()))
+
+@lru_cache(maxsize=None)
+def _cached_lut(technique, params_key):
+    if technique not in LUT_BUILDERS:
+        raise KeyError(f"Teknik {technique} bukan operasi point-wise yang terdaftar: {list(LUT_BUILDERS)}")
+    table = LUT_BUILDERS[technique](**dict(params_key))
+    # Tabel dibagikan antar pemanggil sehingga dibuat read-only
+    table.flags.writeable = False
+    return table
+
+def get_lut(technique, **params):
+    """
+    Mengambil tabel lookup 256 entri untuk (technique, parameters); tabel dibangun sekali lalu di-memoize.
+
+    Parameters
+    ----------
+    technique : str
+        Nama teknik point-wise ('Posterize', 'Solarize', atau 'Gamma').
+    **params
+        Parameter teknik, misalnya bits=3, threshold=128, atau gamma=1.5.
+
+    Returns
+    -------
+    table : numpy.ndarray
+        Tabel lookup uint8 read-only berukuran 256.
+    """
+    return _cached_lut(technique, _params_key(params))
+
+def compose_luts(*tables):
+    """
+    Menggabungkan beberapa tabel lookup menjadi satu tabel; tabel pertama diterapkan lebih dulu.
+    """
+    if not tables:
+        raise ValueError("Minimal satu tabel lookup diperlukan.")
+    composed = tables[0]
+    for table in tables[1:]:
+        composed = table[composed]
+    return composed.astype(np.uint8, copy=False)
+
+@lru_cache(maxsize=None)
+def _cached_lut_chain(steps_key):
+    composed = compose_luts(*[_cached_lut(technique, params_key) for technique, params_key in steps_key])
+    composed.flags.writeable = False
+    return composed
+
+def get_lut_chain(steps):
+    """
+    Mengambil satu tabel lookup hasil komposisi rangkaian operasi point-wise (di-memoize).
+
+    Parameters
+    ----------
+    steps : sequence of tuple
+        Rangkaian (technique, params) sesuai urutan penerapan,
+        misalnya [('Gamma', {'gamma': 1.5}), ('Posterize', {'bits': 3})].
+
+    Returns
+    -------
+    table : numpy.ndarray
+        Tabel lookup uint8 read-only berukuran 256.
+    """
+    return _cached_lut_chain(tuple((technique, _params_key(params)) for technique, params in steps))
+
+def apply_lut_chain(image, steps):
+    """
+    Menerapkan rangkaian operasi point-wise pada citra uint8 dalam satu pass cv2.LUT.
+    """
+    try:
+        return cv2.LUT(image, get_lut_chain(steps))
+    except Exception as e:
+        logger.error(f"Error in apply_lut_chain: {e}")
+        raise
+
+def apply_enhancement_chain(image, steps):
+    """
+    Menerapkan rangkaian image enhancement (termasuk CLAHE) pada citra BGR uint8.
+
+    Operasi point-wise yang berurutan digabung menjadi satu tabel lookup; CLAHE diterapkan dengan clahe_image.
+
+    Parameters
+    ----------
+    image : numpy.ndarray
+        Citra BGR uint8 (H, W, 3).
+    steps : sequence of tuple
+        Rangkaian (technique, params), misalnya [('CLAHE', {'clip_limit': 2.0, 'tile_grid_size': (8, 8)})].
+
+    Returns
+    -------
+    image : numpy.ndarray
+        Citra hasil enhancement.
+    """
+    pending = []
+    for technique, params in steps:
+        if technique in LUT_BUILDERS:
+            pending.append((technique, dict(params)))
+            continue
+        if technique != 'CLAHE':
+            raise KeyError(f"Teknik {technique} tidak dikenal: {list(LUT_BUILDERS) + ['CLAHE']}")
+        if pending:
+            image = apply_lut_chain(image, pending)
+            pending = []
+        image = clahe_image(image, params['clip_limit'], tuple(params['tile_grid_size']))
+    if pending:
+        image = apply_lut_chain(image, pending)
+    return image
+
+# --- API batch untuk stack citra NxHxWxC uint8 ---
+
+def _prepare_batch(images, out):
+    """
+    Memvalidasi stack citra dan menyiapkan array output (dialokasikan jika out tidak diberikan).
+    """
+    if not isinstance(images, np.ndarray) or images.ndim != 4 or images.dtype != np.uint8:
+        raise ValueError("images harus berupa array uint8 berbentuk (N, H, W, C).")
+    images = np.ascontiguousarray(images)
+    if out is None:
+        out = np.empty_like(images)
+    elif out.shape != images.shape or out.dtype != np.uint8 or not out.flags['C_CONTIGUOUS']:
+        raise ValueError(f"out harus berupa array uint8 C-contiguous berbentuk {images.shape}.")
+    return images, out
+
+def apply_lut_batch(images, table, out=None):
+    """
+    Menerapkan tabel lookup 256 entri pada seluruh stack citra dalam satu pemanggilan cv2.LUT.
+
+    Parameters
+    ----------
+    images : numpy.ndarray
+        Stack citra uint8 berbentuk (N, H, W, C).
+    table : numpy.ndarray
+        Tabel lookup uint8 berukuran 256.
+    out : numpy.ndarray, optional
+        Array output yang telah dialokasikan sebelumnya (bentuk dan dtype sama dengan images).
+
+    Returns
+    -------
+    out : numpy.ndarray
+        Stack citra hasil, berbentuk (N, H, W, C).
+    """
+    images, out = _prepare_batch(images, out)
+    if images.size == 0:
+        return out
+    # Stack diperlakukan sebagai satu matriks 2-D satu channel sehingga tidak ada loop per citra
+    n, h, w, c = images.shape
+    cv2.LUT(images.reshape(n * h, w * c), table, dst=out.reshape(n * h, w * c))
+    return out
+
+def posterize_batch(images, bits, out=None):
+    """
+    Menerapkan efek posterize pada stack citra (N, H, W, C).
+    """
+    try:
+        return apply_lut_batch(images, get_lut('Posterize', bits=bits), out=out)
+    except Exception as e:
+        logger.error(f"Error in posterize_batch: {e}")
+        raise
+
+def solarize_batch(images, threshold, out=None):
+    """
+    Menerapkan efek solarize pada stack citra (N, H, W, C).
+    """
+    try:
+        return apply_lut_batch(images, get_lut('Solarize', threshold=threshold), out=out)
+    except Exception as e:
+        logger.error(f"Error in solarize_batch: {e}")
+        raise
+
+def adjust_gamma_batch(images, gamma, out=None):
+    """
+    Menerapkan gamma adjustment pada stack citra (N, H, W, C).
+    """
+    try:
+        return apply_lut_batch(images, get_lut('Gamma', gamma=gamma), out=out)
+    except Exception as e:
+        logger.error(f"Error in adjust_gamma_batch: {e}")
+        raise
+
+def clahe_batch(images, clip_limit, tile_grid_size, out=None):
+    """
+    Menerapkan CLAHE pada stack citra BGR (N, H, W, 3).
+
+    CLAHE bergantung pada histogram lokal sehingga tetap diproses per citra,
+    namun hasilnya ditulis langsung ke array output.
+    """
+    try:
+        images, out = _prepare_batch(images, out)
+        for i in range(images.shape[0]):
+            out[i] = clahe_image(images[i], clip_limit, tile_grid_size)
+        return out
+    except Exception as e:
+        logger.error(f"Error in clahe_batch: {e}")
         raise
\ No newline at end of file
@@ -0,0 +1,161 @@
+# src/utils/image_sizes.py
+
+import os
+import json
+import struct
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+logger = logging.getLogger('src.utils.image_sizes')
+
+SIZE_INDEX_VERSION = 1
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff')
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def read_image_size(path):
+    """
+    Membaca ukuran (width, height) gambar tanpa mendekode piksel.
+
+    Untuk PNG hanya 24 byte pertama (signature dan chunk IHDR) yang dibaca; format lain
+    menggunakan PIL yang juga hanya membaca header.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if header[:8] == PNG_SIGNATURE and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+
+    from PIL import Image
+
+    with Image.open(path) as img:
+        return img.width, img.height
+
+def collect_image_paths(directories):
+    """
+    Mengumpulkan jalur semua file gambar di dalam direktori-direktori (termasuk subdirektori).
+    """
+    paths = []
+    for base_dir in directories:
+        if not os.path.exists(base_dir):
+            logger.warning(f"Direktori {base_dir} tidak ditemukan, melewatkan direktori ini.")
+            continue
+        for root, dirs, files in os.walk(base_dir):
+            dirs.sort()
+            paths.extend(
+                os.path.join(root, fname)
+                for fname in sorted(files)
+                if fname.lower().endswith(IMAGE_EXTENSIONS)
+            )
+    return paths
+
+def _load_size_index(index_path):
+    if index_path is None or not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == SIZE_INDEX_VERSION:
+            return data.get('entries', {})
+        logger.warning(f"Versi index ukuran {index_path} tidak cocok, membangun ulang dari awal.")
+    except (OSError, ValueError) as e:
+        logger.warning(f"Index ukuran {index_path} tidak dapat dibaca ({e}), membangun ulang dari awal.")
+    return {}
+
+def _save_size_index(index_path, entries):
+    index_dir = os.path.dirname(os.path.abspath(index_path))
+    os.makedirs(index_dir, exist_ok=True)
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': SIZE_INDEX_VERSION, 'entries': entries}, f)
+    os.replace(tmp_path, index_path)
+
+def scan_image_sizes(directories, size_index=None, num_workers=None):
+    """
+    Memindai ukuran semua gambar di direktori-direktori secara paralel dengan index ukuran persisten.
+
+    Parameters
+    ----------
+    directories : list of str
+        Daftar jalur direktori yang berisi gambar-gambar.
+    size_index : str, optional
+        Jalur file index JSON. Gambar yang ukuran file dan mtime-nya tidak berubah
+        diambil dari index tanpa membuka file-nya.
+    num_workers : int, optional
+        Jumlah thread untuk membaca header. Default: min(32, jumlah core CPU + 4).
+
+    Returns
+    -------
+    sizes : dict
+        Pemetaan jalur gambar ke (width, height), terurut sesuai jalur.
+    """
+    paths = collect_image_paths(directories)
+    index_dir = os.path.dirname(os.path.abspath(size_index)) if size_index is not None else None
+    entries = _load_size_index(size_index)
+
+    def _key(path):
+        return os.path.relpath(os.path.abspath(path), index_dir) if index_dir is not None else path
+
+    def _scan(path):
+        stat = os.stat(path)
+        entry = entries.get(_key(path))
+        if entry is not None and entry['mtime_ns'] == stat.st_mtime_ns and entry['file_size'] == stat.st_size:
+            return entry, False
+        width, height = read_image_size(path)
+        return {'mtime_ns': stat.st_mtime_ns, 'file_size': stat.st_size, 'width': width, 'height': height}, True
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        results = list(executor.map(_scan, paths))
+
+    sizes = {}
+    n_read = 0
+    for path, (entry, was_read) in zip(paths, results):
+        sizes[path] = (entry['width'], entry['height'])
+        entries[_key(path)] = entry
+        n_read += was_read
+    logger.debug(f"Memindai {len(paths)} gambar, {n_read} header dibaca, {len(paths) - n_read} dari index")
+
+    if size_index is not None and n_read:
+        # Entri untuk file yang sudah tidak ada dibuang agar index tidak terus membesar
+        entries = {
+            key: entry for key, entry in entries.items()
+            if os.path.exists(os.path.join(index_dir, key))
+        }
+        _save_size_index(size_index, entries)
+    return sizes
+
+def image_size_stats(sizes, percentiles=(5, 25, 50, 75, 95), bins=10):
+    """
+    Menghitung statistik ukuran gambar: rata-rata, median, persentil, dan histogram.
+
+    Parameters
+    ----------
+    sizes : dict or list of tuple
+        Hasil scan_image_sizes atau daftar (width, height).
+    percentiles : tuple of int, optional
+        Persentil yang dihitung.
+    bins : int, optional
+        Jumlah bin histogram.
+
+    Returns
+    -------
+    stats : dict
+        {'count', 'width', 'height'}; 'width' dan 'height' masing-masing berisi 'mean', 'median',
+        'min', 'max', 'percentiles' ({p: nilai}), dan 'histogram' ({'counts', 'edges'}).
+    """
+    values = np.asarray(list(sizes.values()) if isinstance(sizes, dict) else list(sizes), dtype=np.float64)
+    if values.size == 0:
+        raise ValueError("Tidak ada ukuran gambar untuk dihitung statistiknya.")
+
+    stats = {'count': int(values.shape[0])}
+    for axis, name in enumerate(['width', 'height']):
+        column = values[:, axis]
+        counts, edges = np.histogram(column, bins=bins)
+        stats[name] = {
+            'mean': float(np.mean(column)),
+            'median': float(np.median(column)),
+            'min': int(column.min()),
+            'max': int(column.max()),
+            'percentiles': {int(p): float(v) for p, v in zip(percentiles, np.percentile(column, percentiles))},
+            'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()},
+        }
+    return stats
\ No newline at end of file
@@ -0,0 +1,188 @@
+# src/utils/instrumentation.py
+
+import os
+import json
+import time
+import copy
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger('src.utils.instrumentation')
+
+METRIC_PREFIX = 'termogram_pipeline'
+
+def _empty_stage():
+    return {'runs': 0, 'wall_time': 0.0, 'files': 0, 'skipped': 0, 'bytes_read': 0, 'bytes_written': 0, 'phases': {}}
+
+class PipelineMetrics:
+    """
+    Pencatat waktu dan counter per tahap pipeline data (thread-safe).
+
+    Setiap tahap (misalnya, 'resize') menyimpan total wall time, jumlah run, jumlah file yang diproses
+    dan dilewati, byte yang dibaca/ditulis, serta waktu per fase ('decode', 'compute', 'encode', ...).
+    Waktu fase adalah jumlah dari semua thread/proses worker sehingga dapat melebihi wall time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+
+    def _get_stage(self, name):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = _empty_stage()
+        return stage
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Mengukur wall time satu run tahap.
+        """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stage = self._get_stage(name)
+                stage['runs'] += 1
+                stage['wall_time'] += elapsed
+
+    @contextmanager
+    def phase(self, stage_name, phase_name):
+        """
+        Menambahkan waktu blok kode ke fase tertentu dari suatu tahap.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                phases = self._get_stage(stage_name)['phases']
+                phases[phase_name] = phases.get(phase_name, 0.0) + elapsed
+
+    def count(self, stage_name, files=0, skipped=0, bytes_read=0, bytes_written=0):
+        """
+        Menambahkan counter file dan byte untuk suatu tahap.
+        """
+        with self._lock:
+            stage = self._get_stage(stage_name)
+            stage['files'] += files
+            stage['skipped'] += skipped
+            stage['bytes_read'] += bytes_read
+            stage['bytes_written'] += bytes_written
+
+    def snapshot(self):
+        with self._lock:
+            return copy.deepcopy(self.stages)
+
+    def pop_snapshot(self):
+        """
+        Mengambil isi pencatat lalu mengosongkannya (dipakai worker proses untuk mengirim hasil ke proses utama).
+        """
+        with self._lock:
+            stages, self.stages = self.stages, {}
+            return stages
+
+    def merge(self, stages):
+        """
+        Menjumlahkan snapshot dari pencatat lain (misalnya, dari worker proses).
+        """
+        with self._lock:
+            for name, other in stages.items():
+                stage = self._get_stage(name)
+                for key in ('runs', 'wall_time', 'files', 'skipped', 'bytes_read', 'bytes_written'):
+                    stage[key] += other[key]
+                for phase_name, seconds in other['phases'].items():
+                    stage['phases'][phase_name] = stage['phases'].get(phase_name, 0.0) + seconds
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+
+    def summary(self, stage_name=None):
+        """
+        Ringkasan satu baris per tahap: file, wall time, throughput, byte, dan waktu per fase.
+        """
+        stages = self.snapshot()
+        names = [stage_name] if stage_name is not None else sorted(stages)
+        lines = []
+        for name in names:
+            stage = stages.get(name, _empty_stage())
+            rate = stage['files'] / stage['wall_time'] if stage['wall_time'] > 0 else 0.0
+            phases = ', '.join(f"{phase} {seconds:.2f} s" for phase, seconds in sorted(stage['phases'].items()))
+            lines.append(
+                f"{name} ({stage['runs']} run): {stage['files']} file ({stage['skipped']} dilewati) "
+                f"dalam {stage['wall_time']:.2f} s ({rate:.1f} file/s), baca {stage['bytes_read'] / 1e6:.1f} MB, tulis {stage['bytes_written'] / 1e6:.1f} MB"
+                + (f", {phases}" if phases else '')
+            )
+        return '\n'.join(lines)
+
+    def dump_json(self, path):
+        """
+        Menyimpan seluruh metrik ke file JSON.
+        """
+        _atomic_write(path, json.dumps(self.snapshot(), indent=2, sort_keys=True))
+
+    def to_prometheus(self):
+        """
+        Format teks Prometheus (exposition format) untuk semua tahap.
+        """
+        stages = self.snapshot()
+        metrics = [
+            ('runs_total', 'runs', 'Jumlah run tahap pipeline.'),
+            ('wall_seconds_total', 'wall_time', 'Total wall time tahap pipeline dalam detik.'),
+            ('files_total', 'files', 'Jumlah file yang diproses.'),
+            ('skipped_total', 'skipped', 'Jumlah file yang dilewati karena masih valid.'),
+            ('read_bytes_total', 'bytes_read', 'Jumlah byte yang dibaca.'),
+            ('written_bytes_total', 'bytes_written', 'Jumlah byte yang ditulis.'),
+        ]
+        lines = []
+        for suffix, key, help_text in metrics:
+            lines.append(f"# HELP {METRIC_PREFIX}_{suffix} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{suffix} counter")
+            for name in sorted(stages):
+                lines.append(f'{METRIC_PREFIX}_{suffix}{{stage="{name}"}} {stages[name][key]}')
+        lines.append(f"# HELP {METRIC_PREFIX}_phase_seconds_total Total waktu per fase tahap pipeline dalam detik.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_phase_seconds_total counter")
+        for name in sorted(stages):
+            for phase, seconds in sorted(stages[name]['phases'].items()):
+                lines.append(f'{METRIC_PREFIX}_phase_seconds_total{{stage="{name}",phase="{phase}"}} {seconds}')
+        return '\n'.join(lines) + '\n'
+
+    def dump_prometheus(self, path):
+        """
+        Menyimpan metrik sebagai textfile Prometheus (misalnya, untuk textfile collector node_exporter).
+        """
+        _atomic_write(path, self.to_prometheus())
+
+def _atomic_write(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+# Pencatat global yang dipakai modul-modul pipeline
+_metrics = PipelineMetrics()
+
+def get_metrics():
+    """
+    Mengembalikan pencatat metrik global pipeline.
+    """
+    return _metrics
+
+def dump_metrics(json_path=None, prometheus_path=None):
+    """
+    Mencatat ringkasan metrik global ke log dan, jika diminta, menyimpannya sebagai JSON dan/atau textfile Prometheus.
+    """
+    summary = _metrics.summary()
+    if summary:
+        logger.info(f"Ringkasan metrik pipeline:\n{summary}")
+    if json_path is not None:
+        _metrics.dump_json(json_path)
+    if prometheus_path is not None:
+        _metrics.dump_prometheus(prometheus_path)
\ No newline at end of file
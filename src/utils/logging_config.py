@@ -0,0 +1,67 @@
+# src/utils/logging_config.py
+
+import os
+import logging
+import logging.config
+import threading
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DEFAULT_CONFIG_PATH = os.path.join(PROJECT_ROOT, 'configs', 'logging.conf')
+DEFAULT_LOG_DIR = os.path.join(PROJECT_ROOT, 'logs')
+
+_lock = threading.Lock()
+_configured = False
+
+def configure_logging(config_path=None, log_dir=None, verbose=False, force=False):
+    """
+    Mengatur logging dari 'configs/logging.conf' sekali per proses.
+
+    Jalur konfigurasi dan direktori log diselesaikan dari root proyek sehingga dapat dipanggil
+    dari direktori kerja mana pun. Pemanggilan berikutnya tidak melakukan apa-apa kecuali force=True.
+
+    Parameters
+    ----------
+    config_path : str, optional
+        Jalur file konfigurasi logging. Default: '<root proyek>/configs/logging.conf'.
+    log_dir : str, optional
+        Direktori file log, menggantikan '%(logdir)s' di konfigurasi. Default: '<root proyek>/logs'.
+    verbose : bool, optional
+        Menurunkan level logger 'src.*' dan handler-nya ke DEBUG, sehingga log per file ikut ditulis.
+    force : bool, optional
+        Mengatur ulang logging meskipun sudah pernah dikonfigurasi.
+
+    Returns
+    -------
+    configured : bool
+        True jika konfigurasi diterapkan pada pemanggilan ini.
+    """
+    global _configured
+    with _lock:
+        if _configured and not force:
+            return False
+
+        config_path = config_path or DEFAULT_CONFIG_PATH
+        log_dir = os.path.abspath(log_dir or DEFAULT_LOG_DIR)
+        os.makedirs(log_dir, exist_ok=True)
+        # Nilai defaults diinterpolasi configparser dan jalurnya dievaluasi sebagai literal Python
+        logdir = log_dir.replace('\\', '/').replace('%', '%%')
+        # Logger modul yang sudah dibuat sebelum konfigurasi tetap aktif
+        logging.config.fileConfig(config_path, defaults={'logdir': logdir}, disable_existing_loggers=False)
+
+        if verbose:
+            for name, logger in list(logging.Logger.manager.loggerDict.items()):
+                if name.startswith('src') and isinstance(logger, logging.Logger):
+                    logger.setLevel(logging.DEBUG)
+                    # Handler konsol tetap pada levelnya agar terminal tidak dibanjiri log per file
+                    for handler in logger.handlers:
+                        if isinstance(handler, logging.FileHandler):
+                            handler.setLevel(logging.DEBUG)
+
+        _configured = True
+        return True
+
+def is_logging_configured():
+    """
+    Mengembalikan True jika configure_logging sudah diterapkan di proses ini.
+    """
+    return _configured
\ No newline at end of file
@@ -0,0 +1,170 @@
+# src/utils/manifest.py
+
+import os
+import json
+import hashlib
+import logging
+
+logger = logging.getLogger('src.utils.manifest')
+
+MANIFEST_VERSION = 1
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Menghitung hash isi file (BLAKE2b 128-bit) dalam bentuk heksadesimal.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def params_key(params):
+    """
+    Serialisasi parameter operasi secara deterministik (tuple disimpan sebagai list).
+    """
+    return json.dumps(params, sort_keys=True, default=str)
+
+class BuildManifest:
+    """
+    Manifest persisten untuk build inkremental berbasis konten.
+
+    Setiap file output dicatat bersama kunci yang dibentuk dari hash isi file input,
+    nama operasi, dan parameternya. Output dianggap masih valid jika kuncinya sama
+    dan file output masih ada, sehingga pemrosesan ulang hanya dilakukan untuk
+    file input baru/berubah atau parameter baru. Hash file input di-memoize per
+    (ukuran, mtime) agar file yang tidak berubah tidak perlu dibaca ulang.
+
+    Parameters
+    ----------
+    path : str
+        Jalur file manifest JSON (misalnya, 'data/processed/.build_manifest.json').
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.base_dir = os.path.dirname(self.path)
+        self.inputs = {}
+        self.outputs = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.inputs = data.get('inputs', {})
+                    self.outputs = data.get('outputs', {})
+                else:
+                    logger.warning(f"Versi manifest {self.path} tidak cocok, membangun ulang dari awal.")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Manifest {self.path} tidak dapat dibaca ({e}), membangun ulang dari awal.")
+
+    @classmethod
+    def open(cls, manifest):
+        """
+        Mengembalikan BuildManifest dari objek manifest, jalur file, atau None.
+        """
+        if manifest is None or isinstance(manifest, cls):
+            return manifest
+        return cls(manifest)
+
+    def _key_path(self, path):
+        return os.path.relpath(os.path.abspath(path), self.base_dir)
+
+    def _abs_path(self, key_path):
+        return os.path.normpath(os.path.join(self.base_dir, key_path))
+
+    def input_hash(self, input_path):
+        """
+        Mengambil hash isi file input, dihitung ulang hanya jika ukuran atau mtime berubah.
+        """
+        stat = os.stat(input_path)
+        key = self._key_path(input_path)
+        cached = self.inputs.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['hash']
+        digest = file_digest(input_path)
+        self.inputs[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest}
+        return digest
+
+    def build_key(self, input_path, operation, params):
+        """
+        Membentuk kunci konten dari hash input, nama operasi, dan parameter.
+        """
+        return f"{self.input_hash(input_path)}:{operation}:{params_key(params)}"
+
+    def is_fresh(self, output_path, input_path, operation, params):
+        """
+        Memeriksa apakah output masih valid untuk input, operasi, dan parameter yang diberikan.
+        """
+        entry = self.outputs.get(self._key_path(output_path))
+        return (
+            entry is not None
+            and entry['key'] == self.build_key(input_path, operation, params)
+            and os.path.exists(output_path)
+        )
+
+    def record(self, output_path, input_path, operation, params):
+        """
+        Mencatat output yang baru saja ditulis.
+        """
+        self.outputs[self._key_path(output_path)] = {
+            'key': self.build_key(input_path, operation, params),
+            'operation': operation,
+        }
+
+    def evict_stale(self, output_root, operation_prefix, keep):
+        """
+        Menghapus output tercatat di bawah output_root dengan operasi berawalan operation_prefix
+        yang tidak lagi termasuk dalam himpunan keep (misalnya karena parameternya dihapus dari konfigurasi).
+
+        Parameters
+        ----------
+        output_root : str
+            Direktori dasar output yang dikelola.
+        operation_prefix : str
+            Awalan nama operasi yang dikelola (misalnya, 'enhance/').
+        keep : iterable of str
+            Jalur output yang masih diharapkan dari konfigurasi saat ini.
+
+        Returns
+        -------
+        n_evicted : int
+            Jumlah output yang dihapus.
+        """
+        keep = {self._key_path(path) for path in keep}
+        root_dir = os.path.abspath(output_root)
+        n_evicted = 0
+        for key_path, entry in list(self.outputs.items()):
+            if not entry['operation'].startswith(operation_prefix) or key_path in keep:
+                continue
+            output_path = self._abs_path(key_path)
+            if not output_path.startswith(root_dir + os.sep):
+                continue
+            if os.path.exists(output_path):
+                os.remove(output_path)
+                self._remove_empty_parents(output_path, root_dir)
+            del self.outputs[key_path]
+            n_evicted += 1
+        if n_evicted:
+            logger.info(f"Menghapus {n_evicted} output usang di bawah {output_root}")
+        return n_evicted
+
+    @staticmethod
+    def _remove_empty_parents(path, stop_dir):
+        parent = os.path.dirname(path)
+        while parent.startswith(stop_dir + os.sep):
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break
+            parent = os.path.dirname(parent)
+
+    def save(self):
+        """
+        Menyimpan manifest secara atomik.
+        """
+        os.makedirs(self.base_dir, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'inputs': self.inputs, 'outputs': self.outputs}, f)
+        os.replace(tmp_path, self.path)
\ No newline at end of file
@@ -0,0 +1,63 @@
+# src/utils/metrics.py
+
+import logging
+import numpy as np
+
+logger = logging.getLogger('src.utils.metrics')
+
+METRIC_NAMES = ['accuracy', 'precision', 'recall', 'f1', 'auc']
+
+def classification_metrics(y_true, y_prob, threshold=0.5):
+    """
+    Menghitung accuracy, precision, recall, F1, dan ROC AUC untuk klasifikasi biner.
+
+    Parameters
+    ----------
+    y_true : array-like
+        Label sebenarnya (0 atau 1).
+    y_prob : array-like
+        Probabilitas kelas positif dari model.
+    threshold : float, optional
+        Ambang probabilitas untuk prediksi kelas positif.
+
+    Returns
+    -------
+    metrics : dict
+        {'accuracy', 'precision', 'recall', 'f1', 'auc'}; 'auc' bernilai NaN jika y_true hanya berisi satu kelas.
+    """
+    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+
+    y_true = np.asarray(y_true).astype(int).ravel()
+    y_prob = np.asarray(y_prob, dtype=np.float64).ravel()
+    y_pred = (y_prob > threshold).astype(int)
+
+    metrics = {
+        'accuracy': float(accuracy_score(y_true, y_pred)),
+        'precision': float(precision_score(y_true, y_pred, zero_division=0)),
+        'recall': float(recall_score(y_true, y_pred, zero_division=0)),
+        'f1': float(f1_score(y_true, y_pred, zero_division=0)),
+        'auc': float('nan'),
+    }
+    if len(np.unique(y_true)) > 1:
+        metrics['auc'] = float(roc_auc_score(y_true, y_prob))
+    else:
+        logger.warning("ROC AUC tidak terdefinisi karena data uji hanya berisi satu kelas.")
+    return metrics
+
+def summarize_metrics(records, metric_names=None):
+    """
+    Menghitung rata-rata dan simpangan baku setiap metrik dari beberapa fold (NaN diabaikan).
+
+    Returns
+    -------
+    summary : dict
+        Misalnya {'accuracy_mean': ..., 'accuracy_std': ..., ...}.
+    """
+    metric_names = metric_names or METRIC_NAMES
+    summary = {}
+    for name in metric_names:
+        values = np.asarray([record[name] for record in records], dtype=np.float64)
+        valid = values[~np.isnan(values)]
+        summary[f'{name}_mean'] = float(np.mean(valid)) if valid.size else float('nan')
+        summary[f'{name}_std'] = float(np.std(valid)) if valid.size else float('nan')
+    return summary
\ No newline at end of file
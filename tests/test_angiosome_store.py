@@ -0,0 +1,90 @@
+# tests/test_angiosome_store.py
+
+import os
+import sys
+import unittest
+import shutil
+import numpy as np
+import pandas as pd
+import cv2
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data import build_angiosome_store, load_dataset_store, create_store_dataset
+from src.data.angiosome_store import ANGIOSOMES, fit_patch
+from src.models import create_model1, create_model2, create_model3, create_model4
+
+# Box [x, y, width, height] setiap angiosom di frame 30 x 60
+BOXES = {'LCA': [2, 5, 10, 30], 'LPA': [0, 35, 30, 25], 'MCA': [15, 2, 8, 20], 'MPA': [20, 10, 6, 40]}
+
+
+class TestAngiosomeStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Data mentah dummy: delapan citra angiosom per subjek, hanya area angiosomnya yang tidak nol
+        cls.test_dir = 'tests/temp_angiosome_store'
+        cls.raw_dir = os.path.join(cls.test_dir, 'raw')
+        cls.data_tabular = pd.DataFrame({
+            'Subject': ['CG001', 'DM002', 'DM003'],
+            'Gender': ['M', 'F', 'M'],
+            'LCA_right': [33.0, 34.5, 35.0],
+            'LCA_left': [33.5, 34.0, 35.5],
+        })
+        for subject, gender in zip(cls.data_tabular['Subject'], cls.data_tabular['Gender']):
+            group = 'Control Group' if subject.startswith('CG') else 'DM Group'
+            sample_name = f'{subject}_{gender}'
+            angiosome_dir = os.path.join(cls.raw_dir, group, sample_name, 'Angiosoms')
+            os.makedirs(angiosome_dir, exist_ok=True)
+            for side in ['L', 'R']:
+                for k, (angiosome, (x, y, width, height)) in enumerate(BOXES.items()):
+                    # DM003 tidak memiliki patch MPA kaki kanan
+                    if subject == 'DM003' and side == 'R' and angiosome == 'MPA':
+                        continue
+                    image = np.zeros((60, 30, 3), dtype=np.uint8)
+                    image[y:y + height, x:x + width] = (10 * k + 50, 100 if side == 'L' else 200, 30)
+                    cv2.imwrite(os.path.join(angiosome_dir, f'{sample_name}_{side}_{angiosome}.png'), image)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def test_fit_patch_keeps_aspect_ratio(self):
+        image = np.full((40, 10, 3), 255, dtype=np.uint8)
+        patch = fit_patch(image, (16, 20))
+        self.assertEqual(patch.shape, (20, 16, 3))
+        # 10 x 40 diskalakan ke 5 x 20 di tengah patch, sisanya latar belakang 0
+        columns = np.flatnonzero(patch[..., 0].any(axis=0))
+        self.assertListEqual(columns.tolist(), [5, 6, 7, 8, 9])
+        self.assertTrue(patch[:, 5:10].all())
+
+    def test_build_store(self):
+        store_dir = os.path.join(self.test_dir, 'store')
+        index = build_angiosome_store(self.data_tabular, self.raw_dir, store_dir, patch_size=(24, 32), num_workers=2)
+        dataset = load_dataset_store(store_dir)
+        # DM003 dilewati karena patch-nya tidak lengkap
+        self.assertListEqual(dataset.subjects, ['CG001', 'DM002'])
+        self.assertEqual(dataset.left.shape, (2, 4, 32, 24, 3))
+        self.assertEqual(dataset.right.dtype, np.uint8)
+        self.assertListEqual(index['angiosomes'], list(ANGIOSOMES))
+        self.assertListEqual(index['boxes']['DM002']['R_MCA'], BOXES['MCA'])
+        # Patch berurutan sesuai ANGIOSOMES dengan warna RGB yang benar
+        for k in range(len(ANGIOSOMES)):
+            colors = dataset.left[0, k][dataset.left[0, k].any(axis=-1)]
+            self.assertTrue(np.all(colors == (30, 100, 10 * k + 50)))
+        self.assertTrue(np.all(dataset.right[1][..., 1][dataset.right[1].any(axis=-1)] == 200))
+
+        # Model menerima tumpukan patch sebagai pengganti citra penuh
+        inputs, _ = next(iter(create_store_dataset(dataset, batch_size=2)))
+        self.assertEqual(tuple(inputs['input_left'].shape), (2, 4, 32, 24, 3))
+        for create_model in [create_model1, create_model2, create_model3, create_model4]:
+            model = create_model((4, 32, 24, 3), len(dataset.features))
+            self.assertEqual(model.predict(inputs, verbose=0).shape, (2, 1))
+        model = create_model2((4, 32, 24, 3), len(dataset.features), shared_trunk=True, global_pooling='avg')
+        self.assertIsNotNone(model.get_layer('shared_patch_trunk'))
+        self.assertEqual(model.predict(inputs, verbose=0).shape, (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+# tests/test_apply_image_enhancement.py
+
+import os
+import sys
+import unittest
+import shutil
+import numpy as np
+import cv2
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.apply_image_enhancement import process_images, DEFAULT_ENHANCEMENTS
+from src.utils.instrumentation import get_metrics
+
+
+class TestApplyImageEnhancement(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Membuat struktur Left/Right dengan gambar dummy berpola acak
+        cls.test_input_dir = 'tests/temp_enhancement_input'
+        rng = np.random.default_rng(0)
+        for side, group in [('Left', 'CG Left'), ('Right', 'DM Right')]:
+            group_dir = os.path.join(cls.test_input_dir, side, group)
+            os.makedirs(group_dir, exist_ok=True)
+            for i in range(3):
+                image = rng.integers(0, 256, size=(40, 24, 3), dtype=np.uint8)
+                cv2.imwrite(os.path.join(group_dir, f'test_{i}_{side[0]}.png'), image)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_input_dir)
+        for output_dir in ['tests/temp_enhancement_sequential', 'tests/temp_enhancement_single_pass',
+                           'tests/temp_enhancement_incremental']:
+            if os.path.exists(output_dir):
+                shutil.rmtree(output_dir)
+
+    def _read_tree(self, base_dir):
+        tree = {}
+        for root, dirs, files in os.walk(base_dir):
+            for fname in files:
+                path = os.path.join(root, fname)
+                tree[os.path.relpath(path, base_dir)] = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        return tree
+
+    def test_single_pass_matches_sequential(self):
+        # Mode single-pass (dengan process pool) harus menghasilkan file yang identik dengan mode default
+        process_images(self.test_input_dir, 'tests/temp_enhancement_sequential')
+        get_metrics().reset()
+        process_images(self.test_input_dir, 'tests/temp_enhancement_single_pass', single_pass=True, num_workers=2)
+        # Metrik dari worker proses digabung ke pencatat proses utama
+        n_variants = sum(len(info['parameters']) for info in DEFAULT_ENHANCEMENTS.values())
+        enhance_metrics = get_metrics().snapshot()['enhance']
+        self.assertEqual(enhance_metrics['files'], n_variants * 6)
+        self.assertEqual(enhance_metrics['runs'], 1)
+        self.assertGreater(enhance_metrics['bytes_written'], 0)
+
+        sequential = self._read_tree('tests/temp_enhancement_sequential')
+        single_pass = self._read_tree('tests/temp_enhancement_single_pass')
+
+        self.assertEqual(len(sequential), n_variants * 6)
+        self.assertEqual(sorted(sequential), sorted(single_pass))
+        for rel_path, image in sequential.items():
+            np.testing.assert_array_equal(image, single_pass[rel_path])
+
+    def test_custom_enhancements(self):
+        # Hanya varian yang dikonfigurasi yang ditulis
+        enhancements = {'Solarize': DEFAULT_ENHANCEMENTS['Solarize']}
+        output_dir = 'tests/temp_enhancement_single_pass'
+        if os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+        process_images(self.test_input_dir, output_dir, enhancements=enhancements, single_pass=True, num_workers=1)
+        self.assertListEqual(os.listdir(output_dir), ['Solarize'])
+        self.assertListEqual(sorted(os.listdir(os.path.join(output_dir, 'Solarize'))), ['128', '192', '64'])
+
+    def _mtimes(self, base_dir):
+        return {
+            os.path.relpath(os.path.join(root, fname), base_dir): os.stat(os.path.join(root, fname)).st_mtime_ns
+            for root, dirs, files in os.walk(base_dir) for fname in files
+        }
+
+    def test_incremental_manifest(self):
+        output_dir = 'tests/temp_enhancement_incremental/output'
+        manifest_path = 'tests/temp_enhancement_incremental/manifest.json'
+        enhancements = {
+            'Posterize': {'function': DEFAULT_ENHANCEMENTS['Posterize']['function'], 'parameters': [{'bits': 1}, {'bits': 2}]},
+        }
+        for single_pass in [False, True]:
+            with self.subTest(single_pass=single_pass):
+                shutil.rmtree('tests/temp_enhancement_incremental', ignore_errors=True)
+                process_images(self.test_input_dir, output_dir, enhancements=enhancements,
+                               single_pass=single_pass, num_workers=1, manifest=manifest_path)
+                first = self._mtimes(output_dir)
+                self.assertEqual(len(first), 12)
+
+                # Run ulang tanpa perubahan tidak menulis ulang file apa pun
+                process_images(self.test_input_dir, output_dir, enhancements=enhancements,
+                               single_pass=single_pass, num_workers=1, manifest=manifest_path)
+                self.assertDictEqual(self._mtimes(output_dir), first)
+
+                # Output dari parameter yang dihapus dari konfigurasi ikut dihapus, parameter baru diproses
+                reduced = {'Posterize': dict(enhancements['Posterize'], parameters=[{'bits': 2}, {'bits': 3}])}
+                process_images(self.test_input_dir, output_dir, enhancements=reduced,
+                               single_pass=single_pass, num_workers=1, manifest=manifest_path)
+                self.assertListEqual(sorted(os.listdir(os.path.join(output_dir, 'Posterize'))), ['2', '3'])
+                third = self._mtimes(output_dir)
+                for rel_path, mtime in third.items():
+                    if rel_path.startswith(os.path.join('Posterize', '2')):
+                        self.assertEqual(mtime, first[rel_path])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+# tests/test_benchmarks.py
+
+import os
+import sys
+import unittest
+import tempfile
+# Menambahkan direktori proyek utama dan direktori benchmark ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'benchmarks'))
+from bench_preprocessing import run_benchmarks, compare_to_baseline, synthetic_thermograms, save_baseline, load_baseline
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_synthetic_thermograms(self):
+        images = synthetic_thermograms(2, 150, 60)
+        self.assertEqual(images.shape, (2, 150, 60, 3))
+        # Latar belakang di luar telapak kaki bernilai 0
+        self.assertTrue((images[:, 0, 0] == 0).all())
+        self.assertGreater(images.max(), 0)
+
+    def test_run_benchmarks_smoke(self):
+        results = run_benchmarks(['solarize_image', 'calculate_average'], repeats=1, scale=0.01, isolate=False)
+        self.assertListEqual(sorted(results), ['calculate_average[mixed]', 'solarize_image[103x41]',
+                                               'solarize_image[150x60]', 'solarize_image[200x88]',
+                                               'solarize_image[640x480]'])
+        for result in results.values():
+            self.assertGreater(result['images_per_sec'], 0)
+            self.assertGreater(result['peak_rss_mb'], 0)
+
+    def test_save_baseline_meta(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'baseline.json')
+            save_baseline({'a[1]': {'images_per_sec': 1.0, 'peak_rss_mb': 1.0}}, path, note='uji')
+            meta = load_baseline(path)['meta']
+        self.assertEqual(meta['note'], 'uji')
+        self.assertIn('git_commit', meta)
+        self.assertIn('processor', meta)
+
+    def test_compare_to_baseline(self):
+        baseline = {'results': {
+            'a[1]': {'images_per_sec': 100.0, 'peak_rss_mb': 100.0},
+            'b[1]': {'images_per_sec': 100.0, 'peak_rss_mb': 100.0},
+            'c[1]': {'images_per_sec': 100.0, 'peak_rss_mb': 100.0},
+        }}
+        results = {
+            'a[1]': {'images_per_sec': 90.0, 'peak_rss_mb': 105.0},
+            'b[1]': {'images_per_sec': 50.0, 'peak_rss_mb': 100.0},
+            'c[1]': {'images_per_sec': 100.0, 'peak_rss_mb': 200.0},
+            'd[1]': {'images_per_sec': 10.0, 'peak_rss_mb': 10.0},
+        }
+        status = {row['benchmark']: row['status'] for row in compare_to_baseline(results, baseline, tolerance=0.2)}
+        self.assertDictEqual(status, {'a[1]': 'ok', 'b[1]': 'regression', 'c[1]': 'regression', 'd[1]': 'new'})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
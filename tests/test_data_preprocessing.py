@@ -107,6 +107,22 @@ class TestDataPreprocessing(unittest.TestCase):
         shutil.rmtree(base_input_dir)
         shutil.rmtree(base_output_dir)
 
+    def test_resize_images_incremental(self):
+        # Run kedua dengan manifest tidak menulis ulang gambar yang tidak berubah
+        output_dir = 'tests/temp_resized_incremental'
+        manifest_path = os.path.join(output_dir, '.build_manifest.json')
+        resize_images(self.test_image_dir, output_dir, (100, 100), manifest=manifest_path)
+        output_path = os.path.join(output_dir, 'test_image_0.png')
+        first_mtime = os.stat(output_path).st_mtime_ns
+        resize_images(self.test_image_dir, output_dir, (100, 100), manifest=manifest_path)
+        self.assertEqual(os.stat(output_path).st_mtime_ns, first_mtime)
+
+        # Ukuran target baru memproses ulang gambar
+        resize_images(self.test_image_dir, output_dir, (50, 60), manifest=manifest_path)
+        with Image.open(output_path) as img:
+            self.assertEqual(img.size, (50, 60))
+        shutil.rmtree(output_dir)
+
     def test_load_tabular_data(self):
         # Menguji fungsi load_tabular_data
         data_tabular = load_tabular_data(self.test_tabular_file)
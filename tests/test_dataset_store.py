@@ -0,0 +1,104 @@
+# tests/test_dataset_store.py
+
+import os
+import sys
+import unittest
+import shutil
+import numpy as np
+import pandas as pd
+import cv2
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data import build_dataset_store, load_dataset_store, load_termogram_arrays, split_indices
+
+
+class TestDatasetStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Struktur citra dummy seperti 'resized_images' untuk tiga subjek (DM003 tanpa citra kanan)
+        cls.test_img_dir = 'tests/temp_store_images'
+        cls.test_store_dir = 'tests/temp_store'
+        cls.data_tabular = pd.DataFrame({
+            'Subject': ['DM001', 'CG002', 'DM003'],
+            'Gender': ['M', 'F', 'M'],
+            'General_right': [34.5, 33.0, 35.0],
+            'General_left': [34.0, 33.5, 35.5],
+        })
+        rng = np.random.default_rng(1)
+        cls.images = {}
+        for subject, gender in zip(cls.data_tabular['Subject'], cls.data_tabular['Gender']):
+            group = subject[:2]
+            for side, suffix in [('Left', 'L'), ('Right', 'R')]:
+                if subject == 'DM003' and side == 'Right':
+                    continue
+                side_dir = os.path.join(cls.test_img_dir, side, f'{group} {side}')
+                os.makedirs(side_dir, exist_ok=True)
+                image = rng.integers(0, 256, size=(30, 12, 3), dtype=np.uint8)
+                cv2.imwrite(os.path.join(side_dir, f'{subject}_{gender}_{suffix}.png'), image)
+                cls.images[(subject, side)] = image
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_img_dir)
+        shutil.rmtree(cls.test_store_dir, ignore_errors=True)
+
+    def test_build_and_load(self):
+        index = build_dataset_store(self.data_tabular, self.test_img_dir, self.test_store_dir, num_workers=2)
+        self.assertListEqual(index['subjects'], ['DM001', 'CG002'])
+
+        dataset = load_dataset_store(self.test_store_dir)
+        self.assertIsInstance(dataset.left, np.memmap)
+        self.assertEqual(dataset.left.shape, (2, 30, 12, 3))
+        self.assertEqual(dataset.left.dtype, np.uint8)
+        self.assertListEqual(dataset.features, ['Gender', 'General_right', 'General_left'])
+        self.assertListEqual(dataset.labels.tolist(), [1, 0])
+        np.testing.assert_allclose(dataset.tabular[1], [0, 33.0, 33.5])
+
+        # Citra disimpan dalam urutan channel RGB
+        expected = cv2.cvtColor(self.images[('CG002', 'Right')], cv2.COLOR_BGR2RGB)
+        np.testing.assert_array_equal(dataset.right[1], expected)
+
+    def test_target_size(self):
+        store_dir = os.path.join(self.test_store_dir, 'resized')
+        build_dataset_store(self.data_tabular, self.test_img_dir, store_dir, target_size=(6, 15))
+        dataset = load_dataset_store(store_dir, mmap_mode=None)
+        self.assertEqual(dataset.right.shape, (2, 15, 6, 3))
+
+    def test_load_termogram_arrays(self):
+        dataset = load_termogram_arrays(self.data_tabular, self.test_img_dir)
+        self.assertEqual(dataset.left.dtype, np.uint8)
+        self.assertListEqual(dataset.subjects, ['DM001', 'CG002'])
+        expected = cv2.cvtColor(self.images[('CG002', 'Right')], cv2.COLOR_BGR2RGB)
+        np.testing.assert_array_equal(dataset.right[1], expected)
+
+        normalized = load_termogram_arrays(self.data_tabular, self.test_img_dir, dtype='float32')
+        self.assertEqual(normalized.right.dtype, np.float32)
+        np.testing.assert_allclose(normalized.right[1], expected / 255.0, rtol=1e-6)
+        self.assertEqual(load_termogram_arrays(self.data_tabular, self.test_img_dir, dtype='float16').left.dtype,
+                         np.float16)
+        with self.assertRaises(ValueError):
+            load_termogram_arrays(self.data_tabular, self.test_img_dir, dtype='float64')
+
+    def test_split_indices_matches_train_test_split(self):
+        from sklearn.model_selection import train_test_split
+
+        labels = np.array([0, 1] * 10)
+        images = np.arange(20 * 4).reshape(20, 4)
+        train_index, test_index = split_indices(labels, test_size=0.2, random_state=1)
+        X_train, X_test, y_train, y_test = train_test_split(images, labels, test_size=0.2, random_state=1)
+        np.testing.assert_array_equal(images[train_index], X_train)
+        np.testing.assert_array_equal(images[test_index], X_test)
+
+        _, stratified_test = split_indices(labels, test_size=0.2, random_state=1, stratify=True)
+        self.assertEqual(labels[stratified_test].sum(), 2)
+
+    def test_missing_store(self):
+        with self.assertRaises(FileNotFoundError):
+            load_dataset_store('tests/does_not_exist')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,107 @@
+# tests/test_foot_roi.py
+
+import os
+import sys
+import json
+import unittest
+import shutil
+import numpy as np
+import pandas as pd
+import cv2
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data import compute_roi_index, crop_images, convert_temperature_matrices, load_dataset_store
+from src.data.foot_roi import bounding_boxes, bounding_box, foot_box
+from src.stream_pipeline import stream_resize_enhance
+from src.apply_image_enhancement import DEFAULT_ENHANCEMENTS
+
+
+class TestFootRoi(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Data mentah dummy: kaki (nilai > 0) di tengah frame berlatar 0, dengan matriks suhu yang sejajar
+        cls.test_dir = 'tests/temp_foot_roi'
+        cls.raw_dir = os.path.join(cls.test_dir, 'raw')
+        cls.data_tabular = pd.DataFrame({
+            'Subject': ['CG001', 'DM002'],
+            'Gender': ['M', 'F'],
+            'General_right': [33.0, 34.5],
+            'General_left': [33.5, 34.0],
+        })
+        rng = np.random.default_rng(4)
+        cls.boxes = {}
+        for subject, gender, box in [('CG001', 'M', (3, 5, 10, 20)), ('DM002', 'F', (6, 2, 8, 30))]:
+            group = 'Control Group' if subject.startswith('CG') else 'DM Group'
+            sample_dir = os.path.join(cls.raw_dir, group, f'{subject}_{gender}')
+            os.makedirs(sample_dir, exist_ok=True)
+            for side in ['L', 'R']:
+                x, y, width, height = box
+                image = np.zeros((40, 20, 3), dtype=np.uint8)
+                image[y:y + height, x:x + width] = rng.integers(1, 256, size=(height, width, 3), dtype=np.uint8)
+                matrix = np.zeros((40, 20))
+                matrix[y:y + height, x:x + width] = rng.uniform(25, 35, size=(height, width))
+                cv2.imwrite(os.path.join(sample_dir, f'{subject}_{gender}_{side}.png'), image)
+                np.savetxt(os.path.join(sample_dir, f'{subject}_{gender}_{side}.csv'), matrix, delimiter=',',
+                           fmt='%g')
+                cls.boxes[f'{subject}_{gender}_{side}.png'] = list(box)
+        cls.temperature_dir = os.path.join(cls.test_dir, 'temperature_store')
+        convert_temperature_matrices(cls.raw_dir, cls.temperature_dir, num_workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def test_bounding_boxes(self):
+        masks = np.zeros((3, 10, 8), dtype=bool)
+        masks[0, 2:5, 1:4] = True
+        masks[1, 9, 7] = True
+        boxes = bounding_boxes(masks)
+        self.assertListEqual(boxes.tolist(), [[1, 2, 3, 3], [7, 9, 1, 1], [0, 0, 8, 10]])
+        # Margin dipotong di tepi frame
+        self.assertListEqual(bounding_box(masks[1], margin=2), [5, 7, 3, 3])
+
+    def test_roi_index_from_temperature_matrices(self):
+        index_path = os.path.join(self.test_dir, 'roi_index.json')
+        roi_index = compute_roi_index(self.raw_dir, temperature_store=self.temperature_dir, output_path=index_path,
+                                      num_workers=2)
+        self.assertDictEqual(roi_index['boxes'], self.boxes)
+        self.assertEqual(roi_index['sources']['temperature'], 4)
+        with open(index_path, 'r', encoding='utf-8') as f:
+            self.assertDictEqual(json.load(f)['boxes'], self.boxes)
+
+        # Tanpa matriks suhu, box dihitung dari piksel citra dan hasilnya sama
+        from_images = compute_roi_index(self.raw_dir)
+        self.assertDictEqual(from_images['boxes'], self.boxes)
+        self.assertEqual(from_images['sources']['image'], 4)
+
+    def test_crop_images(self):
+        output_dir = os.path.join(self.test_dir, 'cropped')
+        manifest = os.path.join(self.test_dir, 'manifest.json')
+        boxes = crop_images(self.raw_dir, output_dir, roi_index=compute_roi_index(self.raw_dir), manifest=manifest)
+        self.assertDictEqual(boxes, self.boxes)
+        cropped = cv2.imread(os.path.join(output_dir, 'DM Group', 'DM002_F', 'DM002_F_L.png'))
+        self.assertEqual(cropped.shape, (30, 8, 3))
+        self.assertListEqual(foot_box(cropped), [0, 0, 8, 30])
+        # Citra yang tidak berubah dilewati pada pemanggilan berikutnya
+        self.assertDictEqual(crop_images(self.raw_dir, output_dir, roi_index=compute_roi_index(self.raw_dir),
+                                         manifest=manifest), {})
+
+    def test_stream_pipeline_crops_before_resize(self):
+        store_dir = os.path.join(self.test_dir, 'store')
+        enhancements = {'Solarize': {'function': DEFAULT_ENHANCEMENTS['Solarize']['function'],
+                                     'parameters': [{'threshold': 128}]}}
+        stream_resize_enhance(self.raw_dir, store_dir=store_dir, data_tabular=self.data_tabular,
+                              enhancements=enhancements, roi_index=compute_roi_index(self.raw_dir), num_workers=1)
+        dataset = load_dataset_store(os.path.join(store_dir, 'Solarize', '128'))
+        # Ukuran target default dari rata-rata box (9 x 25), bukan frame (20 x 40)
+        self.assertEqual(dataset.left.shape[1:], (25, 9, 3))
+        self.assertDictEqual(dataset.index['crop'], {'threshold': 0.0, 'margin': 0})
+        # Tidak ada kolom/baris latar belakang yang tersisa setelah crop
+        self.assertTrue(np.all(dataset.left[0].any(axis=(0, 2))))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -3,6 +3,7 @@
 import unittest
 import os
 import sys
+import numpy as np
 # Menambahkan direktori proyek utama ke sys.path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
@@ -48,5 +49,50 @@ class TestModels(unittest.TestCase):
         self.assertEqual(len(model.inputs), 3)
         self.assertEqual(len(model.outputs), 1)
 
+    def test_shared_trunk_and_global_pooling(self):
+        input_shape_image = (64, 32, 3)
+        for create_model in [create_model1, create_model2, create_model3]:
+            baseline = create_model(input_shape_image, self.input_shape_tabular)
+            model = create_model(input_shape_image, self.input_shape_tabular, shared_trunk=True, global_pooling='avg')
+            self.assertListEqual([tensor.name for tensor in model.inputs],
+                                 ['input_left', 'input_right', 'input_tabular'])
+            self.assertLess(model.count_params(), baseline.count_params() / 2)
+            self.assertIsNotNone(model.get_layer('shared_trunk'))
+
+    def test_shared_trunk_is_weight_tied(self):
+        model = create_model1((32, 16, 3), self.input_shape_tabular, shared_trunk=True, global_pooling='max')
+        features = model.get_layer('flatten_feet')
+        extractor = type(model)(inputs=model.inputs[:2], outputs=features.output)
+        rng = np.random.default_rng(0)
+        left = rng.random((2, 32, 16, 3), dtype=np.float32)
+        right = rng.random((2, 32, 16, 3), dtype=np.float32)
+        # Menukar kaki kiri dan kanan hanya menukar urutan fitur karena bobot tower sama
+        straight = extractor.predict([left, right], verbose=0)
+        swapped = extractor.predict([right, left], verbose=0)
+        half = straight.shape[1] // 2
+        np.testing.assert_allclose(straight[:, :half], swapped[:, half:], rtol=1e-5, atol=1e-5)
+
+    def test_rescale_input_matches_normalized_input(self):
+        from src.models.blocks import has_rescaling
+
+        rng = np.random.default_rng(1)
+        left = rng.integers(0, 256, size=(2, 32, 16, 3)).astype(np.uint8)
+        right = rng.integers(0, 256, size=(2, 32, 16, 3)).astype(np.uint8)
+        tabular = rng.random((2, self.input_shape_tabular), dtype=np.float32)
+        for create_model in [create_model1, create_model4]:
+            model = create_model((32, 16, 3), self.input_shape_tabular)
+            rescaled = create_model((32, 16, 3), self.input_shape_tabular, rescale_input=True)
+            self.assertFalse(has_rescaling(model))
+            self.assertTrue(has_rescaling(rescaled))
+            # Layer Rescaling tidak memiliki bobot sehingga bobotnya dapat disalin langsung
+            rescaled.set_weights(model.get_weights())
+            np.testing.assert_allclose(rescaled.predict([left, right, tabular], verbose=0),
+                                       model.predict([left / 255.0, right / 255.0, tabular], verbose=0),
+                                       rtol=1e-5, atol=1e-6)
+
+    def test_invalid_global_pooling(self):
+        with self.assertRaises(ValueError):
+            create_model2((32, 16, 3), self.input_shape_tabular, global_pooling='sum')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+# tests/test_palette.py
+
+import os
+import sys
+import unittest
+import shutil
+import numpy as np
+import pandas as pd
+import cv2
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data import calibrate_palette_lut, load_palette_lut, invert_palette, load_dataset_store, create_store_dataset
+from src.data.palette import PALETTE_LUT_FILE
+from src.stream_pipeline import stream_resize_enhance, TEMPERATURE_VARIANT
+from src.models import create_model1, create_model2, create_model3, create_model4
+from src.predict import export_model, Predictor
+
+T_MIN, T_MAX = 20.0, 36.0
+
+
+def render_thermogram(matrix):
+    """
+    Citra pseudo-colour BGR dari matriks suhu dengan palet tetap (COLORMAP_JET), latar belakang hitam.
+    """
+    levels = np.round((matrix - T_MIN) / (T_MAX - T_MIN) * 255).clip(0, 255).astype(np.uint8)
+    image = cv2.applyColorMap(levels, cv2.COLORMAP_JET)
+    image[matrix <= 0] = 0
+    return image
+
+
+class TestPalette(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Data mentah dummy: pasangan PNG pseudo-colour dan CSV suhu, kaki di tengah frame berlatar 0
+        cls.test_dir = 'tests/temp_palette'
+        cls.raw_dir = os.path.join(cls.test_dir, 'raw')
+        cls.data_tabular = pd.DataFrame({
+            'Subject': ['CG001', 'DM002', 'DM003'],
+            'Gender': ['M', 'F', 'M'],
+            'General_right': [33.0, 34.5, 35.0],
+            'General_left': [33.5, 34.0, 35.5],
+        })
+        rng = np.random.default_rng(6)
+        for subject, gender in zip(cls.data_tabular['Subject'], cls.data_tabular['Gender']):
+            group = 'Control Group' if subject.startswith('CG') else 'DM Group'
+            sample_dir = os.path.join(cls.raw_dir, group, f'{subject}_{gender}')
+            os.makedirs(sample_dir, exist_ok=True)
+            for side in ['L', 'R']:
+                matrix = np.zeros((48, 24))
+                matrix[4:44, 3:21] = rng.uniform(T_MIN, T_MAX, size=(40, 18))
+                np.savetxt(os.path.join(sample_dir, f'{subject}_{gender}_{side}.csv'), matrix, delimiter=',',
+                           fmt='%.3f')
+                cv2.imwrite(os.path.join(sample_dir, f'{subject}_{gender}_{side}.png'), render_thermogram(matrix))
+        cls.lut_path = os.path.join(cls.test_dir, PALETTE_LUT_FILE)
+        cls.lut = calibrate_palette_lut(cls.raw_dir, bins=64, output_path=cls.lut_path, num_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def test_inversion_recovers_temperature(self):
+        matrix = np.zeros((30, 20))
+        matrix[5:25, 4:16] = np.linspace(T_MIN + 0.5, T_MAX - 0.5, 240).reshape(20, 12)
+        image = render_thermogram(matrix)
+
+        temperature = invert_palette(image, self.lut, normalize=False)
+        self.assertEqual(temperature.shape, (30, 20))
+        self.assertEqual(temperature.dtype, np.float32)
+        self.assertTrue(np.all(temperature[matrix <= 0] == 0))
+        # Palet 256 level pada rentang 16 °C: kesalahan kuantisasi warna sekitar 0.1 °C
+        self.assertLess(np.abs(temperature[matrix > 0] - matrix[matrix > 0]).mean(), 0.25)
+
+        normalized = invert_palette(image[..., ::-1], self.lut, channel_order='RGB')
+        self.assertGreaterEqual(normalized.min(), 0.0)
+        self.assertLessEqual(normalized.max(), 1.0)
+        np.testing.assert_allclose(normalized * (self.lut.t_max - self.lut.t_min) + self.lut.t_min,
+                                   np.where(matrix > 0, temperature, self.lut.t_min), atol=1e-4)
+
+    def test_save_and_load(self):
+        loaded = load_palette_lut(self.lut_path)
+        np.testing.assert_array_equal(loaded.table, self.lut.table)
+        self.assertEqual(loaded.bins, 64)
+        self.assertAlmostEqual(loaded.t_min, self.lut.t_min)
+        self.assertLess(loaded.rmse, 0.2)
+        # Warna yang tidak ada di data kalibrasi tetap dipetakan ke suhu sel terdekat
+        self.assertFalse(np.isnan(loaded.table).any())
+
+    def test_temperature_store_and_inference(self):
+        store_dir = os.path.join(self.test_dir, 'store')
+        stats = stream_resize_enhance(self.raw_dir, target_size=(32, 64), store_dir=store_dir,
+                                      data_tabular=self.data_tabular, enhancements={}, palette_lut=self.lut_path,
+                                      num_workers=2)
+        self.assertEqual(stats['store_images'], 6)
+        temperature_dir = os.path.join(store_dir, TEMPERATURE_VARIANT)
+        dataset = load_dataset_store(temperature_dir)
+        self.assertEqual(dataset.left.shape, (3, 64, 32, 1))
+        self.assertEqual(dataset.left.dtype, np.float16)
+        self.assertEqual(dataset.index['channel_order'], 'temperature')
+        self.assertEqual(dataset.index['palette']['bins'], 64)
+        self.assertTrue(os.path.exists(os.path.join(temperature_dir, PALETTE_LUT_FILE)))
+
+        # Model menerima input satu channel; batch tf.data berupa float32 tanpa pembagian 255
+        inputs, _ = next(iter(create_store_dataset(dataset, batch_size=3)))
+        self.assertEqual(tuple(inputs['input_left'].shape), (3, 64, 32, 1))
+        np.testing.assert_allclose(inputs['input_left'].numpy(), dataset.left.astype(np.float32))
+        for create_model in [create_model1, create_model2, create_model3, create_model4]:
+            model = create_model((64, 32, 1), len(dataset.features))
+            self.assertEqual(model.predict(inputs, verbose=0).shape, (3, 1))
+
+        export_dir = os.path.join(self.test_dir, 'export')
+        export_model(model, export_dir, dataset.features, formats=['saved_model'],
+                     palette_lut=os.path.join(temperature_dir, PALETTE_LUT_FILE))
+        predictor = Predictor(export_dir, batch_size=2)
+        self.assertFalse(predictor.normalize)
+        left_path = os.path.join(self.raw_dir, 'Control Group', 'CG001_M', 'CG001_M_L.png')
+        image = predictor.preprocess_image(left_path)
+        self.assertEqual(image.shape, (64, 32, 1))
+        np.testing.assert_allclose(image.astype(np.float32), dataset.left[0].astype(np.float32), atol=1e-3)
+        probabilities = predictor.predict({'left': left_path, 'right': left_path,
+                                           'tabular': {'Gender': 'M', 'General_right': 33.0,
+                                                       'General_left': 33.5}})
+        self.assertEqual(probabilities.shape, (1,))
+
+    def test_uniform_calibration_is_rejected(self):
+        raw_dir = os.path.join(self.test_dir, 'raw_uniform')
+        sample_dir = os.path.join(raw_dir, 'DM Group', 'DM009_F')
+        os.makedirs(sample_dir, exist_ok=True)
+        matrix = np.zeros((48, 24))
+        matrix[4:44, 3:21] = 30.0
+        np.savetxt(os.path.join(sample_dir, 'DM009_F_L.csv'), matrix, delimiter=',', fmt='%.3f')
+        cv2.imwrite(os.path.join(sample_dir, 'DM009_F_L.png'), render_thermogram(matrix))
+        with self.assertRaises(ValueError):
+            calibrate_palette_lut(raw_dir, bins=16, num_workers=1)
+        # LUT dengan rentang nol dari sumber lain tidak menghasilkan inf/NaN
+        degenerate = self.lut._replace(t_max=self.lut.t_min)
+        with self.assertRaises(ValueError):
+            invert_palette(render_thermogram(matrix), degenerate)
+        self.assertTrue(np.isfinite(invert_palette(render_thermogram(matrix), degenerate, normalize=False)).all())
+
+    def test_palette_requires_store(self):
+        with self.assertRaises(ValueError):
+            stream_resize_enhance(self.raw_dir, output_dir=os.path.join(self.test_dir, 'files'),
+                                  palette_lut=self.lut_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,115 @@
+# tests/test_predict.py
+
+import os
+import io
+import sys
+import json
+import unittest
+import shutil
+import numpy as np
+import pandas as pd
+import cv2
+from sklearn.preprocessing import StandardScaler
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.models import create_model1
+from src.predict import export_model, collect_image_pairs, Predictor
+from src.utils import solarize_image
+
+
+class TestPredict(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_img_dir = 'tests/temp_predict_images'
+        cls.test_export_dir = 'tests/temp_predict_export'
+        cls.features = ['Gender', 'General_right', 'General_left']
+        cls.data_tabular = pd.DataFrame({
+            'Subject': ['DM001', 'CG002', 'DM003'],
+            'Gender': ['M', 'F', 'M'],
+            'General_right': [34.5, 31.0, 33.2],
+            'General_left': [34.0, 30.5, 32.8],
+        })
+        rng = np.random.default_rng(3)
+        for subject, gender in zip(cls.data_tabular['Subject'], cls.data_tabular['Gender']):
+            subject_dir = os.path.join(cls.test_img_dir, f'{subject}_{gender}')
+            os.makedirs(os.path.join(subject_dir, 'Angiosoms'), exist_ok=True)
+            for side in ['L', 'R']:
+                # Ukuran asli berbeda dari ukuran model sehingga resize ikut diuji
+                image = rng.integers(0, 256, size=(40, 20, 3), dtype=np.uint8)
+                cv2.imwrite(os.path.join(subject_dir, f'{subject}_{gender}_{side}.png'), image)
+                cv2.imwrite(os.path.join(subject_dir, 'Angiosoms', f'{subject}_{gender}_{side}_LCA.png'), image)
+
+        # Scaler seperti data_preprocessing: di-fit pada kolom numerik saja
+        cls.scaler = StandardScaler().fit(cls.data_tabular[['General_right', 'General_left']])
+        cls.model = create_model1((20, 10, 3), len(cls.features))
+        export_model(cls.model, cls.test_export_dir, cls.features, enhancement=[('Solarize', {'threshold': 128})],
+                     scaler=cls.scaler)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_img_dir)
+        shutil.rmtree(cls.test_export_dir)
+
+    def _expected(self):
+        left, right = [], []
+        for subject, gender in zip(self.data_tabular['Subject'], self.data_tabular['Gender']):
+            for side, images in [('L', left), ('R', right)]:
+                image = cv2.imread(os.path.join(self.test_img_dir, f'{subject}_{gender}',
+                                                f'{subject}_{gender}_{side}.png'))
+                image = solarize_image(cv2.resize(image, (10, 20), interpolation=cv2.INTER_AREA), 128)
+                images.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0)
+        tabular = self.data_tabular[self.features].assign(
+            Gender=self.data_tabular['Gender'].map({'M': 1, 'F': 0})).to_numpy(dtype=np.float32)
+        tabular[:, 1:] = self.scaler.transform(self.data_tabular[['General_right', 'General_left']])
+        return self.model.predict([np.stack(left), np.stack(right), tabular], verbose=0).reshape(-1)
+
+    def test_collect_image_pairs(self):
+        pairs = collect_image_pairs(self.test_img_dir)
+        self.assertListEqual(list(pairs), ['CG002', 'DM001', 'DM003'])
+        self.assertTrue(pairs['DM001'][0].endswith('DM001_M_L.png'))
+
+    def test_backends_match_keras(self):
+        expected = self._expected()
+        with open(os.path.join(self.test_export_dir, 'preprocessing.json'), 'r', encoding='utf-8') as f:
+            self.assertListEqual(json.load(f)['target_size'], [10, 20])
+        for backend in ['saved_model', 'tflite']:
+            predictor = Predictor(self.test_export_dir, backend=backend, batch_size=2)
+            predictions = predictor.predict_directory(self.test_img_dir, self.data_tabular)
+            predictions = predictions.set_index('Subject').loc[self.data_tabular['Subject']]
+            np.testing.assert_allclose(predictions['probability'].to_numpy(), expected, rtol=1e-4, atol=1e-5)
+            self.assertListEqual(predictions['prediction'].tolist(), (expected > 0.5).astype(int).tolist())
+
+    def test_rescaling_model_skips_normalization(self):
+        export_dir = os.path.join(self.test_export_dir, 'rescaled')
+        model = create_model1((20, 10, 3), len(self.features), rescale_input=True)
+        model.set_weights(self.model.get_weights())
+        config = export_model(model, export_dir, self.features, enhancement=[('Solarize', {'threshold': 128})],
+                              scaler=self.scaler, formats=['saved_model'])
+        self.assertFalse(config['normalize'])
+        predictor = Predictor(export_dir, batch_size=2)
+        predictions = predictor.predict_directory(self.test_img_dir, self.data_tabular)
+        predictions = predictions.set_index('Subject').loc[self.data_tabular['Subject']]
+        np.testing.assert_allclose(predictions['probability'].to_numpy(), self._expected(), rtol=1e-4, atol=1e-5)
+
+    def test_stream_mode(self):
+        predictor = Predictor(self.test_export_dir, backend='tflite')
+        subject_dir = os.path.join(self.test_img_dir, 'DM001_M')
+        requests = [
+            {'id': 'a', 'left': os.path.join(subject_dir, 'DM001_M_L.png'),
+             'right': os.path.join(subject_dir, 'DM001_M_R.png'),
+             'tabular': {'Gender': 'M', 'General_right': 34.5, 'General_left': 34.0}},
+            {'id': 'b', 'left': 'tidak_ada.png', 'right': 'tidak_ada.png', 'tabular': {}},
+        ]
+        output = io.StringIO()
+        n_requests = predictor.predict_stream(io.StringIO('\n'.join(json.dumps(r) for r in requests)), output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(n_requests, 2)
+        self.assertAlmostEqual(responses[0]['probability'], float(self._expected()[0]), places=4)
+        self.assertEqual(responses[1]['id'], 'b')
+        self.assertIn('error', responses[1])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
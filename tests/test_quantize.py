@@ -0,0 +1,128 @@
+# tests/test_quantize.py
+
+import os
+import sys
+import json
+import unittest
+import shutil
+import numpy as np
+import pandas as pd
+import cv2
+from sklearn.preprocessing import StandardScaler
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data import build_dataset_store
+from src.models import create_model1
+from src.predict import export_model, Predictor
+from src.training import compute_fold_indices
+from src.quantize import (
+    QUANTIZATION_FILES,
+    calibration_indices,
+    load_indices,
+    split_calibration_eval,
+    quantize_export,
+    compare_models
+)
+
+
+class TestQuantize(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_img_dir = 'tests/temp_quantize_images'
+        cls.test_store_dir = 'tests/temp_quantize_store'
+        cls.test_export_dir = 'tests/temp_quantize_export'
+        subjects = [f'DM{i:03d}' if i % 2 else f'CG{i:03d}' for i in range(1, 9)]
+        data_tabular = pd.DataFrame({
+            'Subject': subjects,
+            'Gender': ['M', 'F'] * 4,
+            'General_right': np.linspace(30.0, 35.0, 8),
+            'General_left': np.linspace(31.0, 34.0, 8),
+        })
+        rng = np.random.default_rng(11)
+        for subject, gender in zip(subjects, data_tabular['Gender']):
+            for side, suffix in [('Left', 'L'), ('Right', 'R')]:
+                side_dir = os.path.join(cls.test_img_dir, side, f'{subject[:2]} {side}')
+                os.makedirs(side_dir, exist_ok=True)
+                image = rng.integers(0, 256, size=(20, 10, 3), dtype=np.uint8)
+                cv2.imwrite(os.path.join(side_dir, f'{subject}_{gender}_{suffix}.png'), image)
+        build_dataset_store(data_tabular, cls.test_img_dir, cls.test_store_dir)
+
+        scaler = StandardScaler().fit(data_tabular[['General_right', 'General_left']])
+        model = create_model1((20, 10, 3), 3)
+        export_model(model, cls.test_export_dir, ['Gender', 'General_right', 'General_left'], scaler=scaler)
+        # Kalibrasi pada fold latih, evaluasi pada fold uji dari store yang sama
+        cls.folds_path = os.path.join(cls.test_export_dir, 'folds.npz')
+        cls.train_index, cls.test_index = compute_fold_indices(8, n_splits=2, path=cls.folds_path)[0]
+        cls.artifacts = quantize_export(cls.test_export_dir, store_dir=cls.test_store_dir, indices=cls.train_index)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_img_dir)
+        shutil.rmtree(cls.test_store_dir)
+        shutil.rmtree(cls.test_export_dir)
+
+    def test_calibration_indices(self):
+        indices = calibration_indices(8, n_calibration=4, random_state=0)
+        self.assertEqual(len(indices), 4)
+        self.assertEqual(len(set(indices.tolist())), 4)
+        np.testing.assert_array_equal(indices, np.sort(indices))
+        self.assertEqual(len(calibration_indices(3, n_calibration=10)), 3)
+
+    def test_quantize_export_writes_smaller_artifacts(self):
+        self.assertListEqual(sorted(self.artifacts), sorted(QUANTIZATION_FILES))
+        float_size = os.path.getsize(os.path.join(self.test_export_dir, 'model.tflite'))
+        for path in self.artifacts.values():
+            self.assertLess(os.path.getsize(path), float_size)
+        with open(os.path.join(self.test_export_dir, 'preprocessing.json'), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        self.assertEqual(config['quantized']['int8']['calibration_samples'], 4)
+        self.assertListEqual(config['quantized']['int8']['calibration_indices'], self.train_index.tolist())
+
+        with self.assertRaises(ValueError):
+            quantize_export(self.test_export_dir, modes=['int8'])
+        with self.assertRaises(ValueError):
+            quantize_export(self.test_export_dir, modes=['int4'])
+
+    def test_calibration_and_eval_are_disjoint(self):
+        np.testing.assert_array_equal(load_indices(f'{self.folds_path}:test_0'), self.test_index)
+        np.testing.assert_array_equal(load_indices('3,1,2'), [3, 1, 2])
+
+        calibration, evaluation = split_calibration_eval(8, eval_index=self.test_index, n_calibration=3)
+        self.assertEqual(len(calibration), 3)
+        self.assertEqual(len(np.intersect1d(calibration, evaluation)), 0)
+        calibration, _ = split_calibration_eval(8, self.train_index, self.test_index)
+        self.assertEqual(len(np.intersect1d(calibration, self.test_index)), 0)
+
+        # Store yang sama tanpa indeks evaluasi, atau indeks yang beririsan, ditolak
+        with self.assertRaises(ValueError):
+            split_calibration_eval(8, self.train_index)
+        with self.assertRaises(ValueError):
+            split_calibration_eval(8, self.train_index, np.arange(8))
+        with self.assertRaises(ValueError):
+            compare_models(self.test_export_dir, self.test_store_dir, modes=['int8'], n_latency=1)
+
+    def test_quantized_predictor_close_to_float(self):
+        reference = Predictor(self.test_export_dir, backend='saved_model', warmup=False)
+        quantized = Predictor(self.test_export_dir, backend='tflite', tflite_file=QUANTIZATION_FILES['float16'])
+        rng = np.random.default_rng(0)
+        left = rng.integers(0, 256, size=(3, 20, 10, 3), dtype=np.uint8)
+        right = rng.integers(0, 256, size=(3, 20, 10, 3), dtype=np.uint8)
+        tabular = np.array([[1, 31.0, 32.0], [0, 33.0, 33.5], [1, 34.0, 30.0]], dtype=np.float32)
+        np.testing.assert_allclose(quantized.predict_arrays(left, right, tabular),
+                                   reference.predict_arrays(left, right, tabular), atol=1e-2)
+
+    def test_compare_models_report(self):
+        report = compare_models(self.test_export_dir, self.test_store_dir, indices=self.test_index, n_latency=3)
+        self.assertListEqual([row['artifact'] for row in report],
+                             ['float32', 'float32_tflite', 'dynamic', 'float16', 'int8'])
+        self.assertEqual(report[0]['max_abs_diff'], 0.0)
+        for row in report:
+            self.assertGreaterEqual(row['agreement'], 0.0)
+            self.assertGreater(row['latency_p50_ms'], 0.0)
+        self.assertEqual(report[1]['size_ratio'], 1.0)
+        self.assertTrue(os.path.exists(os.path.join(self.test_export_dir, 'quantization_report.csv')))
+        with open(os.path.join(self.test_export_dir, 'quantization_report.json'), 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['n_samples'], 4)
\ No newline at end of file
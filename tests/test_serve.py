@@ -0,0 +1,128 @@
+# tests/test_serve.py
+
+import os
+import sys
+import json
+import base64
+import unittest
+import shutil
+import threading
+import urllib.request
+import urllib.error
+import numpy as np
+import cv2
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.models import create_model1
+from src.predict import export_model
+from src.serve import LatencyTracker, create_server, parse_predict_request
+
+
+class TestServe(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_export_dir = 'tests/temp_serve_export'
+        export_model(create_model1((20, 10, 3), 2), cls.test_export_dir, ['Gender', 'General_right'],
+                     formats=['saved_model'])
+        # Tenggat panjang agar permintaan konkuren pasti tergabung dalam micro-batch yang sama
+        cls.server = create_server(cls.test_export_dir, port=0, batch_size=4, max_wait_ms=500)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+        rng = np.random.default_rng(5)
+        cls.samples = []
+        for i in range(4):
+            left = rng.integers(0, 256, size=(30, 15, 3), dtype=np.uint8)
+            right = rng.integers(0, 256, size=(30, 15, 3), dtype=np.uint8)
+            cls.samples.append({'left': left, 'right': right,
+                                'tabular': {'Gender': 'M' if i % 2 else 'F', 'General_right': 30.0 + i}})
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        shutil.rmtree(cls.test_export_dir)
+
+    def _post(self, body, content_type):
+        request = urllib.request.Request(f'{self.url}/predict', data=body, headers={'Content-Type': content_type})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    def _json_body(self, sample):
+        return json.dumps({
+            'left': base64.b64encode(cv2.imencode('.png', sample['left'])[1].tobytes()).decode('ascii'),
+            'right': base64.b64encode(cv2.imencode('.png', sample['right'])[1].tobytes()).decode('ascii'),
+            'tabular': sample['tabular'],
+        }).encode('utf-8')
+
+    def test_concurrent_requests_are_batched(self):
+        expected = self.server.predictor.predict(self.samples)
+        batches_before = self.server.batcher.snapshot()['batches']
+        results = [None] * len(self.samples)
+
+        def _request(i):
+            results[i] = self._post(self._json_body(self.samples[i]), 'application/json')
+
+        threads = [threading.Thread(target=_request, args=(i,)) for i in range(len(self.samples))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        np.testing.assert_allclose([result['probability'] for result in results], expected, rtol=1e-5, atol=1e-6)
+        self.assertLess(self.server.batcher.snapshot()['batches'] - batches_before, len(self.samples))
+
+    def test_multipart_request(self):
+        sample = self.samples[0]
+        boundary = 'termogram-boundary'
+        parts = []
+        for name in ['left', 'right']:
+            parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{name}.png"\r\n'
+                         f'Content-Type: image/png\r\n\r\n'.encode('ascii')
+                         + cv2.imencode('.png', sample[name])[1].tobytes() + b'\r\n')
+        for name, value in sample['tabular'].items():
+            parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+                         .encode('ascii'))
+        body = b''.join(parts) + f'--{boundary}--\r\n'.encode('ascii')
+        left, right, tabular = parse_predict_request(f'multipart/form-data; boundary={boundary}', body)
+        self.assertDictEqual(tabular, {'Gender': 'F', 'General_right': 30.0})
+
+        result = self._post(body, f'multipart/form-data; boundary={boundary}')
+        expected = self.server.predictor.predict(sample)[0]
+        self.assertAlmostEqual(result['probability'], float(expected), places=5)
+        self.assertIn(result['prediction'], (0, 1))
+
+    def test_invalid_request_returns_400(self):
+        # JSON yang valid tetapi bukan objek juga kesalahan klien
+        for body in [{'tabular': {}}, [], 'x', 3]:
+            with self.subTest(body=body):
+                with self.assertRaises(urllib.error.HTTPError) as context:
+                    self._post(json.dumps(body).encode('utf-8'), 'application/json')
+                self.assertEqual(context.exception.code, 400)
+
+    def test_health_metrics_latency(self):
+        self._post(self._json_body(self.samples[1]), 'application/json')
+        with urllib.request.urlopen(f'{self.url}/health') as response:
+            health = json.loads(response.read())
+        self.assertEqual(health['status'], 'ok')
+        self.assertEqual(health['backend'], 'saved_model')
+        with urllib.request.urlopen(f'{self.url}/latency') as response:
+            latency = json.loads(response.read())
+        self.assertGreater(latency['latency_ms']['p50'], 0.0)
+        self.assertGreaterEqual(latency['batching']['samples'], 1)
+        with urllib.request.urlopen(f'{self.url}/metrics') as response:
+            text = response.read().decode('utf-8')
+        self.assertIn('termogram_pipeline_server_requests_total', text)
+        self.assertIn('termogram_pipeline_server_latency_ms{quantile="0.5"}', text)
+
+    def test_latency_tracker(self):
+        tracker = LatencyTracker(window=3)
+        self.assertIsNone(tracker.percentiles()['p50'])
+        for value in [100.0, 1.0, 2.0, 3.0]:
+            tracker.record(value)
+        self.assertEqual(tracker.percentiles()['p50'], 2.0)
+        self.assertEqual(tracker.count, 4)
\ No newline at end of file
@@ -0,0 +1,120 @@
+# tests/test_stream_pipeline.py
+
+import os
+import sys
+import unittest
+import shutil
+import numpy as np
+import pandas as pd
+import cv2
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.stream_pipeline import stream_resize_enhance
+from src.apply_image_enhancement import process_images, DEFAULT_ENHANCEMENTS
+from src.data import organize_images, resize_all_images, build_dataset_store, load_dataset_store
+
+
+class TestStreamPipeline(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Struktur data mentah dummy dengan ukuran citra yang berbeda-beda
+        cls.test_dir = 'tests/temp_stream_pipeline'
+        cls.raw_dir = os.path.join(cls.test_dir, 'raw')
+        cls.data_tabular = pd.DataFrame({
+            'Subject': ['CG001', 'DM002', 'DM003'],
+            'Gender': ['M', 'F', 'M'],
+            'General_right': [33.0, 34.5, 35.0],
+            'General_left': [33.5, 34.0, 35.5],
+        })
+        rng = np.random.default_rng(3)
+        for subject, gender, (height, width) in zip(cls.data_tabular['Subject'], cls.data_tabular['Gender'],
+                                                    [(40, 20), (44, 18), (36, 22)]):
+            group = 'Control Group' if subject.startswith('CG') else 'DM Group'
+            sample_dir = os.path.join(cls.raw_dir, group, f'{subject}_{gender}')
+            os.makedirs(sample_dir, exist_ok=True)
+            for side in ['L', 'R']:
+                image = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+                cv2.imwrite(os.path.join(sample_dir, f'{subject}_{gender}_{side}.png'), image)
+        cls.enhancements = {
+            'Solarize': {'function': DEFAULT_ENHANCEMENTS['Solarize']['function'], 'parameters': [{'threshold': 128}]},
+            'CLAHE': {'function': DEFAULT_ENHANCEMENTS['CLAHE']['function'],
+                      'parameters': [{'clip_limit': 2.0, 'tile_grid_size': (8, 8)}]},
+        }
+        cls.target_size = (16, 32)
+
+        # Referensi: organize -> resize ke disk -> enhancement
+        cls.reference_dir = os.path.join(cls.test_dir, 'reference')
+        organize_images(cls.raw_dir, os.path.join(cls.reference_dir, 'images_per_part'))
+        resize_all_images(os.path.join(cls.reference_dir, 'images_per_part'),
+                          os.path.join(cls.reference_dir, 'resized'), cls.target_size)
+        process_images(os.path.join(cls.reference_dir, 'resized'), os.path.join(cls.reference_dir, 'enhanced'),
+                       enhancements=cls.enhancements)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def _read_tree(self, base_dir):
+        return {
+            os.path.relpath(os.path.join(root, fname), base_dir): cv2.imread(os.path.join(root, fname))
+            for root, dirs, files in os.walk(base_dir) for fname in files
+        }
+
+    def test_files_match_two_stage_output(self):
+        for input_dir in [self.raw_dir, os.path.join(self.reference_dir, 'images_per_part')]:
+            with self.subTest(input_dir=input_dir):
+                output_dir = os.path.join(self.test_dir, 'streamed')
+                shutil.rmtree(output_dir, ignore_errors=True)
+                stats = stream_resize_enhance(input_dir, self.target_size, output_dir=output_dir,
+                                              enhancements=self.enhancements, queue_depth=2, num_workers=2)
+                self.assertEqual(stats['images'], 6)
+                self.assertEqual(stats['files'], 12)
+                self.assertEqual(stats['errors'], 0)
+
+                reference = self._read_tree(os.path.join(self.reference_dir, 'enhanced'))
+                streamed = self._read_tree(output_dir)
+                self.assertListEqual(sorted(streamed), sorted(reference))
+                for rel_path, image in reference.items():
+                    np.testing.assert_array_equal(streamed[rel_path], image)
+
+    def test_store_matches_build_dataset_store(self):
+        store_dir = os.path.join(self.test_dir, 'stores')
+        stats = stream_resize_enhance(self.raw_dir, self.target_size, store_dir=store_dir,
+                                      data_tabular=self.data_tabular, enhancements=self.enhancements, num_workers=2)
+        self.assertEqual(stats['store_images'], 12)
+        self.assertListEqual(sorted(os.listdir(store_dir)), ['CLAHE', 'Solarize'])
+
+        reference_store = os.path.join(self.test_dir, 'reference_store')
+        build_dataset_store(self.data_tabular, os.path.join(self.reference_dir, 'enhanced', 'CLAHE', '2.0_(8, 8)'),
+                            reference_store)
+        expected = load_dataset_store(reference_store)
+        streamed = load_dataset_store(os.path.join(store_dir, 'CLAHE', '2.0_(8, 8)'))
+        self.assertListEqual(streamed.subjects, expected.subjects)
+        self.assertEqual(streamed.index['enhancement']['name'], 'CLAHE')
+        np.testing.assert_array_equal(streamed.left, expected.left)
+        np.testing.assert_array_equal(streamed.right, expected.right)
+        np.testing.assert_array_equal(streamed.tabular, expected.tabular)
+        np.testing.assert_array_equal(streamed.labels, expected.labels)
+
+    def test_unreadable_store_image(self):
+        # Citra yang rusak tidak boleh masuk store sebagai citra hitam dengan label subjek yang asli
+        raw_dir = os.path.join(self.test_dir, 'raw_corrupt')
+        shutil.copytree(self.raw_dir, raw_dir)
+        with open(os.path.join(raw_dir, 'DM Group', 'DM002_F', 'DM002_F_R.png'), 'wb') as f:
+            f.write(b'bukan png')
+        store_dir = os.path.join(self.test_dir, 'stores_corrupt')
+        with self.assertRaises(ValueError):
+            stream_resize_enhance(raw_dir, self.target_size, store_dir=store_dir, data_tabular=self.data_tabular,
+                                  enhancements=self.enhancements, num_workers=2)
+        self.assertFalse(any('index.json' in files for _, _, files in os.walk(store_dir)))
+
+    def test_requires_output(self):
+        with self.assertRaises(ValueError):
+            stream_resize_enhance(self.raw_dir, self.target_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
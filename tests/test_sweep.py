@@ -0,0 +1,117 @@
+# tests/test_sweep.py
+
+import os
+import sys
+import unittest
+import shutil
+from unittest import mock
+import numpy as np
+import pandas as pd
+import cv2
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data import build_dataset_store
+from src import training
+from src.sweep import rung_schedule, select_survivors, run_sweep, load_leaderboard
+
+
+class TestSweep(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_img_dir = 'tests/temp_sweep_images'
+        cls.test_store_dir = 'tests/temp_sweep_store'
+        cls.test_output_dir = 'tests/temp_sweep_output'
+        subjects = [f'DM{i:03d}' if i % 2 else f'CG{i:03d}' for i in range(1, 9)]
+        data_tabular = pd.DataFrame({
+            'Subject': subjects,
+            'Gender': ['M', 'F'] * 4,
+            'General_right': np.linspace(30.0, 35.0, 8),
+            'General_left': np.linspace(31.0, 34.0, 8),
+        })
+        rng = np.random.default_rng(11)
+        for subject, gender in zip(subjects, data_tabular['Gender']):
+            for side, suffix in [('Left', 'L'), ('Right', 'R')]:
+                side_dir = os.path.join(cls.test_img_dir, side, f'{subject[:2]} {side}')
+                os.makedirs(side_dir, exist_ok=True)
+                image = rng.integers(0, 256, size=(12, 8, 3), dtype=np.uint8)
+                cv2.imwrite(os.path.join(side_dir, f'{subject}_{gender}_{suffix}.png'), image)
+        for variant in ['CLAHE/a', 'Gamma/b', 'Solarize/c']:
+            build_dataset_store(data_tabular, cls.test_img_dir, os.path.join(cls.test_store_dir, variant))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_img_dir)
+        shutil.rmtree(cls.test_store_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_output_dir, ignore_errors=True)
+
+    def test_rung_schedule(self):
+        self.assertListEqual(rung_schedule(10, 200, 3), [10, 30, 90, 200])
+        self.assertListEqual(rung_schedule(5, 5, 2), [5])
+        with self.assertRaises(ValueError):
+            rung_schedule(10, 5, 3)
+
+    def test_select_survivors(self):
+        scores = {'a': 0.9, 'b': 0.5, 'c': float('nan'), 'd': 0.7}
+        self.assertSetEqual(select_survivors(scores, 'halving', 3), {'a', 'd'})
+        self.assertSetEqual(select_survivors(scores, 'median'), {'a', 'd'})
+        self.assertSetEqual(select_survivors(scores, 'none'), set(scores))
+
+    def _run(self):
+        return run_sweep(self.test_store_dir, model_names=['model1'], output_dir=self.test_output_dir,
+                         min_epochs=1, max_epochs=3, reduction_factor=3, n_splits=2, batch_size=4, max_workers=1)
+
+    def test_sweep_prunes_and_resumes(self):
+        calls = []
+        train_fold = training.train_fold
+
+        def _interrupted(job):
+            if len(calls) == 2:
+                raise RuntimeError("terhenti")
+            calls.append(job)
+            return train_fold(job)
+
+        with mock.patch.object(training, 'train_fold', side_effect=_interrupted):
+            with self.assertRaises(RuntimeError):
+                self._run()
+        leaderboard = load_leaderboard(self.test_output_dir)
+        self.assertEqual(sum(len(candidate['folds']) for candidate in leaderboard['candidates'].values()), 2)
+
+        # Dijalankan ulang: 4 fold rung pertama yang tersisa + 2 fold kandidat yang lanjut ke rung kedua
+        calls.clear()
+        with mock.patch.object(training, 'train_fold', side_effect=lambda job: calls.append(job) or train_fold(job)):
+            ranking = self._run()
+        self.assertEqual(len(calls), 6)
+        self.assertListEqual([candidate['status'] for candidate in ranking], ['complete', 'pruned', 'pruned'])
+        self.assertListEqual([candidate['epochs'] for candidate in ranking], [3, 1, 1])
+        self.assertTrue(all(job['initial_epoch'] == 1 for job in calls[-2:]))
+
+        best = ranking[0]
+        checkpoint_root = os.path.join(self.test_output_dir, 'checkpoints')
+        self.assertListEqual(os.listdir(checkpoint_root), [f"{best['variant'].replace('/', '__')}__model1"])
+        self.assertListEqual(sorted(os.listdir(os.path.join(checkpoint_root, os.listdir(checkpoint_root)[0]))),
+                             ['fold_0_epoch_3.keras', 'fold_0_epoch_3_scaler.joblib', 'fold_1_epoch_3.keras',
+                              'fold_1_epoch_3_scaler.joblib'])
+        self.assertTrue(os.path.exists(os.path.join(self.test_output_dir, 'leaderboard.csv')))
+
+        # Sweep yang sudah selesai tidak melatih ulang apa pun
+        calls.clear()
+        with mock.patch.object(training, 'train_fold', side_effect=lambda job: calls.append(job) or train_fold(job)):
+            self._run()
+        self.assertEqual(len(calls), 0)
+
+    def test_config_mismatch(self):
+        os.makedirs(self.test_output_dir, exist_ok=True)
+        with mock.patch.object(training, 'train_fold', side_effect=RuntimeError("terhenti")):
+            with self.assertRaises(RuntimeError):
+                self._run()
+        with self.assertRaises(ValueError):
+            run_sweep(self.test_store_dir, output_dir=self.test_output_dir, pruner='median', min_epochs=1,
+                      max_epochs=3, n_splits=2, max_workers=1)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,110 @@
+# tests/test_tabular_features.py
+
+import os
+import sys
+import unittest
+import shutil
+import numpy as np
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data import (
+    extract_tabular_features,
+    convert_temperature_matrices,
+    load_tabular_data,
+    normalize_tabular_data
+)
+from src.data.tabular_features import (
+    TABULAR_COLUMNS,
+    TCI_REFERENCE,
+    masked_means,
+    thermal_change_index,
+    extract_sample_features,
+    compare_tabular_features
+)
+
+
+class TestTabularFeatures(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Data mentah dummy: matriks kaki dan angiosom dengan ukuran berbeda, 0 di luar telapak kaki
+        cls.test_dir = 'tests/temp_tabular_features'
+        cls.raw_dir = os.path.join(cls.test_dir, 'raw')
+        rng = np.random.default_rng(7)
+        cls.expected = {}
+        for subject, gender in [('CG001', 'M'), ('DM002', 'F'), ('DM003', 'M')]:
+            group = 'Control Group' if subject.startswith('CG') else 'DM Group'
+            sample_name = f'{subject}_{gender}'
+            sample_dir = os.path.join(cls.raw_dir, group, sample_name)
+            os.makedirs(os.path.join(sample_dir, 'Angiosoms'), exist_ok=True)
+            expected = {'Subject': subject, 'Gender': gender}
+            for side, code in [('right', 'R'), ('left', 'L')]:
+                for region in ['General', 'LCA', 'LPA', 'MCA', 'MPA']:
+                    height, width = rng.integers(20, 40), rng.integers(10, 20)
+                    matrix = np.zeros((height, width))
+                    matrix[2:-2, 3:-3] = rng.uniform(22, 34, size=(height - 4, width - 6))
+                    if region == 'General':
+                        path = os.path.join(sample_dir, f'{sample_name}_{code}.csv')
+                    else:
+                        path = os.path.join(sample_dir, 'Angiosoms', f'{sample_name}_{code}_{region}.csv')
+                    np.savetxt(path, matrix, delimiter=',', fmt='%.3f')
+                    matrix = np.loadtxt(path, delimiter=',')
+                    expected[f'{region}_{side}'] = matrix[matrix > 0].mean()
+                expected[f'TCI_{side}'] = np.mean([abs(expected[f'{angiosome}_{side}'] - TCI_REFERENCE[angiosome])
+                                                   for angiosome in ['LCA', 'LPA', 'MCA', 'MPA']])
+            cls.expected[subject] = expected
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def _assert_matches_expected(self, data_tabular, decimals=None):
+        self.assertListEqual(list(data_tabular.columns), TABULAR_COLUMNS)
+        for _, row in data_tabular.iterrows():
+            expected = self.expected[row['Subject']]
+            self.assertEqual(row['Gender'], expected['Gender'])
+            for column in TABULAR_COLUMNS[2:]:
+                value = expected[column] if decimals is None else round(expected[column], decimals)
+                self.assertAlmostEqual(row[column], value, places=4, msg=f"{row['Subject']} {column}")
+
+    def test_masked_means(self):
+        matrices = [np.array([[0, 30.0], [32.0, 0]]), np.zeros((3, 1)), np.array([[25.0, 27.0, 0, 29.0]])]
+        means = masked_means(matrices)
+        self.assertAlmostEqual(means[0], 31.0)
+        self.assertTrue(np.isnan(means[1]))
+        self.assertAlmostEqual(means[2], 27.0)
+        self.assertAlmostEqual(float(thermal_change_index([27.1, 25.7, 25.4, 26.8])), 0.75)
+
+    def test_extract_from_csv_and_store(self):
+        data_tabular = extract_tabular_features(self.raw_dir, decimals=None, num_workers=2)
+        self.assertListEqual(data_tabular['Subject'].tolist(), ['CG001', 'DM002', 'DM003'])
+        self._assert_matches_expected(data_tabular)
+
+        store_dir = os.path.join(self.test_dir, 'temperature_store')
+        convert_temperature_matrices(self.raw_dir, store_dir, num_workers=1)
+        from_store = extract_tabular_features(self.raw_dir, temperature_store=store_dir, subjects=['DM003'])
+        self.assertListEqual(from_store['Subject'].tolist(), ['DM003'])
+        self._assert_matches_expected(from_store, decimals=2)
+
+    def test_output_is_schema_compatible(self):
+        output_path = os.path.join(self.test_dir, 'tabular_features.csv')
+        extract_tabular_features(self.raw_dir, output_path=output_path, num_workers=1)
+        data_tabular = load_tabular_data(output_path)
+        self.assertListEqual(list(data_tabular.columns), TABULAR_COLUMNS)
+        features = [column for column in TABULAR_COLUMNS if column not in ('Subject', 'Gender')]
+        normalized, scaler = normalize_tabular_data(data_tabular, features)
+        np.testing.assert_allclose(normalized[features].mean().to_numpy(), 0.0, atol=1e-6)
+
+        # Satu pasien baru dihitung langsung dari direktorinya
+        sample = extract_sample_features(os.path.join(self.raw_dir, 'DM Group', 'DM002_F'))
+        self._assert_matches_expected(sample, decimals=2)
+
+        report = compare_tabular_features(sample, load_tabular_data(output_path))
+        self.assertEqual(report['max_abs_diff'].max(), 0.0)
+        self.assertTrue((report['n'] == 1).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+# tests/test_temperature_store.py
+
+import os
+import sys
+import unittest
+import shutil
+import numpy as np
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data import convert_temperature_matrices, load_temperature_store
+
+
+class TestTemperatureStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Struktur data mentah dummy dengan ukuran matriks berbeda per subjek
+        cls.test_raw_dir = 'tests/temp_raw_temperatures'
+        cls.test_store_dir = 'tests/temp_temperature_store'
+        rng = np.random.default_rng(2)
+        cls.matrices = {}
+        for group, sample, shape in [('Control Group', 'CG001_M', (12, 5)), ('DM Group', 'DM002_F', (9, 7))]:
+            sample_dir = os.path.join(cls.test_raw_dir, group, sample)
+            os.makedirs(os.path.join(sample_dir, 'Angiosoms'), exist_ok=True)
+            for side in ['L', 'R']:
+                matrix = np.round(rng.uniform(20, 35, size=shape), 3)
+                matrix[0, :] = 0
+                np.savetxt(os.path.join(sample_dir, f'{sample}_{side}.csv'), matrix, delimiter=',', fmt='%g')
+                cls.matrices[(sample[:5], side)] = matrix
+                angiosome = matrix.copy()
+                angiosome[:, 2:] = 0
+                np.savetxt(os.path.join(sample_dir, 'Angiosoms', f'{sample}_{side}_LCA.csv'), angiosome,
+                           delimiter=',', fmt='%g')
+                cls.matrices[(sample[:5], f'{side}_LCA')] = angiosome
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_raw_dir)
+        shutil.rmtree(cls.test_store_dir, ignore_errors=True)
+
+    def test_convert_and_load(self):
+        convert_temperature_matrices(self.test_raw_dir, self.test_store_dir, num_workers=2)
+        store = load_temperature_store(self.test_store_dir)
+        self.assertListEqual(store.subjects, ['CG001', 'DM002'])
+        self.assertListEqual(store.parts('DM002'), ['L', 'L_LCA', 'R', 'R_LCA'])
+        for (subject, part), expected in self.matrices.items():
+            matrix = store.get(subject, part)
+            self.assertEqual(matrix.dtype, np.float32)
+            np.testing.assert_allclose(matrix, expected, rtol=1e-6)
+
+    def test_float16_without_angiosomes(self):
+        store_dir = os.path.join(self.test_store_dir, 'float16')
+        convert_temperature_matrices(self.test_raw_dir, store_dir, dtype='float16', include_angiosomes=False,
+                                     num_workers=1)
+        store = load_temperature_store(store_dir)
+        self.assertListEqual(store.parts('CG001'), ['L', 'R'])
+        matrix = store.get('CG001', 'R')
+        self.assertEqual(matrix.dtype, np.float16)
+        np.testing.assert_allclose(matrix, self.matrices[('CG001', 'R')], atol=0.02)
+        with self.assertRaises(KeyError):
+            store.get('CG001', 'L_LCA')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
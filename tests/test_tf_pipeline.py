@@ -0,0 +1,108 @@
+# tests/test_tf_pipeline.py
+
+import os
+import sys
+import unittest
+import shutil
+import numpy as np
+import pandas as pd
+import cv2
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data import build_dataset_store, create_store_dataset, create_image_dataset, load_termogram_arrays
+from src.models import create_model1
+from src.utils import solarize_image, clahe_image
+
+
+class TestTfPipeline(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_img_dir = 'tests/temp_pipeline_images'
+        cls.test_store_dir = 'tests/temp_pipeline_store'
+        subjects = ['DM001', 'CG002', 'DM003', 'CG004', 'DM005']
+        cls.data_tabular = pd.DataFrame({
+            'Subject': subjects,
+            'Gender': ['M', 'F', 'M', 'F', 'M'],
+            'General_right': [34.5, 33.0, 35.0, 32.0, 31.5],
+            'General_left': [34.0, 33.5, 35.5, 32.5, 31.0],
+        })
+        rng = np.random.default_rng(5)
+        for subject, gender in zip(subjects, cls.data_tabular['Gender']):
+            for side, suffix in [('Left', 'L'), ('Right', 'R')]:
+                side_dir = os.path.join(cls.test_img_dir, side, f'{subject[:2]} {side}')
+                os.makedirs(side_dir, exist_ok=True)
+                image = rng.integers(0, 256, size=(32, 16, 3), dtype=np.uint8)
+                cv2.imwrite(os.path.join(side_dir, f'{subject}_{gender}_{suffix}.png'), image)
+        build_dataset_store(cls.data_tabular, cls.test_img_dir, cls.test_store_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_img_dir)
+        shutil.rmtree(cls.test_store_dir)
+
+    def test_store_dataset_structure(self):
+        dataset = create_store_dataset(self.test_store_dir, indices=[0, 2, 4], batch_size=2)
+        inputs, labels = next(iter(dataset))
+        self.assertSetEqual(set(inputs), {'input_left', 'input_right', 'input_tabular'})
+        self.assertEqual(tuple(inputs['input_left'].shape), (2, 32, 16, 3))
+        self.assertEqual(tuple(inputs['input_tabular'].shape), (2, 3))
+        self.assertLessEqual(float(np.max(inputs['input_right'])), 1.0)
+        self.assertListEqual(labels.numpy().tolist(), [1.0, 1.0])
+
+    def test_store_matches_image_dataset(self):
+        # Sumber store (memmap) dan sumber file PNG harus menghasilkan data yang sama
+        from_store = create_store_dataset(self.test_store_dir, batch_size=5, normalize=False)
+        from_images = create_image_dataset(self.data_tabular, self.test_img_dir, batch_size=5, normalize=False)
+        (store_inputs, store_labels), = list(from_store)
+        (image_inputs, image_labels), = list(from_images)
+        for name in ['input_left', 'input_right', 'input_tabular']:
+            np.testing.assert_array_equal(store_inputs[name].numpy(), image_inputs[name].numpy())
+        np.testing.assert_array_equal(store_labels.numpy(), image_labels.numpy())
+
+    def test_on_the_fly_enhancement(self):
+        raw = create_store_dataset(self.test_store_dir, batch_size=5, normalize=False)
+        (raw_inputs, _), = list(raw)
+        left = raw_inputs['input_left'].numpy()
+
+        solarized = create_store_dataset(self.test_store_dir, batch_size=5, normalize=False,
+                                         enhancement=[('Solarize', {'threshold': 128})])
+        (inputs, _), = list(solarized)
+        np.testing.assert_array_equal(inputs['input_left'].numpy(), solarize_image(left, 128))
+
+        clahe = create_store_dataset(self.test_store_dir, batch_size=5, normalize=False, cache=True,
+                                     enhancement=[('CLAHE', {'clip_limit': 2.0, 'tile_grid_size': (8, 8)})])
+        (inputs, _), = list(clahe)
+        expected = clahe_image(np.ascontiguousarray(left[0][..., ::-1]), 2.0, (8, 8))[..., ::-1]
+        np.testing.assert_array_equal(inputs['input_left'].numpy()[0], expected)
+
+    def test_in_memory_arrays_and_uint8_batches(self):
+        from_store = create_store_dataset(self.test_store_dir, batch_size=5, normalize=False)
+        (store_inputs, _), = list(from_store)
+        self.assertEqual(store_inputs['input_left'].dtype, 'uint8')
+
+        # Array float di memori sudah ternormalisasi dan tidak dibagi 255 lagi
+        arrays = load_termogram_arrays(self.data_tabular, self.test_img_dir, dtype='float16')
+        (inputs, _), = list(create_store_dataset(arrays, batch_size=5))
+        self.assertEqual(inputs['input_left'].dtype, 'float32')
+        np.testing.assert_allclose(inputs['input_left'].numpy(), store_inputs['input_left'].numpy() / 255.0,
+                                   atol=1e-3)
+
+    def test_fit_model(self):
+        dataset = create_store_dataset(self.test_store_dir, batch_size=2, shuffle=True, seed=1, cache=True)
+        model = create_model1((32, 16, 3), 3)
+        model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+        history = model.fit(dataset, epochs=1, verbose=0)
+        self.assertIn('loss', history.history)
+
+        # Model dengan rescale_input dilatih langsung dari batch uint8
+        dataset = create_store_dataset(self.test_store_dir, batch_size=2, normalize=False)
+        model = create_model1((32, 16, 3), 3, rescale_input=True)
+        model.compile(optimizer='adam', loss='binary_crossentropy')
+        self.assertIn('loss', model.fit(dataset, epochs=1, verbose=0).history)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,147 @@
+# tests/test_training.py
+
+import os
+import sys
+import json
+import unittest
+import shutil
+import numpy as np
+import pandas as pd
+import cv2
+import joblib
+from sklearn.model_selection import KFold
+from sklearn.preprocessing import StandardScaler
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.data import build_dataset_store, load_dataset_store, create_store_dataset
+from src.training import compute_fold_indices, discover_stores, cross_validate, train_fold, scaler_path_for
+from src.predict import export_model, Predictor
+
+
+class TestTraining(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_img_dir = 'tests/temp_training_images'
+        cls.test_store_dir = 'tests/temp_training_store'
+        cls.test_output_dir = 'tests/temp_training_output'
+        subjects = [f'DM{i:03d}' if i % 2 else f'CG{i:03d}' for i in range(1, 11)]
+        cls.data_tabular = pd.DataFrame({
+            'Subject': subjects,
+            'Gender': ['M', 'F'] * 5,
+            'General_right': np.linspace(30.0, 35.0, 10),
+            'General_left': np.linspace(31.0, 34.0, 10),
+        })
+        rng = np.random.default_rng(7)
+        for subject, gender in zip(subjects, cls.data_tabular['Gender']):
+            for side, suffix in [('Left', 'L'), ('Right', 'R')]:
+                side_dir = os.path.join(cls.test_img_dir, side, f'{subject[:2]} {side}')
+                os.makedirs(side_dir, exist_ok=True)
+                image = rng.integers(0, 256, size=(16, 8, 3), dtype=np.uint8)
+                cv2.imwrite(os.path.join(side_dir, f'{subject}_{gender}_{suffix}.png'), image)
+        for variant in ['Gamma/gamma_0.5', 'Solarize/threshold_128']:
+            build_dataset_store(cls.data_tabular, cls.test_img_dir, os.path.join(cls.test_store_dir, variant))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_img_dir)
+        shutil.rmtree(cls.test_store_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_output_dir, ignore_errors=True)
+
+    def test_fold_indices_match_kfold_and_persist(self):
+        path = os.path.join(self.test_output_dir, 'folds.npz')
+        folds = compute_fold_indices(10, n_splits=5, path=path)
+        expected = list(KFold(n_splits=5, shuffle=True, random_state=42).split(np.zeros(10)))
+        self.assertEqual(len(folds), 5)
+        for (train_index, test_index), (expected_train, expected_test) in zip(folds, expected):
+            np.testing.assert_array_equal(train_index, expected_train)
+            np.testing.assert_array_equal(test_index, expected_test)
+
+        reloaded = compute_fold_indices(10, n_splits=5, path=path)
+        for (train_index, _), (expected_train, _) in zip(reloaded, expected):
+            np.testing.assert_array_equal(train_index, expected_train)
+
+    def test_discover_stores(self):
+        stores = discover_stores(self.test_store_dir)
+        self.assertListEqual(list(stores), ['Gamma/gamma_0.5', 'Solarize/threshold_128'])
+
+    def test_cross_validate_in_process(self):
+        results = cross_validate(self.test_store_dir, model_names=['model1'], n_splits=2, epochs=1, batch_size=4,
+                                 max_workers=1, output_dir=self.test_output_dir)
+        self.assertEqual(len(results['folds']), 4)
+        self.assertListEqual([(row['variant'], row['n_folds']) for row in results['summary']],
+                             [('Gamma/gamma_0.5', 2), ('Solarize/threshold_128', 2)])
+        for record in results['folds']:
+            self.assertEqual(record['n_train'] + record['n_test'], 10)
+            self.assertTrue(0.0 <= record['accuracy'] <= 1.0)
+
+        for file_name in ['folds.npz', 'folds.csv', 'summary.csv', 'results.json']:
+            self.assertTrue(os.path.exists(os.path.join(self.test_output_dir, file_name)))
+        with open(os.path.join(self.test_output_dir, 'results.json'), 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['summary']), 2)
+
+    def test_cross_validate_worker_processes(self):
+        stores = {'gamma': os.path.join(self.test_store_dir, 'Gamma', 'gamma_0.5')}
+        results = cross_validate(stores, model_names=['model1'], n_splits=2, epochs=1, batch_size=4,
+                                 cpu_budget=2, max_workers=2)
+        self.assertListEqual([record['fold'] for record in results['folds']], [0, 1])
+        test_indices = sorted(np.concatenate([
+            test_index for _, test_index in compute_fold_indices(10, n_splits=2)]).tolist())
+        self.assertListEqual(test_indices, list(range(10)))
+
+    def test_cross_validate_model_options(self):
+        stores = {'gamma': os.path.join(self.test_store_dir, 'Gamma', 'gamma_0.5')}
+        results = cross_validate(stores, model_names=['model1'], n_splits=2, epochs=1, batch_size=4,
+                                 cpu_budget=2, max_workers=2,
+                                 model_options={'shared_trunk': True, 'global_pooling': 'avg'})
+        self.assertListEqual([record['fold'] for record in results['folds']], [0, 1])
+        for record in results['folds']:
+            self.assertTrue(0.0 <= record['accuracy'] <= 1.0)
+
+    def test_exported_fold_matches_training(self):
+        import tensorflow as tf
+
+        store_dir = os.path.join(self.test_store_dir, 'Gamma', 'gamma_0.5')
+        train_index, test_index = compute_fold_indices(10, n_splits=2)[0]
+        checkpoint = os.path.join(self.test_output_dir, 'fold_0_epoch_1.keras')
+        train_fold({'variant': 'gamma', 'store_dir': store_dir, 'model': 'model1', 'fold': 0,
+                    'train_index': train_index, 'test_index': test_index, 'epochs': 1, 'batch_size': 4,
+                    'learning_rate': 1e-4, 'seed': 42, 'checkpoint': checkpoint})
+
+        # Scaler fold di-fit pada semua fitur store (termasuk Gender) dari data train fold tersebut
+        dataset = load_dataset_store(store_dir)
+        expected_scaler = StandardScaler().fit(dataset.tabular[train_index])
+        scaler = joblib.load(scaler_path_for(checkpoint))
+        np.testing.assert_allclose(scaler.mean_, expected_scaler.mean_)
+        np.testing.assert_allclose(scaler.scale_, expected_scaler.scale_)
+
+        export_dir = os.path.join(self.test_output_dir, 'export')
+        export_model(checkpoint, export_dir, dataset.features, scaler=scaler_path_for(checkpoint),
+                     formats=['saved_model'])
+        model = tf.keras.models.load_model(checkpoint)
+        inputs = create_store_dataset(dataset, batch_size=4, tabular_scaler=expected_scaler)
+        expected = model.predict(inputs, verbose=0).reshape(-1)
+
+        # Prediksi dari citra mentah dan data tabular mentah ('Gender' berupa 'M'/'F')
+        predictor = Predictor(export_dir, batch_size=4)
+        predictions = predictor.predict_directory(self.test_img_dir, self.data_tabular)
+        probabilities = dict(zip(predictions['Subject'], predictions['probability']))
+        np.testing.assert_allclose([probabilities[subject] for subject in dataset.subjects], expected, atol=1e-5)
+
+    def test_mismatched_subjects(self):
+        other_store = os.path.join(self.test_output_dir, 'other')
+        build_dataset_store(self.data_tabular.iloc[::-1].reset_index(drop=True), self.test_img_dir, other_store)
+        stores = {'gamma': os.path.join(self.test_store_dir, 'Gamma', 'gamma_0.5'), 'other': other_store}
+        with self.assertRaises(ValueError):
+            cross_validate(stores, n_splits=2, epochs=1, max_workers=1)
+
+    def test_unknown_model(self):
+        with self.assertRaises(ValueError):
+            cross_validate(self.test_store_dir, model_names=['model9'], epochs=1)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
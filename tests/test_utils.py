@@ -0,0 +1,309 @@
+# tests/test_utils.py
+
+import os
+import sys
+import json
+import logging
+import subprocess
+import tempfile
+import threading
+import unittest
+import shutil
+import numpy as np
+import cv2
+# Menambahkan direktori proyek utama ke sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from src.utils import (
+    posterize_image,
+    solarize_image,
+    clahe_image,
+    adjust_gamma_image,
+    posterize_batch,
+    solarize_batch,
+    clahe_batch,
+    adjust_gamma_batch,
+    get_lut,
+    compose_luts,
+    apply_lut_chain,
+    get_clahe,
+    clahe_matrix
+)
+from src.utils.image_sizes import read_image_size, scan_image_sizes, image_size_stats
+from src.utils.instrumentation import PipelineMetrics
+from src.utils.metrics import classification_metrics, summarize_metrics
+from src.utils.logging_config import configure_logging
+
+
+class TestImageEnhancementBatch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Stack citra dummy (N, H, W, 3) dengan ukuran mendekati termogram
+        rng = np.random.default_rng(42)
+        cls.images = rng.integers(0, 256, size=(4, 168, 65, 3), dtype=np.uint8)
+
+    def _assert_matches_single(self, batch_fn, single_fn, **params):
+        result = batch_fn(self.images, **params)
+        self.assertEqual(result.shape, self.images.shape)
+        self.assertEqual(result.dtype, np.uint8)
+        for i in range(self.images.shape[0]):
+            np.testing.assert_array_equal(result[i], single_fn(self.images[i], **params))
+
+    def test_posterize_batch(self):
+        for bits in [1, 2, 3]:
+            self._assert_matches_single(posterize_batch, posterize_image, bits=bits)
+
+    def test_solarize_batch(self):
+        for threshold in [64, 128, 192]:
+            self._assert_matches_single(solarize_batch, solarize_image, threshold=threshold)
+
+    def test_adjust_gamma_batch(self):
+        for gamma in [-1.5, 0.5, 1.5, 2, 5]:
+            self._assert_matches_single(adjust_gamma_batch, adjust_gamma_image, gamma=gamma)
+
+    def test_clahe_batch(self):
+        self._assert_matches_single(clahe_batch, clahe_image, clip_limit=3.0, tile_grid_size=(8, 8))
+
+    def test_preallocated_output(self):
+        # Hasil harus ditulis ke array out yang diberikan tanpa alokasi baru
+        out = np.zeros_like(self.images)
+        result = solarize_batch(self.images, 128, out=out)
+        self.assertIs(result, out)
+        np.testing.assert_array_equal(out[0], solarize_image(self.images[0], 128))
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            posterize_batch(self.images[0], 2)
+        with self.assertRaises(ValueError):
+            posterize_batch(self.images, 2, out=np.empty((1, 2, 3, 3), dtype=np.uint8))
+
+
+class TestLutRegistry(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(7)
+        cls.image = rng.integers(0, 256, size=(168, 65, 3), dtype=np.uint8)
+
+    def test_get_lut_is_memoized(self):
+        table = get_lut('Gamma', gamma=1.5)
+        self.assertIs(table, get_lut('Gamma', gamma=1.5))
+        self.assertEqual(table.shape, (256,))
+        self.assertFalse(table.flags.writeable)
+
+    def test_unknown_technique(self):
+        with self.assertRaises(KeyError):
+            get_lut('CLAHE', clip_limit=2.0)
+
+    def test_chain_matches_sequential_application(self):
+        # Gamma lalu posterize dalam satu pass LUT harus sama dengan dua pass terpisah
+        steps = [('Gamma', {'gamma': 1.5}), ('Posterize', {'bits': 3}), ('Solarize', {'threshold': 64})]
+        expected = solarize_image(posterize_image(adjust_gamma_image(self.image, 1.5), 3), 64)
+        np.testing.assert_array_equal(apply_lut_chain(self.image, steps), expected)
+
+    def test_compose_luts(self):
+        composed = compose_luts(get_lut('Solarize', threshold=128), get_lut('Posterize', bits=2))
+        values = np.arange(256, dtype=np.uint8)
+        np.testing.assert_array_equal(composed, posterize_image(solarize_image(values, 128), 2))
+
+
+class TestClahe(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(3)
+        cls.image = rng.integers(0, 256, size=(168, 65, 3), dtype=np.uint8)
+
+    def test_matches_reference_lab_roundtrip(self):
+        # Implementasi referensi: split/merge penuh dan objek CLAHE baru
+        for clip_limit, tile_grid_size in [(2.0, (8, 8)), (3.0, (6, 12))]:
+            l, a, b = cv2.split(cv2.cvtColor(self.image, cv2.COLOR_BGR2LAB))
+            cl = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid_size).apply(l)
+            expected = cv2.cvtColor(cv2.merge((cl, a, b)), cv2.COLOR_LAB2BGR)
+            np.testing.assert_array_equal(clahe_image(self.image, clip_limit, tile_grid_size), expected)
+
+    def test_instance_cached_per_thread(self):
+        clahe = get_clahe(3.0, (8, 8))
+        self.assertIs(clahe, get_clahe(3, [8, 8]))
+        other = []
+        thread = threading.Thread(target=lambda: other.append(get_clahe(3.0, (8, 8))))
+        thread.start()
+        thread.join()
+        self.assertIsNot(clahe, other[0])
+
+    def test_single_channel_fast_path(self):
+        gray = self.image[:, :, 0].copy()
+        expected = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
+        np.testing.assert_array_equal(clahe_image(gray, 2.0, (8, 8)), expected)
+
+    def test_clahe_matrix(self):
+        matrix = np.linspace(20.0, 35.0, 168 * 65, dtype=np.float32).reshape(168, 65)
+        equalized = clahe_matrix(matrix, 2.0, (8, 8))
+        self.assertEqual(equalized.shape, matrix.shape)
+        self.assertEqual(equalized.dtype, np.float32)
+        self.assertGreaterEqual(equalized.min(), 20.0 - 1e-3)
+        self.assertLessEqual(equalized.max(), 35.0 + 1e-3)
+
+
+class TestImageSizes(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = 'tests/temp_image_sizes'
+        self.index_path = os.path.join(self.test_dir, 'size_index.json')
+        self.sizes = {'a.png': (65, 168), 'b.png': (80, 150), 'c.jpg': (70, 160)}
+        for fname, (width, height) in self.sizes.items():
+            os.makedirs(os.path.join(self.test_dir, 'images'), exist_ok=True)
+            cv2.imwrite(os.path.join(self.test_dir, 'images', fname), np.zeros((height, width, 3), dtype=np.uint8))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_read_image_size(self):
+        for fname, size in self.sizes.items():
+            self.assertEqual(tuple(read_image_size(os.path.join(self.test_dir, 'images', fname))), size)
+
+    def test_scan_uses_index(self):
+        image_dir = os.path.join(self.test_dir, 'images')
+        sizes = scan_image_sizes([image_dir], size_index=self.index_path, num_workers=2)
+        self.assertDictEqual({os.path.basename(p): tuple(s) for p, s in sizes.items()}, self.sizes)
+        self.assertTrue(os.path.exists(self.index_path))
+
+        # Entri index dipakai selama ukuran file dan mtime tidak berubah, tanpa membaca header lagi
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        key = os.path.join('images', 'a.png')
+        data['entries'][key]['width'] = 1
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        sizes = scan_image_sizes([image_dir], size_index=self.index_path)
+        self.assertEqual(sizes[os.path.join(image_dir, 'a.png')][0], 1)
+
+        # File yang berubah dibaca ulang
+        cv2.imwrite(os.path.join(image_dir, 'a.png'), np.zeros((100, 50, 3), dtype=np.uint8))
+        sizes = scan_image_sizes([image_dir], size_index=self.index_path)
+        self.assertEqual(tuple(sizes[os.path.join(image_dir, 'a.png')]), (50, 100))
+
+    def test_image_size_stats(self):
+        stats = image_size_stats(list(self.sizes.values()), percentiles=(50,), bins=2)
+        self.assertEqual(stats['count'], 3)
+        self.assertAlmostEqual(stats['width']['mean'], np.mean([65, 80, 70]))
+        self.assertEqual(stats['height']['median'], 160)
+        self.assertEqual(stats['height']['percentiles'][50], 160)
+        self.assertEqual(sum(stats['width']['histogram']['counts']), 3)
+        self.assertEqual(stats['width']['min'], 65)
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_stage_phase_and_counters(self):
+        metrics = PipelineMetrics()
+        with metrics.stage('resize'):
+            with metrics.phase('resize', 'decode'):
+                pass
+            metrics.count('resize', files=2, bytes_read=100, bytes_written=50)
+            metrics.count('resize', skipped=1)
+        stage = metrics.snapshot()['resize']
+        self.assertEqual(stage['runs'], 1)
+        self.assertEqual(stage['files'], 2)
+        self.assertEqual(stage['skipped'], 1)
+        self.assertEqual(stage['bytes_read'], 100)
+        self.assertGreaterEqual(stage['wall_time'], stage['phases']['decode'])
+        self.assertIn('resize (1 run): 2 file (1 dilewati)', metrics.summary())
+
+    def test_merge_and_pop_snapshot(self):
+        worker, main = PipelineMetrics(), PipelineMetrics()
+        worker.count('enhance', files=3, bytes_written=30)
+        with worker.phase('enhance', 'compute'):
+            pass
+        main.count('enhance', files=1)
+        main.merge(worker.pop_snapshot())
+        self.assertEqual(worker.snapshot(), {})
+        self.assertEqual(main.snapshot()['enhance']['files'], 4)
+        self.assertIn('compute', main.snapshot()['enhance']['phases'])
+
+    def test_dumps(self):
+        metrics = PipelineMetrics()
+        metrics.count('organize', files=5, bytes_written=10)
+        with metrics.phase('organize', 'copy'):
+            pass
+        test_dir = 'tests/temp_metrics'
+        try:
+            metrics.dump_json(os.path.join(test_dir, 'metrics.json'))
+            metrics.dump_prometheus(os.path.join(test_dir, 'metrics.prom'))
+            with open(os.path.join(test_dir, 'metrics.json'), 'r', encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['organize']['files'], 5)
+            with open(os.path.join(test_dir, 'metrics.prom'), 'r', encoding='utf-8') as f:
+                text = f.read()
+            self.assertIn('termogram_pipeline_files_total{stage="organize"} 5', text)
+            self.assertIn('termogram_pipeline_phase_seconds_total{stage="organize",phase="copy"}', text)
+            self.assertIn('# TYPE termogram_pipeline_written_bytes_total counter', text)
+        finally:
+            shutil.rmtree(test_dir, ignore_errors=True)
+
+
+class TestLoggingAndImports(unittest.TestCase):
+
+    def test_import_is_light_and_cwd_independent(self):
+        # Mengimpor package data dari direktori lain tidak memuat TensorFlow/pandas/OpenCV dan tidak mengatur logging
+        code = (
+            "import sys, logging; sys.path.insert(0, sys.argv[1]); "
+            "from src.data import organize_images, resize_images; "
+            "heavy = [m for m in ('tensorflow', 'pandas', 'sklearn', 'cv2') if m in sys.modules]; "
+            "print(heavy, logging.getLogger('src.data.data_loader').handlers)"
+        )
+        result = subprocess.run([sys.executable, '-c', code, project_root], cwd=tempfile.gettempdir(),
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '[] []')
+
+    def test_configure_logging_once(self):
+        log_dir = tempfile.mkdtemp()
+        try:
+            self.assertTrue(configure_logging(log_dir=log_dir, verbose=True, force=True))
+            self.assertFalse(configure_logging(log_dir=log_dir))
+            logger = logging.getLogger('src.data.data_loader')
+            logger.debug('pesan debug')
+            for handler in logger.handlers:
+                handler.flush()
+            with open(os.path.join(log_dir, 'data_loader.log'), 'r', encoding='utf-8') as f:
+                self.assertIn('pesan debug', f.read())
+        finally:
+            # Mengembalikan logging ke kondisi belum dikonfigurasi agar tidak mempengaruhi test lain
+            for name in ['src.data.data_loader', 'src.data.data_preprocessing', 'src.utils.image_enhancement',
+                         'src.apply_image_enhancements', 'src.utils.instrumentation']:
+                logger = logging.getLogger(name)
+                for handler in list(logger.handlers):
+                    handler.close()
+                    logger.removeHandler(handler)
+                logger.setLevel(logging.NOTSET)
+                logger.propagate = True
+            for handler in list(logging.getLogger().handlers):
+                if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+                    logging.getLogger().removeHandler(handler)
+            logging.getLogger().setLevel(logging.WARNING)
+            shutil.rmtree(log_dir)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_classification_metrics(self):
+        y_true = [0, 0, 1, 1, 1]
+        y_prob = [0.1, 0.6, 0.8, 0.4, 0.9]
+        metrics = classification_metrics(y_true, y_prob)
+        self.assertAlmostEqual(metrics['accuracy'], 0.6)
+        self.assertAlmostEqual(metrics['precision'], 2 / 3)
+        self.assertAlmostEqual(metrics['recall'], 2 / 3)
+        self.assertAlmostEqual(metrics['f1'], 2 / 3)
+        self.assertAlmostEqual(metrics['auc'], 5 / 6)
+
+    def test_single_class_and_summary(self):
+        metrics = classification_metrics([1, 1], [0.7, 0.2])
+        self.assertTrue(np.isnan(metrics['auc']))
+        summary = summarize_metrics([metrics, {**metrics, 'accuracy': 1.0, 'auc': 0.5}])
+        self.assertAlmostEqual(summary['accuracy_mean'], 0.75)
+        self.assertAlmostEqual(summary['accuracy_std'], 0.25)
+        self.assertAlmostEqual(summary['auc_mean'], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file